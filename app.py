@@ -5,7 +5,10 @@ import subprocess
 from uuid import uuid4
 import sys
 import os
-from speech.speech_model import speech_model
+from bot.worker_pool import BotWorkerPool
+from bot.phrases import CANNED_PHRASES
+from speech.groq_stt_tts import prewarm_tts_cache
+from config import BOT_WORKERS, TTS_CACHE_PREWARM
 import time
 
 # Initialize Flask and SocketIO
@@ -50,8 +53,14 @@ socketio = SocketIO(app,
 user_sessions = {}
 bot_processes = {}
 
+# Pre-forked bot workers; None means one main.py subprocess per session
+bot_pool = BotWorkerPool() if BOT_WORKERS > 0 else None
+
 def cleanup_session(session_id):
     """Clean up session and terminate associated bot process"""
+    if bot_pool is not None:
+        bot_pool.stop_session(session_id)
+
     if session_id in bot_processes:
         try:
             process = bot_processes[session_id]
@@ -66,7 +75,7 @@ def cleanup_session(session_id):
     if session_id in user_sessions:
         del user_sessions[session_id]
 
-def run_bot(character_type, session_id):
+def run_bot(character_type, session_id, audio_formats=None):
     """
     Launch the bot in a separate subprocess for a specific session.
     """
@@ -77,6 +86,7 @@ def run_bot(character_type, session_id):
         env = os.environ.copy()
         env["BOT_CHARACTER"] = character_type
         env["SESSION_ID"] = session_id
+        env["BOT_AUDIO_FORMATS"] = ",".join(audio_formats or [])
         
         # Use Popen with output capture for debugging
         process = subprocess.Popen(
@@ -134,6 +144,7 @@ def start_session():
     """
     data = request.get_json()
     character = data.get("character")
+    audio_formats = data.get("audio_formats")  # Codecs the browser can play, for TTS negotiation
     
     # Always create a NEW unique session ID for each conversation
     # This ensures separate Firebase documents for each conversation
@@ -155,7 +166,20 @@ def start_session():
         }
         
         print(f"[SERVER] Starting NEW conversation session {session_id} with character: {character}")
-        Thread(target=run_bot, args=(character, session_id)).start()
+        if bot_pool is not None:
+            started = False
+            try:
+                started = bot_pool.start_session(character, session_id, audio_formats)
+            finally:
+                if not started:
+                    user_sessions.pop(session_id, None)
+            if not started:
+                return jsonify({
+                    "status": "error",
+                    "message": "All bot workers are busy. Please try again shortly."
+                }), 503
+        else:
+            Thread(target=run_bot, args=(character, session_id, audio_formats)).start()
         
         return jsonify({
             "status": "success",
@@ -171,6 +195,12 @@ def start_session():
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection and assign to room"""
+    # Bot workers share one connection across sessions and join rooms via join_session
+    bot_worker = request.args.get('bot_worker')
+    if bot_worker is not None:
+        print(f"[SERVER] Bot worker {bot_worker} connected")
+        return
+
     # Get session ID from client query parameter or use existing Flask session
     session_id = request.args.get('session_id')
     
@@ -241,13 +271,27 @@ def handle_update_session_id(data):
         # Confirm the update
         emit('session_updated', {'session_id': new_session_id})
 
+@socketio.on('join_session')
+def handle_join_session(data):
+    """Add a bot worker's shared connection to a session room."""
+    session_id = data.get('session_id') if data else None
+    if session_id:
+        join_room(session_id)
+
+@socketio.on('leave_session')
+def handle_leave_session(data):
+    """Remove a bot worker's shared connection from a session room."""
+    session_id = data.get('session_id') if data else None
+    if session_id:
+        leave_room(session_id)
+
 @socketio.on('mic_activated')
 def handle_mic_activated(data):
     """Handle mic activation from bot or relay to specific user session."""
     target_session = data.get('session_id')
     if target_session:
         # Message from bot subprocess - relay to user session
-        emit('mic_activated', data, room=target_session)
+        emit('mic_activated', data, room=target_session, include_self=False)
     else:
         # Message from frontend - relay within current session
         session_id = session.get('user_session_id')
@@ -272,19 +316,40 @@ def handle_play_audio_base64(data):
     """Relay audio data to specific user session."""
     target_session = data.get('session_id')
     if target_session:
-        emit('play_audio_base64', data, room=target_session)
+        emit('play_audio_base64', data, room=target_session, include_self=False)
     else:
         # Fallback to current session
         session_id = session.get('user_session_id')
         if session_id:
             emit('play_audio_base64', data, room=session_id)
 
+@socketio.on('play_audio_binary')
+def handle_play_audio_binary(data):
+    """Relay binary audio to specific user session; the bytes travel as a binary frame, never re-encoded."""
+    target_session = data.get('session_id')
+    if target_session:
+        emit('play_audio_binary', data, room=target_session, include_self=False)
+
+@socketio.on('audio_chunk')
+def handle_audio_chunk(data):
+    """Relay a streamed TTS audio chunk (binary PCM) to specific user session."""
+    target_session = data.get('session_id')
+    if target_session:
+        emit('audio_chunk', data, room=target_session, include_self=False)
+
+@socketio.on('audio_stream_end')
+def handle_audio_stream_end(data):
+    """Relay the end marker of a streamed TTS utterance to specific user session."""
+    target_session = data.get('session_id')
+    if target_session:
+        emit('audio_stream_end', data, room=target_session, include_self=False)
+
 @socketio.on('new_message')
 def handle_new_message(data):
     """Relay messages to specific user session."""
     target_session = data.get('session_id')
     if target_session:
-        emit('new_message', data, room=target_session)
+        emit('new_message', data, room=target_session, include_self=False)
     else:
         # Fallback to current session
         session_id = session.get('user_session_id')
@@ -304,7 +369,7 @@ def handle_tts_failed(data):
     """Relay TTS failed messages to specific user session."""
     target_session = data.get('session_id')
     if target_session:
-        emit('tts_failed', data, room=target_session)
+        emit('tts_failed', data, room=target_session, include_self=False)
     else:
         # Fallback to current session
         session_id = session.get('user_session_id')
@@ -339,8 +404,16 @@ def start_cleanup_thread():
     cleanup_thread = threading.Thread(target=cleanup_worker, daemon=True)
     cleanup_thread.start()
 
+def start_tts_prewarm_thread():
+    """Synthesize the bot's fixed phrases into the shared TTS cache in the background."""
+    if TTS_CACHE_PREWARM:
+        Thread(target=prewarm_tts_cache, args=(CANNED_PHRASES,), daemon=True).start()
+
 if __name__ == "__main__":
     start_cleanup_thread()
+    start_tts_prewarm_thread()
+    if bot_pool is not None:
+        bot_pool.start()
     port = int(os.environ.get("PORT", 5000))
     debug = os.environ.get("FLASK_ENV") == "development"
     
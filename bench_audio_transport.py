@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bytes on the wire and relay latency of one bot utterance, base64 JSON vs binary SocketIO frames.
+Runs the real python-socketio packet encoder/decoder for each hop: bot -> app.py relay -> browser.
+Sizes are for the WebSocket transport (HTTP long-polling base64-encodes binary frames itself).
+
+Usage: python bench_audio_transport.py [seconds_of_audio] [rounds]
+"""
+
+import base64
+import io
+import math
+import statistics
+import struct
+import sys
+import time
+import wave
+
+from socketio import packet
+
+SAMPLE_RATE = 24000  # OpenAI tts-1 WAV output
+MOBILE_MBPS = 5
+
+
+def make_wav(seconds):
+    frames = b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * 220 * i / SAMPLE_RATE)))
+        for i in range(int(seconds * SAMPLE_RATE))
+    )
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+
+def encode(event, data):
+    encoded = packet.Packet(packet.EVENT, data=[event, data]).encode()
+    return encoded if isinstance(encoded, list) else [encoded]
+
+
+def decode(frames):
+    pkt = packet.Packet(encoded_packet=frames[0])
+    for attachment in frames[1:]:
+        pkt.add_attachment(attachment)
+    return pkt.data[1]
+
+
+def base64_path(wav_bytes):
+    # Bot: data URL -> split -> JSON frame
+    data_url = f"data:audio/wav;base64,{base64.b64encode(wav_bytes).decode('utf-8')}"
+    frames = encode("play_audio_base64", {"audio_base64": data_url.split(",")[1], "mime": "audio/wav", "session_id": "s"})
+    # Relay: parse JSON, re-emit to the room
+    frames = encode("play_audio_base64", decode(frames))
+    # Browser: parse JSON, atob
+    audio = base64.b64decode(decode(frames)["audio_base64"])
+    return frames, audio
+
+
+def binary_path(wav_bytes):
+    frames = encode("play_audio_binary", {"audio": wav_bytes, "mime": "audio/wav", "session_id": "s"})
+    frames = encode("play_audio_binary", decode(frames))
+    audio = decode(frames)["audio"]
+    return frames, audio
+
+
+def measure(path, wav_bytes, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        frames, audio = path(wav_bytes)
+        timings.append((time.perf_counter() - started) * 1000)
+    assert audio == wav_bytes
+    wire_bytes = sum(len(frame) for frame in frames)
+    return wire_bytes, statistics.median(timings)
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    wav_bytes = make_wav(seconds)
+
+    print(f"Utterance: {seconds}s WAV, {len(wav_bytes)} bytes, {rounds} rounds")
+    print("=" * 60)
+    results = {}
+    for name, path in [("base64 JSON", base64_path), ("binary frame", binary_path)]:
+        wire_bytes, cpu_ms = measure(path, wav_bytes, rounds)
+        transfer_ms = wire_bytes * 8 / (MOBILE_MBPS * 1_000_000) * 1000
+        results[name] = wire_bytes
+        print(f"{name:13s} wire {wire_bytes:8d} bytes ({wire_bytes / len(wav_bytes) * 100:5.1f}% of WAV) | "
+              f"encode/relay/decode CPU {cpu_ms:6.2f} ms | transfer @{MOBILE_MBPS} Mbit/s {transfer_ms:6.0f} ms")
+    saved = results["base64 JSON"] - results["binary frame"]
+    print(f"Binary saves {saved} bytes per hop ({saved / results['base64 JSON'] * 100:.1f}%)")
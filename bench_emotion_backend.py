@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: emotion backends on the user messages in datasets/*.csv.
+Reports per-message latency of the lexicon classifier, and - when the LLM is reachable - label agreement
+of "lexicon" and "hybrid" with the LLM labels and how many messages hybrid still sends to the LLM.
+Needs OPENAI_API_KEY and network access for the LLM comparison.
+
+Usage: python bench_emotion_backend.py
+"""
+
+import glob
+import statistics
+import time
+from collections import Counter
+
+import pandas as pd
+
+from bot.emotion_detector import lexicon_emotion, llm_detect_emotion, emotion_prompt
+from llm.llm_api import get_llm_api
+
+
+def load_user_messages():
+    messages = []
+    for path in sorted(glob.glob("datasets/*.csv")):
+        frame = pd.read_csv(path)
+        messages += [str(m) for m in frame[frame["speaker"] == "user"]["message"].dropna()]
+    return messages
+
+
+def llm_available():
+    reply = get_llm_api("openai").generate_response([{"role": "user", "content": emotion_prompt("I am happy")}])
+    return bool(reply) and not reply.startswith("Sorry, I'm having trouble")
+
+
+if __name__ == "__main__":
+    messages = load_user_messages()
+    print(f"{len(messages)} user messages from datasets/*.csv")
+    print("=" * 60)
+
+    lexicon_labels, lexicon_ms, ambiguous = [], [], []
+    for text in messages:
+        started = time.perf_counter()
+        emotion, is_ambiguous = lexicon_emotion(text)
+        lexicon_ms.append((time.perf_counter() - started) * 1000)
+        lexicon_labels.append(emotion)
+        ambiguous.append(is_ambiguous)
+    print(f"lexicon  p50 {statistics.median(lexicon_ms):.3f} ms | max {max(lexicon_ms):.3f} ms | "
+          f"ambiguous {sum(ambiguous)}/{len(messages)}")
+    print(f"lexicon labels: {dict(Counter(lexicon_labels).most_common())}")
+
+    if not llm_available():
+        print("LLM unavailable - set OPENAI_API_KEY for the agreement comparison")
+        raise SystemExit(0)
+
+    llm_labels, llm_ms = [], []
+    for text in messages:
+        started = time.perf_counter()
+        llm_labels.append(llm_detect_emotion(text))
+        llm_ms.append((time.perf_counter() - started) * 1000)
+    hybrid_labels = [llm if is_ambiguous else lexicon
+                     for lexicon, llm, is_ambiguous in zip(lexicon_labels, llm_labels, ambiguous)]
+
+    def agreement(labels):
+        return sum(a == b for a, b in zip(labels, llm_labels)) / len(messages) * 100
+
+    print(f"llm      p50 {statistics.median(llm_ms):.0f} ms")
+    print(f"lexicon agreement with llm {agreement(lexicon_labels):5.1f}%")
+    print(f"hybrid  agreement with llm {agreement(hybrid_labels):5.1f}% "
+          f"({sum(ambiguous)}/{len(messages)} messages sent to the LLM)")
+    disagreements = Counter((a, b) for a, b in zip(lexicon_labels, llm_labels) if a != b)
+    print(f"lexicon -> llm disagreements: {dict(disagreements.most_common(8))}")
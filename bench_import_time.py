@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold import time of the entry points, each in a fresh interpreter, and whether the import
+pulled in torch or transformers (the local VITS and paraphrase models should only load on first use).
+
+Usage: python bench_import_time.py [runs] [module ...]
+"""
+
+import statistics
+import subprocess
+import sys
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+MODULES = sys.argv[2:] or ["app", "main", "speech", "speech.speech_model"]
+HEAVY = ["torch", "transformers"]
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(elapsed, *[name in sys.modules for name in {heavy!r}])
+"""
+
+
+def import_once(module):
+    result = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    elapsed, *loaded = result.stdout.strip().splitlines()[-1].split()
+    return float(elapsed), [name for name, flag in zip(HEAVY, loaded) if flag == "True"]
+
+
+if __name__ == "__main__":
+    print(f"Cold import, median of {RUNS} fresh interpreters")
+    print("=" * 60)
+    for module in MODULES:
+        runs = [import_once(module) for _ in range(RUNS)]
+        heavy = runs[-1][1]
+        print(f"{module:22s} {statistics.median(seconds for seconds, _ in runs) * 1000:7.0f} ms | "
+              f"loads {', '.join(heavy) if heavy else 'no torch/transformers'}")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: classifying user replies into every intent with one `in` scan per phrase (the old is_* helpers)
+vs the word-level Aho-Corasick matcher in bot.intent_matcher, over the user turns in datasets/*.csv.
+Also counts the intents the substring scan reports that are not whole-word matches (false hits).
+
+Usage: python bench_intent_matcher.py [rounds]
+"""
+
+import glob
+import sys
+import time
+
+import pandas as pd
+
+from bot.intent_matcher import INTENT_PHRASES, intent_matcher, match_intents
+
+
+def substring_intents(text):
+    text_lower = text.lower()
+    return frozenset(intent for intent, phrases in INTENT_PHRASES.items() if any(p in text_lower for p in phrases))
+
+
+def timed_per_call(fn, messages, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in messages:
+            fn(text)
+    return (time.perf_counter() - started) / (rounds * len(messages)) * 1_000_000
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    frames = [pd.read_csv(path) for path in sorted(glob.glob("datasets/*.csv"))]
+    turns = pd.concat(frames)
+    messages = [str(m) for m in turns[turns["speaker"] == "user"]["message"]]
+
+    print(f"{len(messages)} user messages x {rounds} rounds, {sum(map(len, INTENT_PHRASES.values()))} phrases "
+          f"in {len(INTENT_PHRASES)} intents")
+    print("=" * 60)
+    substring_us = timed_per_call(substring_intents, messages, rounds)
+    matcher_us = timed_per_call(intent_matcher.match, messages, rounds)
+    cached_us = timed_per_call(match_intents, messages, rounds)
+    print(f"substring scan per phrase  {substring_us:7.2f} us/message")
+    print(f"aho-corasick, one pass     {matcher_us:7.2f} us/message ({substring_us / matcher_us:.1f}x)")
+    print(f"aho-corasick, cached       {cached_us:7.2f} us/message (repeat checks of the same reply)")
+
+    false_hits = {}
+    for text in messages:
+        for intent in substring_intents(text) - intent_matcher.match(text):
+            false_hits.setdefault(intent, []).append(text)
+    print(f"substring-only intents on the transcripts: "
+          f"{ {intent: len(texts) for intent, texts in false_hits.items()} }")
+    for intent, texts in false_hits.items():
+        print(f"   {intent:20s} e.g. {texts[0][:70]!r}")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LLM response cache hit rate and latency on cohort traffic.
+Replays the user turns in datasets/*.csv through the response_generator templates (paraphrase and
+validation) for several cohort sessions, against a simulated LLM with llm_ms latency per call.
+The first session is cold; later ones stand in for the rest of a cohort repeating the same exercise.
+
+Usage: python bench_llm_cache.py [sessions] [llm_ms]
+"""
+
+import glob
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import llm.llm_api as llm_api_module
+import llm.llm_router as llm_router_module
+from llm.llm_api import get_llm_api
+from bot import response_generator
+from bot.emotion_detector import lexicon_emotion
+from llm.response_cache import ResponseCache
+
+SESSIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+LLM_S = (float(sys.argv[2]) if len(sys.argv) > 2 else 800) / 1000
+
+
+def fake_complete(messages, temperature, max_tokens):
+    time.sleep(LLM_S)
+    return "You feel that this matters to you."
+
+
+def user_turns():
+    turns = []
+    for path in sorted(glob.glob("datasets/*.csv")):
+        for _, turn in pd.read_csv(path).iterrows():
+            if turn["speaker"] == "user" and isinstance(turn["message"], str):
+                turns.append((turn["turn_type"], turn["message"]))
+    return turns
+
+
+def replay(turns):
+    latencies = []
+    for kind, text in turns:
+        started = time.perf_counter()
+        if kind.startswith("speaker_statement"):
+            response_generator.paraphrase(text)
+        else:
+            response_generator.generate_validation_response(text, lexicon_emotion(text)[0])
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+if __name__ == "__main__":
+    llm_api_module.response_cache = llm_router_module.response_cache = ResponseCache(directory=tempfile.mkdtemp())
+    get_llm_api("openai").complete = fake_complete
+    turns = user_turns()
+    print(f"{len(turns)} user turns per session, {SESSIONS} sessions, simulated LLM {LLM_S * 1000:.0f} ms")
+    print("=" * 60)
+    for session in range(SESSIONS):
+        latencies = replay(turns)
+        print(f"session {session + 1}: mean {statistics.mean(latencies) * 1000:7.1f} ms | "
+              f"p50 {statistics.median(latencies) * 1000:7.1f} ms per templated call")
+    stats = llm_api_module.response_cache.stats()
+    print(f"overall hit rate {stats['hit_rate']:.0%} ({stats['hits']} hits, {stats['misses']} misses)")
+    for template, counts in stats["templates"].items():
+        print(f"   {template:12s} hit rate {counts['hit_rate']:.0%} ({counts['hits']} hits, {counts['misses']} misses)")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-call LLM latency with a new LLMApi per call (the old detect_emotion behaviour)
+vs the shared, pooled client from get_llm_api().
+Runs against a local stub of the OpenAI chat completions endpoint. The stub charges handshake_ms
+once per new TCP connection to stand in for TCP + TLS setup to the real API.
+
+Usage: python bench_llm_client.py [calls] [handshake_ms]
+"""
+
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+HANDSHAKE_S = (float(sys.argv[2]) if len(sys.argv) > 2 else 60) / 1000
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4-turbo-preview",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "anxious"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        StubHandler.connections += 1
+        time.sleep(HANDSHAKE_S)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, get_api):
+    messages = [{"role": "user", "content": "Analyze the emotional tone of this text: 'I am worried'"}]
+    StubHandler.connections = 0
+    latencies = []
+    for _ in range(CALLS):
+        started = time.perf_counter()
+        reply = get_api().generate_response(messages)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert reply == "anxious", reply
+    print(f"{label:22s} p50 {statistics.median(latencies):7.2f} ms | mean {statistics.mean(latencies):7.2f} ms | "
+          f"connections opened {StubHandler.connections}")
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+    from llm.llm_api import LLMApi, get_llm_api
+
+    print(f"{CALLS} sequential chat completions, {HANDSHAKE_S * 1000:.0f} ms per new connection")
+    print("=" * 60)
+    run("new LLMApi per call", lambda: LLMApi(provider="openai"))
+    run("shared get_llm_api()", lambda: get_llm_api("openai"))
+    server.shutdown()
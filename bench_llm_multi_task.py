@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: round trips, prompt tokens and latency per listener turn when the reply's emotion (EMOTION_BACKEND=llm)
+and paraphrase are asked separately vs in one multi-task call.
+Replays the speaker statements in datasets/*.csv against a simulated LLM: llm_ms per call plus 0.2 ms per prompt token.
+The separate calls run concurrently, as in listener_mode.
+
+Usage: python bench_llm_multi_task.py [llm_ms]
+"""
+
+import glob
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from bot.emotion_detector import emotion_task
+from bot.response_generator import paraphrase_task
+from llm.multi_task import estimate_tokens, run_tasks, multi_task_stats
+
+LLM_S = (float(sys.argv[1]) if len(sys.argv) > 1 else 700) / 1000
+TOKEN_S = 0.0002
+
+
+class SimulatedLLM:
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    def cache_key(self, messages, temperature, max_tokens, cache_template):
+        return None
+
+    def generate_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None, json_schema=None):
+        prompt = messages[-1]["content"]
+        self.calls += 1
+        self.prompt_tokens += estimate_tokens(prompt)
+        time.sleep(LLM_S + estimate_tokens(prompt) * TOKEN_S)
+        if prompt.startswith("Complete these tasks"):
+            return '{"emotion": "anxious", "paraphrase": "It sounds like this has been weighing on you."}'
+        return "anxious" if "emotional tone" in prompt else "It sounds like this has been weighing on you."
+
+
+def statements():
+    found = []
+    for path in sorted(glob.glob("datasets/*.csv")):
+        for _, turn in pd.read_csv(path).iterrows():
+            if turn["speaker"] == "user" and turn["turn_type"].startswith("speaker_statement") and isinstance(turn["message"], str):
+                found.append(turn["message"])
+    return found
+
+
+def separate(llm, executor, text):
+    emotion = executor.submit(llm.generate_response, emotion_task(text).messages)
+    paraphrase = executor.submit(llm.generate_response, paraphrase_task(text).messages)
+    return emotion.result(), paraphrase.result()
+
+
+def combined(llm, executor, text):
+    return run_tasks(llm, text, [emotion_task(text), paraphrase_task(text)])
+
+
+if __name__ == "__main__":
+    turns = statements()
+    print(f"{len(turns)} listener turns, simulated LLM {LLM_S * 1000:.0f} ms + {TOKEN_S * 1000:.1f} ms per prompt token")
+    print("=" * 60)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for label, handle in (("separate calls", separate), ("multi-task call", combined)):
+            llm = SimulatedLLM()
+            latencies = []
+            for text in turns:
+                started = time.perf_counter()
+                handle(llm, executor, text)
+                latencies.append(time.perf_counter() - started)
+            print(f"{label:16s} {llm.calls / len(turns):.1f} round trips/turn | ~{llm.prompt_tokens / len(turns):.0f} prompt tokens/turn | "
+                  f"p50 {statistics.median(latencies) * 1000:6.0f} ms/turn")
+    print(f"saved: {multi_task_stats.stats()}")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LLM call latency with and without hedging across two providers.
+Each simulated provider answers in base_ms, but one call in twenty hits a slow tail of tail_ms
+(queueing, cold replicas); the first provider also fails outright one call in fifty.
+
+Usage: python bench_llm_router.py [calls] [base_ms] [tail_ms]
+"""
+
+import random
+import statistics
+import sys
+import time
+
+import llm.llm_router as llm_router_module
+from llm.llm_router import LLMRouter
+
+CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+BASE_S = (float(sys.argv[2]) if len(sys.argv) > 2 else 40) / 1000
+TAIL_S = (float(sys.argv[3]) if len(sys.argv) > 3 else 400) / 1000
+MESSAGES = [{"role": "user", "content": "Paraphrase: I feel stressed"}]
+
+
+class SimulatedProvider:
+    def __init__(self, name, error_rate, seed):
+        self.name = name
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+
+    def complete(self, messages, temperature, max_tokens, json_schema=None):
+        time.sleep(TAIL_S if self.random.random() < 0.05 else BASE_S * self.random.uniform(0.8, 1.2))
+        if self.random.random() < self.error_rate:
+            raise ConnectionError(f"{self.name} returned 503")
+        return f"answer from {self.name}"
+
+
+def run(hedge):
+    llm_router_module.LLM_HEDGE_ENABLED = hedge
+    providers = {"openai": SimulatedProvider("openai", 0.02, 1), "deepseek": SimulatedProvider("deepseek", 0.0, 2)}
+    router = LLMRouter(["openai", "deepseek"], apis=providers)
+    latencies = []
+    for _ in range(CALLS):
+        started = time.perf_counter()
+        router.generate_response(MESSAGES)
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies), router.stats()
+
+
+if __name__ == "__main__":
+    print(f"{CALLS} calls, simulated provider {BASE_S * 1000:.0f} ms, 5% tail at {TAIL_S * 1000:.0f} ms")
+    print("=" * 60)
+    for hedge in (False, True):
+        latencies, stats = run(hedge)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        label = "hedged   " if hedge else "failover "
+        print(f"{label} p50 {statistics.median(latencies) * 1000:6.1f} ms | p99 {p99 * 1000:6.1f} ms | "
+              f"hedges {stats['hedges']} (won {stats['hedge_wins']}) | failovers {stats['failovers']}")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time from the user's reply to the bot's first paraphrase audio, and to the end of its speech,
+when the paraphrase is generated whole and then synthesized vs streamed into TTS clause by clause.
+Simulated LLM (time to first token + per-token decode), TTS (fixed + per-word) and browser playback.
+
+Usage: python bench_llm_streaming.py [ttft_ms] [token_ms] [tts_ms]
+"""
+
+import statistics
+import sys
+import threading
+import time
+
+import bot.response_generator as response_generator
+from bot.conversation_bot import ConversationBot
+
+TTFT_S = (float(sys.argv[1]) if len(sys.argv) > 1 else 400) / 1000
+TOKEN_S = (float(sys.argv[2]) if len(sys.argv) > 2 else 30) / 1000
+TTS_S = (float(sys.argv[3]) if len(sys.argv) > 3 else 300) / 1000
+TTS_PER_WORD_S = 0.02
+PLAYBACK_PER_WORD_S = 0.02  # Scaled down from ~0.35 s per spoken word to keep the run short
+STATEMENT = "I have been feeling stressed about work because my manager keeps adding deadlines"
+PARAPHRASE = ("I hear you saying that you feel overwhelmed at work, because new deadlines keep arriving "
+              "before you can finish the ones you already have.")
+ROUNDS = 5
+
+
+class SimulatedBrowser:
+    connected = True
+
+    def __init__(self):
+        self.bot = None
+        self.audio_at = []
+        self.finished_at = None
+
+    def emit(self, event, data=None):
+        if event == "play_audio_binary":
+            self.audio_at.append(time.perf_counter())
+            playback = len(data["audio"].split()) * PLAYBACK_PER_WORD_S
+            threading.Timer(playback, self.finish).start()
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+        self.bot.on_audio_finished()
+
+
+def fake_stream(messages, **kwargs):
+    time.sleep(TTFT_S)
+    for index, word in enumerate(PARAPHRASE.split()):
+        if index:
+            time.sleep(TOKEN_S)
+        yield word if index == 0 else " " + word
+
+
+def fake_synthesize(text, **kwargs):
+    time.sleep(TTS_S + len(text.split()) * TTS_PER_WORD_S)
+    return text.encode()
+
+
+def run(streaming):
+    browser = SimulatedBrowser()
+    bot = ConversationBot(character_type="neutral", session_id=f"bench-stream-{streaming}", sio=browser)
+    browser.bot = bot
+    bot.synthesize_speech = fake_synthesize
+    started = time.perf_counter()
+    if streaming:
+        bot.speak_streamed_paraphrase(STATEMENT)
+    else:
+        paraphrased = bot.format_listener_paraphrase(STATEMENT, "".join(fake_stream(None)))
+        bot.prefetcher.schedule(("speech", paraphrased), fake_synthesize, paraphrased)
+        bot.play_speech(paraphrased)
+    return browser.audio_at[0] - started, browser.finished_at - started
+
+
+if __name__ == "__main__":
+    response_generator.llm_api.stream_response = fake_stream
+    print(f"Simulated LLM {TTFT_S * 1000:.0f} ms to first token + {TOKEN_S * 1000:.0f} ms/token "
+          f"({len(PARAPHRASE.split())} tokens), TTS {TTS_S * 1000:.0f} ms + {TTS_PER_WORD_S * 1000:.0f} ms/word")
+    print("=" * 60)
+    for streaming in (False, True):
+        results = [run(streaming) for _ in range(ROUNDS)]
+        first_audio = statistics.median(first for first, _ in results) * 1000
+        speech_end = statistics.median(end for _, end in results) * 1000
+        label = "streamed clauses" if streaming else "whole response  "
+        print(f"{label}  reply->first audio {first_audio:6.0f} ms | reply->speech end {speech_end:6.0f} ms")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: local VITS synthesis of concurrent utterances, one forward pass each vs batched.
+Submits the bot's canned phrases all at once (as session pre-warm or several sessions speaking together do)
+and reports wall time, p50/p99 utterance latency, the batch size histogram and real-time factor for each batch size.
+Without the facebook/mms-tts-eng weights (offline), a randomly initialized model of the same architecture
+is timed instead: the compute is the same, the audio is noise.
+
+Usage: python bench_local_tts.py [batch_size ...]
+"""
+
+import json
+import os
+import string
+import sys
+import tempfile
+import time
+
+import torch
+from transformers import VitsConfig, VitsModel, VitsTokenizer
+
+from config import VITS_TORCH_THREADS
+from speech.local_tts import VitsBatcher
+from speech.speech_model import SpeechModel
+
+BATCH_SIZES = [int(size) for size in sys.argv[1:]] or [1, 4, 8]
+PHRASES = [
+    "Did I get that right?", "Thank you!", "Could you share more?", "Let's switch roles now!",
+    "Take your time.", "That makes sense.", "Let's continue with our conversation.", "Goodbye!",
+    "What would you like to talk about today?", "Does that capture it better?",
+    "I hear you saying that work has been overwhelming lately.", "Please paraphrase what I just said."
+]
+
+
+def load_model():
+    model = SpeechModel()
+    try:
+        model.load()
+        return model, "facebook/mms-tts-eng"
+    except Exception:
+        # Same architecture and size as mms-tts-eng (VitsConfig defaults), random weights, character vocabulary
+        vocab_path = os.path.join(tempfile.mkdtemp(), "vocab.json")
+        with open(vocab_path, "w") as vocab:
+            json.dump({token: i for i, token in enumerate(["<pad>", "<unk>"] + list(" ',.!?-" + string.ascii_lowercase))}, vocab)
+        torch.manual_seed(0)
+        torch.set_num_threads(VITS_TORCH_THREADS)
+        model.tokenizer = VitsTokenizer(vocab_path, add_blank=True, normalize=True, phonemize=False)
+        model.model = VitsModel(VitsConfig()).eval()
+        return model, "random-weight VITS (mms-tts-eng architecture; weights unavailable offline)"
+
+
+def run(model, batch_size):
+    batcher = VitsBatcher(model=model, batch_size=batch_size)
+    started = time.perf_counter()
+    futures = [batcher.submit(text) for text in PHRASES]
+    for future in futures:
+        future.result()
+    return time.perf_counter() - started, batcher.stats()
+
+
+if __name__ == "__main__":
+    model, label = load_model()
+    print(f"{label}, {torch.get_num_threads()} torch threads, {len(PHRASES)} concurrent utterances")
+    print("=" * 60)
+    model.synthesize_batch(PHRASES[:1])  # Warm-up
+    for batch_size in BATCH_SIZES:
+        wall, stats = run(model, batch_size)
+        print(f"batch size {batch_size:2d}: wall {wall * 1000:6.0f} ms | latency p50 {stats['p50_ms']:6d} ms p99 {stats['p99_ms']:6d} ms | "
+              f"batches {stats['batch_sizes']} | RTF {stats['real_time_factor']}")
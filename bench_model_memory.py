@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory per session of local VITS TTS, each worker process with a private copy of the weights vs
+the memory-mapped export shared through the page cache.
+For 1, 10 and 50 concurrent sessions, starts the worker processes the pool would (BOT_SESSIONS_PER_WORKER
+sessions each, or one process per session with --per-session, like BOT_WORKERS=0), has every session speak
+one utterance, then sums RSS and PSS (shared pages split between the processes mapping them) over the workers.
+Without the facebook/mms-tts-eng weights (offline), a randomly initialized model of the same size is used.
+
+Usage: python bench_model_memory.py [--per-session] [sessions ...]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+from config import BOT_SESSIONS_PER_WORKER, DEFAULT_VITS_MODEL
+from bench_vits_export import random_checkpoint
+
+PER_SESSION = "--per-session" in sys.argv
+SESSION_COUNTS = [int(arg) for arg in sys.argv[1:] if arg.isdigit()] or [1, 10, 50]
+MODES = ["private", "mmap"]
+
+
+def worker(model_name, export_path, mode, sessions):
+    """One worker process: load the model, speak once per session, report ready and stay up until stdin closes"""
+    from speech.local_tts import VitsBatcher
+    from speech.speech_model import SpeechModel
+
+    model = SpeechModel(model_name=model_name, model_path=export_path, mmap_weights=mode == "mmap")
+    batcher = VitsBatcher(model=model)
+    threads = [threading.Thread(target=lambda: batcher.submit("Did I get that right?").result()) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print("ready", flush=True)
+    sys.stdin.read()
+
+
+def memory_mb(pid):
+    """(RSS, PSS) of a process in MB"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            field, _, rest = line.partition(":")
+            if field in ("Rss", "Pss"):
+                values[field] = int(rest.split()[0]) / 1024
+    return values["Rss"], values["Pss"]
+
+
+def measure(model_name, export_path, mode, sessions):
+    per_worker = 1 if PER_SESSION else BOT_SESSIONS_PER_WORKER
+    counts = [min(per_worker, sessions - start) for start in range(0, sessions, per_worker)]
+    env = {**os.environ, "VITS_TORCH_THREADS": "1", "VITS_BATCH_SIZE": "1"}
+    workers = [subprocess.Popen([sys.executable, __file__, "--worker", model_name, export_path, mode, str(count)],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=env)
+               for count in counts]
+    try:
+        for process in workers:
+            while process.stdout.readline().strip() != "ready":
+                if process.poll() is not None:
+                    raise RuntimeError(f"worker exited with {process.returncode}")
+        usage = [memory_mb(process.pid) for process in workers]
+    finally:
+        for process in workers:
+            process.stdin.close()
+            process.wait()
+    return len(workers), sum(rss for rss, _ in usage), sum(pss for _, pss in usage)
+
+
+def export_model(directory):
+    from speech.speech_model import SpeechModel
+
+    export_path = os.path.join(directory, "export")
+    try:
+        return DEFAULT_VITS_MODEL, SpeechModel(model_path=export_path).export(), DEFAULT_VITS_MODEL
+    except Exception:
+        checkpoint = random_checkpoint(tempfile.mkdtemp())
+        label = "random-weight VITS (mms-tts-eng architecture; weights unavailable offline)"
+        return checkpoint, SpeechModel(model_name=checkpoint, model_path=export_path).export(), label
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 6 and sys.argv[1] == "--worker":
+        worker(*sys.argv[2:5], int(sys.argv[5]))
+        sys.exit(0)
+
+    model_name, export_path, label = export_model(tempfile.mkdtemp())
+    layout = "one process per session" if PER_SESSION else f"{BOT_SESSIONS_PER_WORKER} sessions per worker"
+    print(f"{label}, {layout}")
+    print("=" * 60)
+    for sessions in SESSION_COUNTS:
+        for mode in MODES:
+            processes, rss, pss = measure(model_name, export_path, mode, sessions)
+            print(f"{sessions:3d} sessions, {mode:7s}: {processes:2d} processes | RSS {rss:7.0f} MB | PSS {pss:7.0f} MB | "
+                  f"PSS per session {pss / sessions:6.1f} MB")
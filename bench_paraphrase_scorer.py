@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark and calibration: paraphrase accuracy decisions on the labeled transcripts in datasets/*.csv.
+Each (speaker statement, listener paraphrase) pair is labeled by the speaker's validation response:
+validation_response = accepted, validation_response_negative / _partial = rejected.
+Compares the keyword-overlap check with the embedding scorer and suggests PARAPHRASE_SIMILARITY_THRESHOLD.
+The embedding model is downloaded on first run.
+
+Usage: python bench_paraphrase_scorer.py
+"""
+
+import glob
+import statistics
+import time
+
+import pandas as pd
+
+from bot.conversation_bot import ConversationBot
+from bot.paraphrase_scorer import paraphrase_scorer
+from config import PARAPHRASE_SIMILARITY_THRESHOLD
+
+
+class FakeSio:
+    connected = True
+
+    def emit(self, *args, **kwargs):
+        pass
+
+
+def labeled_pairs():
+    pairs = []
+    for path in sorted(glob.glob("datasets/*.csv")):
+        statement = paraphrase = None
+        for _, turn in pd.read_csv(path).iterrows():
+            kind = turn["turn_type"]
+            if kind.startswith("speaker_statement"):
+                statement = turn["message"]
+            elif kind.startswith("listener_paraphrase"):
+                paraphrase = turn["message"]
+            elif kind.startswith("validation_response") and statement and paraphrase:
+                pairs.append((statement, paraphrase, kind == "validation_response"))
+                paraphrase = None
+    return pairs
+
+
+def concept_coverage(bot, statement, paraphrase):
+    original = bot.extract_key_concepts(statement.lower())
+    overlap = set(original) & set(bot.extract_key_concepts(paraphrase.lower()))
+    return len(overlap) / len(original) if original else 0
+
+
+def accuracy(scores, labels, threshold):
+    return sum((score >= threshold) == label for score, label in zip(scores, labels)) / len(labels) * 100
+
+
+def best_threshold(scores, labels):
+    candidates = sorted(set(round(score, 3) for score in scores))
+    return max(candidates, key=lambda threshold: (accuracy(scores, labels, threshold), -abs(threshold - 0.6)))
+
+
+if __name__ == "__main__":
+    pairs = labeled_pairs()
+    labels = [label for _, _, label in pairs]
+    print(f"{len(pairs)} labeled pairs ({sum(labels)} accepted, {len(labels) - sum(labels)} rejected)")
+    print("=" * 60)
+
+    bot = ConversationBot(character_type="neutral", session_id="bench-paraphrase", sio=FakeSio())
+    coverage = [concept_coverage(bot, statement, paraphrase) for statement, paraphrase, _ in pairs]
+    print(f"concept overlap    accuracy at 0.60: {accuracy(coverage, labels, 0.6):5.1f}% | "
+          f"best {accuracy(coverage, labels, best_threshold(coverage, labels)):5.1f}% at {best_threshold(coverage, labels):.2f}")
+
+    started = time.perf_counter()
+    if not paraphrase_scorer.load():
+        print("Embedding model unavailable - needs network access for the first download")
+        raise SystemExit(0)
+    print(f"model load + quantization {time.perf_counter() - started:.1f} s")
+
+    similarities, cold_ms, warm_ms = [], [], []
+    for statement, paraphrase, _ in pairs:
+        started = time.perf_counter()
+        similarities.append(paraphrase_scorer.similarity(statement, paraphrase))
+        cold_ms.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        paraphrase_scorer.similarity(statement, paraphrase)  # Statement embedding now cached
+        warm_ms.append((time.perf_counter() - started) * 1000)
+
+    threshold = best_threshold(similarities, labels)
+    print(f"embedding scorer   accuracy at {PARAPHRASE_SIMILARITY_THRESHOLD:.2f}: "
+          f"{accuracy(similarities, labels, PARAPHRASE_SIMILARITY_THRESHOLD):5.1f}% | "
+          f"best {accuracy(similarities, labels, threshold):5.1f}% at {threshold:.2f}")
+    print(f"similarity p50 {statistics.median(cold_ms):.1f} ms uncached statement, "
+          f"{statistics.median(warm_ms):.1f} ms cached | {paraphrase_scorer.stats()}")
+    print(f"suggested: export PARAPHRASE_SIMILARITY_THRESHOLD={threshold:.2f}")
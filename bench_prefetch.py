@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: how much speculative prefetch shrinks the gap between the user's reply and the bot's audio.
+Drives a real ConversationBot through intro -> speaker turn -> listener turn -> speaker turn against a
+simulated browser (audio playback time, user reply delay) and simulated LLM/TTS latency.
+
+Usage: python bench_prefetch.py [llm_ms] [tts_ms]
+"""
+
+import statistics
+import sys
+import threading
+import time
+
+import bot.conversation_bot as conversation_bot
+import bot.paraphrase_scorer as paraphrase_scorer_module
+from bot.conversation_bot import ConversationBot
+
+PLAYBACK_S = 0.6  # Browser audio playback per utterance
+USER_REPLY_S = 0.3  # User starts answering after the mic opens
+STATEMENT = "I have been feeling stressed about work because my manager keeps adding deadlines"
+
+
+class SimulatedBrowser:
+    """Plays each utterance for PLAYBACK_S and answers every opened mic like a cooperative user."""
+
+    def __init__(self):
+        self.connected = True
+        self.bot = None
+        self.last_bot_text = ""
+        self.events = []  # (time, kind, text)
+
+    def emit(self, event, data):
+        now = time.perf_counter()
+        if event in ("play_audio_binary", "play_audio_base64", "audio_stream_end"):
+            self.events.append((now, "audio", None))
+            threading.Timer(PLAYBACK_S, self.bot.on_audio_finished).start()
+        elif event == "new_message":
+            self.last_bot_text = data["text"]
+            if self.events and self.events[-1][1] == "audio":
+                self.events[-1] = (self.events[-1][0], "audio", data["text"])
+        elif event == "mic_activated" and data.get("activated"):
+            threading.Thread(target=self.reply, daemon=True).start()
+
+    def reply(self):
+        time.sleep(USER_REPLY_S)
+        deadline = time.time() + 5
+        while not self.bot.waiting_for_user_input and time.time() < deadline:
+            time.sleep(0.005)
+        if not self.bot.waiting_for_user_input:
+            return
+        if self.bot.bot_role == "speaker":
+            # A good listener paraphrase: the I-statement reflected back
+            text = "You " + self.bot.current_i_statement[2:].replace(" I ", " you ")
+        elif self.last_bot_text == "Did I get that right?":
+            text = "yes"
+        else:
+            text = STATEMENT
+        self.events.append((time.perf_counter(), "reply", text))
+        self.bot.on_user_input({"text": text, "session_id": self.bot.session_id})
+
+
+def run(prefetch, llm_s, tts_s):
+    conversation_bot.PREFETCH_ENABLED = prefetch
+    conversation_bot.I_STATEMENT_BANK_ENABLED = False  # Measure live I-statement generation
+    conversation_bot.LLM_STREAMING = False  # The simulated LLM answers whole
+    paraphrase_scorer_module.PARAPHRASE_SCORER = "concepts"  # Keep the model load out of the timings
+
+    def fake_llm(messages, **kwargs):
+        time.sleep(llm_s)
+        return "I feel overwhelmed when plans change at the last minute because I like to prepare."
+
+    def fake_tts(text, return_bytes=False, audio_format="wav"):
+        time.sleep(tts_s)
+        return b"RIFF" + text.encode()
+
+    conversation_bot.groq_text_to_speech = fake_tts
+    conversation_bot.paraphrase = lambda text: fake_llm(None) and "you feel stressed about work deadlines"
+    conversation_bot.detect_emotion = lambda text: fake_llm(None) and "neutral"
+
+    browser = SimulatedBrowser()
+    bot = ConversationBot(character_type="neutral", session_id=f"bench-{prefetch}", sio=browser)
+    browser.bot = bot
+    bot.llm_api.generate_response = fake_llm
+    bot.save_conversation = lambda: None
+
+    started = time.perf_counter()
+    # Same opening as integrated_mode(), with a fixed number of turns
+    bot.prefetch_i_statement()
+    bot.send_and_wait("Hi, I'm Charisma Bot. Today we'll practice the Speaker-Listener Technique")
+    bot.speaker_mode()
+    bot.listener_mode()
+    bot.speaker_mode()
+    total = time.perf_counter() - started
+
+    # Gap from each user reply to the bot's next audio, and from the final "yes" to the next I-statement
+    gaps, yes_to_statement = [], None
+    for i, (at, kind, text) in enumerate(browser.events):
+        if kind != "reply":
+            continue
+        later_audio = [(t, txt) for t, k, txt in browser.events[i + 1:] if k == "audio"]
+        if later_audio:
+            gaps.append(later_audio[0][0] - at)
+        if text == "yes":
+            statement_audio = [t for t, txt in later_audio if txt and txt.startswith('"')]
+            if statement_audio:
+                yes_to_statement = statement_audio[0] - at
+    return {
+        "reply_gap_p50_ms": statistics.median(gaps) * 1000,
+        "reply_gap_mean_ms": statistics.mean(gaps) * 1000,
+        "yes_to_i_statement_ms": (yes_to_statement or 0) * 1000,
+        "session_s": total,
+        "prefetch": bot.prefetcher.stats()
+    }
+
+
+if __name__ == "__main__":
+    llm_s = (float(sys.argv[1]) if len(sys.argv) > 1 else 800) / 1000
+    tts_s = (float(sys.argv[2]) if len(sys.argv) > 2 else 400) / 1000
+
+    print(f"Simulated LLM {llm_s * 1000:.0f} ms, TTS {tts_s * 1000:.0f} ms, playback {PLAYBACK_S * 1000:.0f} ms, "
+          f"user reply {USER_REPLY_S * 1000:.0f} ms")
+    print("=" * 60)
+    for name, prefetch in [("no prefetch", False), ("prefetch", True)]:
+        result = run(prefetch, llm_s, tts_s)
+        print(f"{name:12s} reply->audio p50 {result['reply_gap_p50_ms']:6.0f} ms | mean {result['reply_gap_mean_ms']:6.0f} ms | "
+              f"'yes' -> next I-statement {result['yes_to_i_statement_ms']:6.0f} ms | session {result['session_s']:5.1f} s | "
+              f"{result['prefetch']}")
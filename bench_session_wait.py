@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: idle CPU and wake-up latency of waiting bot sessions.
+Compares the old 100 ms busy-polling loop against SessionSignal with N concurrent waiting sessions.
+
+Usage: python bench_session_wait.py [sessions] [idle_seconds]
+"""
+
+import statistics
+import sys
+import threading
+import time
+
+from bot.session_signal import SessionSignal
+
+
+class PollingSession:
+    """The previous listen() wait: flip a flag, poll it every 100 ms."""
+
+    def __init__(self):
+        self.waiting = False
+        self.received = None
+        self.set_at = None
+        self.woke_at = None
+
+    def wait(self, timeout):
+        self.waiting = True
+        deadline = time.time() + timeout
+        while self.waiting and time.time() < deadline:
+            time.sleep(0.1)
+            if self.received:
+                self.woke_at = time.perf_counter()
+                return self.received
+
+    def deliver(self, text):
+        self.set_at = time.perf_counter()
+        self.received = text
+
+
+class SignalSession:
+    """The current listen() wait: block on a SessionSignal, waking for 5 s keep-alives."""
+
+    def __init__(self):
+        self.signal = SessionSignal()
+        self.set_at = None
+        self.woke_at = None
+
+    def wait(self, timeout):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.signal.wait(timeout=min(5, deadline - time.time())):
+                self.woke_at = time.perf_counter()
+                return self.signal.value
+
+    def deliver(self, text):
+        self.set_at = time.perf_counter()
+        self.signal.set(text)
+
+
+def run(session_class, sessions, idle_seconds):
+    waiters = [session_class() for _ in range(sessions)]
+    threads = [threading.Thread(target=w.wait, args=(45,), daemon=True) for w in waiters]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)  # Let every thread reach its wait
+
+    cpu_start = time.process_time()
+    time.sleep(idle_seconds)
+    idle_cpu = time.process_time() - cpu_start
+
+    # Deliver user input to every session, staggered like real replies
+    for waiter in waiters:
+        waiter.deliver("yes that is correct")
+        time.sleep(0.002)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    latencies = sorted((w.woke_at - w.set_at) * 1000 for w in waiters if w.woke_at)
+    return {
+        "idle_cpu_pct": idle_cpu / idle_seconds * 100,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "woken": len(latencies)
+    }
+
+
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    idle_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print(f"Waiting sessions: {sessions}, idle window: {idle_seconds}s")
+    print("=" * 60)
+    for name, session_class in [("polling (time.sleep 0.1)", PollingSession), ("SessionSignal", SignalSession)]:
+        result = run(session_class, sessions, idle_seconds)
+        print(f"{name:26s} idle CPU {result['idle_cpu_pct']:6.1f}% | "
+              f"wake p50 {result['p50_ms']:7.2f} ms | p99 {result['p99_ms']:7.2f} ms | "
+              f"woken {result['woken']}/{sessions}")
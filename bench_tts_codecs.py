@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark: payload size and latency of bot speech per TTS codec over a fixed set of bot utterances.
+Turn latency = synthesis (OpenAI round trip) + transfer of the payload to a mobile browser.
+Needs OPENAI_API_KEY and network access.
+
+Usage: python bench_tts_codecs.py [mobile_mbps]
+"""
+
+import statistics
+import sys
+import time
+
+from config import TTS_FORMAT_PREFERENCE
+from speech.groq_stt_tts import groq_text_to_speech
+
+UTTERANCES = [
+    "Hi, I'm Charisma Bot. Today we'll practice the Speaker-Listener Technique",
+    "I'll start as speaker. You listen and repeat what you heard.",
+    "I feel that open communication is important. I want to make sure we both feel heard and understood.",
+    "Let's switch roles now! Now you're the speaker - please share your thoughts.",
+    "Did I get that right?",
+    "Great practice! We both had a chance to feel heard and understood.",
+]
+
+
+if __name__ == "__main__":
+    mobile_mbps = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"{len(UTTERANCES)} utterances, transfer estimated at {mobile_mbps} Mbit/s")
+    print("=" * 60)
+    wav_total = None
+    for audio_format in reversed(TTS_FORMAT_PREFERENCE):  # wav first, as the baseline
+        sizes, synth_ms = [], []
+        for text in UTTERANCES:
+            started = time.perf_counter()
+            audio = groq_text_to_speech(text, return_bytes=True, audio_format=audio_format)
+            if not audio:
+                print("TTS unavailable - set OPENAI_API_KEY")
+                sys.exit(1)
+            synth_ms.append((time.perf_counter() - started) * 1000)
+            sizes.append(len(audio))
+
+        total = sum(sizes)
+        wav_total = wav_total or total
+        transfer_ms = [size * 8 / (mobile_mbps * 1_000_000) * 1000 for size in sizes]
+        turn_ms = [s + t for s, t in zip(synth_ms, transfer_ms)]
+        print(f"{audio_format:5s} total {total:8d} bytes ({total / wav_total * 100:5.1f}% of wav) | "
+              f"synth p50 {statistics.median(synth_ms):6.0f} ms | transfer p50 {statistics.median(transfer_ms):6.0f} ms | "
+              f"turn p50 {statistics.median(turn_ms):6.0f} ms")
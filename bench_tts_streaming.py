@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time-to-first-sound of a bot turn, full WAV vs streamed PCM chunks.
+Full WAV can only start playing once the whole file has arrived; streaming can start on the first chunk.
+Needs OPENAI_API_KEY and network access.
+
+Usage: python bench_tts_streaming.py [rounds]
+"""
+
+import statistics
+import sys
+import time
+
+from speech.groq_stt_tts import groq_text_to_speech, stream_text_to_speech
+
+SENTENCES = [
+    "Hi, I'm Charisma Bot. Today we'll practice the Speaker-Listener Technique",
+    "I feel that open communication is important. I want to make sure we both feel heard and understood.",
+    "Did I get that right?",
+]
+
+
+def time_full_wav(text):
+    started = time.perf_counter()
+    audio = groq_text_to_speech(text, return_bytes=True)
+    if not audio:
+        return None
+    return (time.perf_counter() - started) * 1000
+
+
+def time_first_chunk(text):
+    started = time.perf_counter()
+    for _ in stream_text_to_speech(text):
+        return (time.perf_counter() - started) * 1000
+    return None
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print(f"Rounds per sentence: {rounds}")
+    print("=" * 60)
+    for text in SENTENCES:
+        full = [t for t in (time_full_wav(text) for _ in range(rounds)) if t is not None]
+        first = [t for t in (time_first_chunk(text) for _ in range(rounds)) if t is not None]
+        if not full or not first:
+            print("TTS unavailable - set OPENAI_API_KEY")
+            break
+        print(f"{len(text):4d} chars | full WAV {statistics.median(full):7.0f} ms | "
+              f"first chunk {statistics.median(first):7.0f} ms | "
+              f"saved {statistics.median(full) - statistics.median(first):7.0f} ms")
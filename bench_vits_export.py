@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the VITS model as loaded from the Hugging Face checkpoint vs the inference-only export
+(python -m speech.speech_model), in fp32 and with VITS_QUANTIZE int8 Linear layers.
+Each variant loads in a fresh process; reports load time, resident memory, synthesis real-time factor and
+how close its audio is to the Hugging Face model's (cosine similarity of the average magnitude spectrum,
+1.0 = same spectrum, and the length ratio).
+Without the facebook/mms-tts-eng weights (offline), a randomly initialized model of the same architecture
+is used instead: timings and memory are the same, the audio is noise.
+
+Usage: python bench_vits_export.py
+"""
+
+import json
+import os
+import resource
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+PHRASES = [
+    "Did I get that right?", "Could you share more?", "Let's switch roles now!",
+    "What would you like to talk about today?", "I hear you saying that work has been overwhelming lately."
+]
+VARIANTS = ["huggingface", "exported", "exported-int8"]
+
+
+def rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def random_checkpoint(directory):
+    """A randomly initialized mms-tts-eng-sized VITS checkpoint with a character vocabulary"""
+    import torch
+    from transformers import VitsConfig, VitsModel, VitsTokenizer
+
+    vocab_path = os.path.join(directory, "vocab.json")
+    with open(vocab_path, "w") as vocab:
+        json.dump({token: i for i, token in enumerate(["<pad>", "<unk>"] + list(" ',.!?-" + string.ascii_lowercase))}, vocab)
+    torch.manual_seed(0)
+    VitsTokenizer(vocab_path, add_blank=True, normalize=True, phonemize=False).save_pretrained(directory)
+    VitsModel(VitsConfig()).save_pretrained(directory)
+    return directory
+
+
+def child(variant, model_name, export_path, output_path):
+    """Load one variant, synthesize PHRASES one at a time and save the waveforms and measurements"""
+    # Imported before timing: every variant pays the same import cost
+    import torch
+    from transformers import VitsConfig, VitsModel, VitsTokenizer
+    from speech.speech_model import SpeechModel
+
+    model_path = export_path if variant.startswith("exported") else tempfile.mkdtemp()
+    model = SpeechModel(model_name=model_name, model_path=model_path, quantize=variant.endswith("int8"))
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    model.load()
+    load_seconds = time.perf_counter() - started
+    rss_loaded = rss_mb()
+    model.synthesize_batch(PHRASES[:1])  # Warm-up
+    waveforms, seconds = [], 0.0
+    for text in PHRASES:
+        started = time.perf_counter()
+        waveforms.append(model.synthesize_batch([text])[0])
+        seconds += time.perf_counter() - started
+    audio_seconds = sum(len(waveform) for waveform in waveforms) / model.sampling_rate
+    np.savez(output_path, *waveforms)
+    print(json.dumps({
+        "load_ms": round(load_seconds * 1000),
+        "model_rss_mb": round(rss_loaded - rss_before),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024),
+        "rtf": round(seconds / audio_seconds, 3)
+    }))
+
+
+def average_spectrum(waveform, frame=1024):
+    frames = len(waveform) // frame
+    if frames == 0:
+        return np.abs(np.fft.rfft(waveform, frame))
+    return np.abs(np.fft.rfft(waveform[:frames * frame].reshape(frames, frame), axis=1)).mean(axis=0)
+
+
+def similarity(reference, waveforms):
+    """Mean spectral cosine similarity and mean length ratio against the reference waveforms"""
+    cosines, ratios = [], []
+    for ref, waveform in zip(reference, waveforms):
+        a, b = average_spectrum(ref), average_spectrum(waveform)
+        cosines.append(float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-12)))
+        ratios.append(len(waveform) / max(1, len(ref)))
+    return round(float(np.mean(cosines)), 4), round(float(np.mean(ratios)), 3)
+
+
+def export_model(directory):
+    from config import DEFAULT_VITS_MODEL
+    from speech.speech_model import SpeechModel
+
+    try:
+        model_name, label = DEFAULT_VITS_MODEL, DEFAULT_VITS_MODEL
+        export_path = SpeechModel(model_name=model_name, model_path=os.path.join(directory, "export")).export()
+    except Exception:
+        model_name = random_checkpoint(os.path.join(directory, "checkpoint"))
+        label = "random-weight VITS (mms-tts-eng architecture; weights unavailable offline)"
+        export_path = SpeechModel(model_name=model_name, model_path=os.path.join(directory, "export")).export()
+    return model_name, export_path, label
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] in VARIANTS:
+        child(*sys.argv[1:])
+        sys.exit(0)
+
+    directory = tempfile.mkdtemp()
+    os.makedirs(os.path.join(directory, "checkpoint"))
+    model_name, export_path, label = export_model(directory)
+    export_mb = os.path.getsize(os.path.join(export_path, "inference_model.pt")) / 1e6
+    print(f"{label}, {len(PHRASES)} utterances, export {export_mb:.0f} MB")
+    print("=" * 60)
+    reference = None
+    for variant in VARIANTS:
+        output_path = os.path.join(directory, f"{variant}.npz")
+        result = subprocess.run([sys.executable, __file__, variant, model_name, export_path, output_path],
+                                capture_output=True, text=True, check=True)
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        waveforms = list(np.load(output_path).values())
+        reference = reference or waveforms
+        cosine, length_ratio = similarity(reference, waveforms)
+        print(f"{variant:14s}: load {stats['load_ms']:5d} ms | model RSS {stats['model_rss_mb']:4d} MB "
+              f"(peak {stats['peak_rss_mb']} MB) | RTF {stats['rtf']} | spectrum cosine {cosine} | length x{length_ratio}")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Vosk transcript latency, upload-then-decode (/transcribe) vs streaming (/stream).
+Replays each WAV file at real-time speed as if it were being captured. Latency is measured from the end of
+capture (the user stops talking) to the full transcript: for /transcribe the whole upload and decode, for
+/stream only what is left to decode after the last frame. Also reports when the first partial result arrived.
+Runs vosk_server in-process, so it needs vosk, flask-sock and a Vosk model.
+
+Usage: VOSK_MODEL_PATH=data/models/vosk/vosk-model-en-us-0.22 python bench_vosk_streaming.py file.wav [file.wav ...]
+Files must be mono 16-bit 16 kHz PCM WAV.
+"""
+
+import io
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+import wave
+
+import requests
+from simple_websocket import Client, ConnectionClosed
+from werkzeug.serving import make_server
+
+from vosk_server import app, END_OF_STREAM
+
+CHUNK_MS = 100  # Audio per WebSocket frame, like a browser's capture buffer
+
+
+def read_wav(path):
+    with wave.open(path, "rb") as wf:
+        if (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) != (1, 2, 16000):
+            raise ValueError(f"{path}: must be mono 16-bit 16 kHz PCM")
+        return wf.readframes(wf.getnframes())
+
+
+def wav_bytes(pcm):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def upload(base_url, pcm):
+    """Seconds from end of capture to the transcript, and the transcript"""
+    time.sleep(len(pcm) / 32000)  # Capture
+    started = time.perf_counter()
+    response = requests.post(f"{base_url}/transcribe", files={"file": ("audio.wav", wav_bytes(pcm), "audio/wav")})
+    return time.perf_counter() - started, response.json().get("transcription", "")
+
+
+def stream(ws_url, pcm):
+    """Seconds from end of capture to the transcript, seconds from start to the first partial, and the transcript"""
+    ws = Client.connect(f"{ws_url}/stream")
+    messages = []
+
+    def receive():
+        while True:
+            message = json.loads(ws.receive())
+            messages.append((time.perf_counter(), message))
+            if message.get("final") or "error" in message:
+                return
+
+    receiver = threading.Thread(target=receive, daemon=True)
+    receiver.start()
+    chunk = 32 * CHUNK_MS  # 16-bit samples at 16 kHz: 32 bytes per ms
+    started = time.perf_counter()
+    for i, offset in enumerate(range(0, len(pcm), chunk)):
+        # Paced like a live microphone: a frame is sent once it has been "captured"
+        time.sleep(max(0.0, started + (i + 1) * CHUNK_MS / 1000 - time.perf_counter()))
+        ws.send(pcm[offset:offset + chunk])
+    captured = time.perf_counter()
+    ws.send(END_OF_STREAM)
+    receiver.join(timeout=30)
+    try:
+        ws.close()
+    except ConnectionClosed:
+        pass  # The server closes after the final message
+    finished, final = messages[-1]
+    first_partial = next((at - started for at, message in messages if message.get("partial")), None)
+    return finished - captured, first_partial, final.get("transcription", "")
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:]
+    if not paths:
+        print(__doc__)
+        sys.exit(1)
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)  # No per-request log lines between results
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    ws_url = f"ws://127.0.0.1:{server.server_port}"
+
+    print(f"Replaying {len(paths)} file(s) at real-time speed, {CHUNK_MS} ms frames")
+    print("=" * 60)
+    upload_latencies, stream_latencies = [], []
+    for path in paths:
+        pcm = read_wav(path)
+        upload_latency, upload_text = upload(base_url, pcm)
+        stream_latency, first_partial, stream_text = stream(ws_url, pcm)
+        upload_latencies.append(upload_latency)
+        stream_latencies.append(stream_latency)
+        partial = f"{first_partial * 1000:.0f} ms" if first_partial is not None else "none"
+        print(f"{path} ({len(pcm) / 32000:.1f} s): upload {upload_latency * 1000:6.0f} ms | stream {stream_latency * 1000:6.0f} ms "
+              f"(first partial {partial}) | same transcript: {upload_text == stream_text}")
+    print(f"median after end of speech: upload {statistics.median(upload_latencies) * 1000:.0f} ms, "
+          f"stream {statistics.median(stream_latencies) * 1000:.0f} ms")
+    server.shutdown()
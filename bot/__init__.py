@@ -1,10 +1,26 @@
 """
 Bot Module: Handles bot functionalities including conversation flow, personality management, and emotion detection.
+
+The exports are imported on first use, so the web server can import bot.worker_pool and bot.phrases without
+loading the bot stack (Firebase, the LLM clients).
 """
 
-from .character_manager import select_character
-from .conversation_bot import ConversationBot
-from .emotion_detector import detect_emotion
-from .response_generator import generate_response, paraphrase, generate_topic
+import importlib
+
+_EXPORTS = {
+    "ConversationBot": ".conversation_bot",
+    "AsyncConversationBot": ".async_conversation_bot",
+    "select_character": ".character_manager",
+    "detect_emotion": ".emotion_detector",
+    "generate_response": ".response_generator",
+    "paraphrase": ".response_generator",
+    "generate_topic": ".response_generator"
+}
+
+__all__ = ["ConversationBot", "AsyncConversationBot", "select_character", "detect_emotion", "generate_response", "paraphrase", "generate_topic"]
+
 
-__all__ = ["ConversationBot", "select_character", "detect_emotion", "generate_response", "paraphrase", "generate_topic"]
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,842 @@
+import asyncio
+import time
+import traceback
+from datetime import datetime
+from uuid import uuid4
+import socketio
+from bot import phrases
+from bot.conversation_bot import ConversationBot, I_STATEMENT_PROMPT, LISTENER_TEMPLATE_STARTERS, SERVER_URL
+from bot.clause_splitter import asplit_clauses
+from bot.i_statement_bank import statement_key, I_STATEMENT_OPENERS
+from bot.prefetch import AsyncPrefetchScheduler
+from bot.emotion_detector import adetect_emotion, emotion_needs_llm
+from bot.response_generator import aparaphrase, astream_paraphrase, clean_paraphrase_input, finish_paraphrase
+from speech.groq_stt_tts import agroq_text_to_speech, astream_text_to_speech
+from speech.tts_cache import tts_cache
+from llm.response_cache import response_cache
+from llm.multi_task import arun_tasks, multi_task_stats
+from config import LLM_MULTI_TASK, LLM_STREAMING, LLM_REQUEST_TIMEOUT, TTS_STREAMING, TTS_STREAM_SAMPLE_RATE, TTS_STREAM_CHUNK_BYTES, TTS_FORMAT_MIME
+
+
+async def atimed(awaitable):
+    """Await and return (result, elapsed seconds), for per-stage turn timing"""
+    started = time.time()
+    result = await awaitable
+    return result, time.time() - started
+
+
+def create_async_socket_client(reconnection_attempts=5):
+    """Create an asyncio SocketIO client with reconnection settings and connection logging."""
+    client = socketio.AsyncClient(
+        reconnection=True,
+        reconnection_attempts=reconnection_attempts,
+        reconnection_delay=1,
+        reconnection_delay_max=5,
+        logger=True,
+        engineio_logger=True
+    )
+
+    @client.event
+    def connect():
+        print("[INFO] Connected to SocketIO server")
+
+    @client.event
+    def disconnect():
+        print("[INFO] Disconnected from SocketIO server")
+
+    @client.event
+    def connect_error(data):
+        print(f"[WARNING] Connection error: {data}")
+
+    return client
+
+
+class AsyncConversationBot(ConversationBot):
+    """
+    asyncio-native ConversationBot: runs the same Speaker-Listener flow as coroutines,
+    so a single event loop can host many concurrent sessions.
+
+    Pass a shared AsyncClient as `sio` to host several bots on one connection; the owner is then
+    responsible for routing `user_input` / `bot_audio_ended` to on_user_input / on_audio_finished.
+    """
+
+    def __init__(self, character_type=None, llm_provider="openai", session_id=None, sio=None, audio_formats=None):
+        self.owns_connection = sio is None
+        super().__init__(character_type, llm_provider, session_id, sio=sio or create_async_socket_client(), audio_formats=audio_formats)
+
+        # asyncio counterparts of the SessionSignal slots used by the threaded bot
+        self.user_input_event = asyncio.Event()
+        self.user_input_value = None
+        self.audio_finished_event = asyncio.Event()
+        self.prefetcher = AsyncPrefetchScheduler()
+
+        if self.owns_connection:
+            self.sio.on("bot_audio_ended", self.on_audio_finished)
+            self.sio.on("user_input", self.on_user_input)
+
+    async def connect_to_server(self):
+        """Connect to SocketIO server with session ID"""
+        try:
+            connect_url = f"{SERVER_URL}?session_id={self.session_id}"
+            await self.sio.connect(connect_url)
+            print(f"[INFO] Connected to SocketIO server at {connect_url}")
+        except Exception as e:
+            print(f"[WARNING] Failed to connect to SocketIO server: {e}")
+            print("[INFO] Will attempt to reconnect automatically...")
+
+    def on_audio_finished(self, data=None):
+        self.audio_finished_event.set()
+
+    def on_user_input(self, data):
+        """Handle user input received from web interface (runs on the event loop, must not block)"""
+        print(f"[BOT] Received user_input event: {data}")
+        if not self.waiting_for_user_input:
+            print("[BOT] Not waiting for user input, ignoring message")
+            return
+
+        message_session_id = data.get('session_id') if isinstance(data, dict) else None
+        if message_session_id and message_session_id != self.session_id:
+            print(f"[BOT] Ignoring message for different session: {message_session_id} != {self.session_id}")
+            return
+
+        user_text = data.get('text', '') if isinstance(data, dict) else str(data)
+        print(f"[BOT] Processing user input: {user_text}")
+        self.waiting_for_user_input = False
+        self.reply_received_at = time.time()
+        self.user_input_value = user_text
+        self.user_input_event.set()
+
+        if user_text and user_text.strip():
+            # Recorded now, in arrival order; emotion detection is an LLM round trip, filled in when it finishes
+            entry = {
+                "speaker": "user",
+                "message": user_text.strip(),
+                "emotion": "neutral",
+                "turn_count": self.turn_count,
+                "bot_role": self.bot_role,
+                "user_role": self.user_role,
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "session_id": self.session_id
+            }
+            self.conversation_history.append(entry)
+            asyncio.get_running_loop().create_task(self.record_user_emotion(entry, user_text))
+
+    def user_emotion(self, text):
+        """Task of (emotion, seconds) for a user reply, memoized for the session by normalized text"""
+        key = self.emotion_key(text)
+        task = self.emotion_memo.get(key)
+        if task is not None:
+            self.emotion_calls_avoided += 1
+            return task
+        if LLM_MULTI_TASK and self.reply_tasks and emotion_needs_llm(text):
+            task = self.batch_reply_tasks(text)["emotion"]
+        else:
+            task = asyncio.get_running_loop().create_task(atimed(adetect_emotion(text)))
+        self.emotion_memo[key] = task
+        return task
+
+    def batch_reply_tasks(self, text):
+        """Async version of ConversationBot.batch_reply_tasks(): {task name: Task of (result, seconds)}"""
+        loop = asyncio.get_running_loop()
+        tasks = self.reply_tasks_for(text)
+        combined = loop.create_task(atimed(arun_tasks(self.llm_api, text, [task for task, _ in tasks.values()])))
+
+        async def result(name):
+            try:
+                results, seconds = await asyncio.shield(combined)
+                return results[name], seconds
+            except Exception as e:
+                print(f"[BOT] Error in combined LLM call: {e}")
+                return tasks[name][0].finish(None), None
+
+        futures = {name: loop.create_task(result(name)) for name in tasks}
+        for name, (_, lookup_text) in tasks.items():
+            if name != "emotion":
+                self.reply_task_memo[(name, self.emotion_key(lookup_text))] = futures[name]
+        return futures
+
+    async def record_user_emotion(self, entry, user_text):
+        entry["emotion"], _ = await self.user_emotion(user_text)
+
+    def stop(self):
+        """Ask the conversation to wind down; pending waits return immediately."""
+        self.stopped = True
+        self.prefetcher.discard()
+        self.waiting_for_user_input = False
+        self.user_input_event.set()
+        self.audio_finished_event.set()
+
+    async def wait_for_audio_to_finish(self):
+        try:
+            await asyncio.wait_for(self.audio_finished_event.wait(), timeout=20)
+        except asyncio.TimeoutError:
+            pass
+
+    async def add_natural_pause(self, message_type="normal"):
+        """Add natural conversational pauses for more realistic bot pacing"""
+        pause_durations = {
+            "introduction": 1.0,
+            "transition": 0.8,
+            "thinking": 0.6,
+            "normal": 0.4,
+            "quick": 0.2
+        }
+
+        duration = pause_durations.get(message_type, 0.8)
+        print(f"[BOT] Adding natural pause ({message_type}): {duration}s")
+        await asyncio.sleep(duration)
+
+    async def send_and_wait(self, text):
+        """
+        Send a message to the user with optional TTS and wait for audio to finish
+        """
+        if self.stopped:
+            return
+        try:
+            print(f"[BOT] send_and_wait called with: {text}")
+            await self.play_speech(text)
+            await self.emit_message(text, "bot")
+
+        except Exception as e:
+            print(f"[ERROR] Exception in send_and_wait: {e}")
+            print(f"[ERROR] Traceback: {traceback.format_exc()}")
+            await self.emit_message(text, "bot")
+            await asyncio.sleep(1)
+
+    async def play_speech(self, text):
+        """Synthesize (or take prefetched) audio for text, send it to the browser and wait until it has played"""
+        if TTS_STREAMING and self.sio.connected:
+            if await self.stream_audio(text):
+                return
+            print(f"[BOT] Streaming TTS produced no audio, falling back to full WAV")
+
+        try:
+            audio_bytes = await self.prefetcher.take(("speech", text)) or await agroq_text_to_speech(text, return_bytes=True, audio_format=self.audio_format)
+        except Exception as tts_error:
+            print(f"[BOT] TTS error: {tts_error}")
+            audio_bytes = None
+
+        if self.sio.connected:
+            if audio_bytes:
+                print(f"[BOT] Emitting audio to session {self.session_id}")
+                self.audio_finished_event.clear()
+                self.record_reply_gap()
+                await self.sio.emit(*self.audio_event(audio_bytes, TTS_FORMAT_MIME[self.audio_format]))
+                await self.wait_for_audio_to_finish()
+            else:
+                print(f"[BOT] TTS failed, continuing with text only")
+                await self.sio.emit("tts_failed", {
+                    "message": "Audio unavailable - text message only",
+                    "session_id": self.session_id
+                })
+                # Brief pause to simulate speech timing
+                await asyncio.sleep(len(text) * 0.05)
+        else:
+            print(f"[BOT] SocketIO not connected, skipping audio")
+            await asyncio.sleep(1)
+
+    def start_streamed_speech(self, clauses, accept=None):
+        """Async version of ConversationBot.start_streamed_speech(): clauses is an async iterator, the queue an asyncio.Queue"""
+        clause_queue = asyncio.Queue()
+
+        async def produce():
+            try:
+                pending, first = [], True
+                async for clause in clauses:
+                    if pending or (first and accept and not accept(clause)):
+                        pending.append(clause)
+                        continue
+                    first = False
+                    self.prefetcher.schedule(("speech", clause), self.synthesize_speech, clause)
+                    clause_queue.put_nowait((True, clause))
+                if pending:
+                    clause_queue.put_nowait((False, " ".join(pending)))
+            except Exception as e:
+                print(f"[BOT] LLM stream failed: {e}")
+            finally:
+                clause_queue.put_nowait(None)
+
+        asyncio.get_running_loop().create_task(produce())
+        return clause_queue
+
+    async def speak_streamed(self, clause_queue):
+        """Async version of ConversationBot.speak_streamed()"""
+        started = time.time()
+        first_clause_seconds = first_audio_at = None
+        spoken = []
+        unspoken = ""
+        while True:
+            try:
+                item = await asyncio.wait_for(clause_queue.get(), timeout=LLM_REQUEST_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"[BOT] LLM stream timed out")
+                break
+            if item is None:
+                break
+            speak, clause = item
+            if not speak:
+                unspoken = clause
+                continue
+            if first_clause_seconds is None:
+                first_clause_seconds = time.time() - started
+                print(f"[BOT] First streamed clause after {first_clause_seconds * 1000:.0f} ms")
+            if not self.stopped:
+                await self.play_speech(clause)
+                if first_audio_at is None and (self.last_audio_sent_at or 0) >= started:
+                    first_audio_at = self.last_audio_sent_at
+            spoken.append(clause)
+        return " ".join(spoken), unspoken, first_clause_seconds, first_audio_at
+
+    async def speak_streamed_paraphrase(self, user_input):
+        """Async version of ConversationBot.speak_streamed_paraphrase()"""
+        clauses = astream_paraphrase(user_input)
+        clause_queue = self.start_streamed_speech(clauses, accept=lambda clause: clause.lower().startswith(LISTENER_TEMPLATE_STARTERS))
+        spoken, unspoken, first_clause_seconds, first_audio_at = await self.speak_streamed(clause_queue)
+        if spoken:
+            paraphrased = spoken if spoken.endswith(('.', '!', '?')) else spoken + '.'
+            await self.emit_message(paraphrased, "bot")
+        else:
+            paraphrased = self.format_listener_paraphrase(user_input, finish_paraphrase(unspoken, clean_paraphrase_input(user_input)))
+            await self.send_and_wait(paraphrased)
+            first_audio_at = self.last_audio_sent_at
+        print(f"[BOT] Paraphrased: {paraphrased}")
+        return paraphrased, first_clause_seconds, first_audio_at
+
+    async def speak_streamed_i_statement(self):
+        """Async version of ConversationBot.speak_streamed_i_statement()"""
+        async def clauses():
+            async for clause in asplit_clauses(self.llm_api.astream_response([{"role": "user", "content": I_STATEMENT_PROMPT}])):
+                yield clause.strip('"')
+
+        clause_queue = self.start_streamed_speech(clauses(), accept=lambda clause: statement_key(clause).startswith(I_STATEMENT_OPENERS))
+        spoken, unspoken, _, _ = await self.speak_streamed(clause_queue)
+        if spoken:
+            i_statement = self.complete_i_statement(spoken)
+            await self.emit_message(f'"{i_statement}"', "bot")
+        else:
+            i_statement = self.complete_i_statement(self.clean_i_statement(unspoken))
+            await self.send_and_wait(f'"{i_statement}"')
+        return i_statement
+
+    async def stream_audio(self, text):
+        """
+        Emit TTS audio as sequenced PCM chunks while it is synthesized, then wait for playback.
+        Returns False if no audio was produced so the caller can fall back to a full WAV.
+        """
+        stream_id = uuid4().hex
+        seq = 0
+        started = time.time()
+        self.audio_finished_event.clear()
+        prefetched = await self.prefetcher.take(("speech", text))
+        async for chunk in self.audio_chunks(text, prefetched):
+            if self.stopped:
+                break
+            if seq == 0:
+                print(f"[BOT] First audio chunk after {(time.time() - started) * 1000:.0f} ms")
+                self.record_reply_gap()
+            await self.sio.emit("audio_chunk", {
+                "session_id": self.session_id,
+                "stream_id": stream_id,
+                "seq": seq,
+                "audio": chunk,
+                "format": "pcm_s16le",
+                "sample_rate": TTS_STREAM_SAMPLE_RATE
+            })
+            seq += 1
+
+        if seq == 0:
+            return False
+        await self.sio.emit("audio_stream_end", {
+            "session_id": self.session_id,
+            "stream_id": stream_id,
+            "chunks": seq
+        })
+        print(f"[BOT] Streamed {seq} audio chunks, waiting for playback")
+        await self.wait_for_audio_to_finish()
+        return True
+
+    async def audio_chunks(self, text, prefetched=None):
+        if prefetched:
+            for i in range(0, len(prefetched), TTS_STREAM_CHUNK_BYTES):
+                yield prefetched[i:i + TTS_STREAM_CHUNK_BYTES]
+        else:
+            async for chunk in astream_text_to_speech(text):
+                yield chunk
+
+    async def synthesize_speech(self, text):
+        """TTS audio in the form send_and_wait() emits it: PCM when streaming, else the session codec"""
+        if TTS_STREAMING:
+            return b"".join([chunk async for chunk in astream_text_to_speech(text)]) or None
+        return await agroq_text_to_speech(text, return_bytes=True, audio_format=self.audio_format)
+
+    async def ready_i_statement(self):
+        """Async version of ConversationBot.ready_i_statement()"""
+        i_statement = await self.prefetcher.take("i_statement")
+        if i_statement:
+            return i_statement
+        if not LLM_STREAMING:
+            return await self.prepare_i_statement()
+        banked = await asyncio.to_thread(self.draw_banked_i_statement)  # Reads the bank file
+        return self.complete_i_statement(banked) if banked else None
+
+    async def prepare_i_statement(self):
+        """Generate the next I-statement and start synthesizing how speaker_mode will say it"""
+        i_statement = self.complete_i_statement(await self.generate_i_statement())
+        self.prefetch_speech(f'"{i_statement}"')
+        return i_statement
+
+    async def listen(self, reply_tasks=()):
+        """Listen for user input with multiple retry attempts and proactive reactivation (see ConversationBot.listen())"""
+        if self.stopped:
+            return None
+        self.reply_tasks = tuple(reply_tasks)
+        try:
+            print(f"[BOT] Starting to listen for user input for session {self.session_id}")
+
+            max_attempts = 3  # Allow 3 attempts for user to respond
+            loop = asyncio.get_running_loop()
+
+            for attempt in range(1, max_attempts + 1):
+                print(f"[BOT] Listen attempt {attempt}/{max_attempts}")
+                self.user_input_event.clear()
+                self.user_input_value = None
+                self.waiting_for_user_input = True
+
+                deadline = loop.time() + 45  # 45 second timeout per attempt
+                keepalive_interval = 5  # Reactivate the microphone every 5 seconds
+
+                while loop.time() < deadline and not self.user_input_event.is_set():
+                    try:
+                        await asyncio.wait_for(self.user_input_event.wait(), timeout=min(keepalive_interval, deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        print(f"[BOT] Sending microphone keep-alive signal (attempt {attempt})")
+                        await self.emit_mic_activated(True)
+
+                if self.stopped:
+                    return None
+
+                if self.user_input_event.is_set():
+                    result = self.user_input_value
+                    self.user_input_event.clear()
+                    print(f"[BOT] Received user input: {result}")
+                    return result
+
+                print(f"[BOT] Timeout on attempt {attempt} waiting for user input (45 seconds)")
+                self.waiting_for_user_input = False
+
+                if attempt < max_attempts:
+                    print(f"[BOT] Reactivating microphone for attempt {attempt + 1}")
+                    await self.emit_mic_activated(True)
+                    await asyncio.sleep(0.5)
+
+            print("[BOT] All attempts exhausted, using default response")
+            return "I'd like to talk about communication"
+
+        except Exception as e:
+            print(f"[ERROR] Failed to listen for speech: {e}")
+            self.waiting_for_user_input = False
+            return "I'd like to talk about communication"
+
+    async def emit_mic_activated(self, activated):
+        """Emit mic activation status to specific session."""
+        try:
+            if self.sio.connected:
+                await self.sio.emit('mic_activated', {
+                    'activated': activated,
+                    'session_id': self.session_id
+                })
+        except Exception as e:
+            pass
+
+    async def emit_message(self, message, sender):
+        try:
+            if sender == "bot":
+                self.conversation_history.append({
+                    "speaker": sender,
+                    "message": message,
+                    "emotion": self.current_emotion,
+                    "turn_count": self.turn_count,
+                    "bot_role": self.bot_role,
+                    "user_role": self.user_role,
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "session_id": self.session_id
+                })
+
+            if self.sio.connected:
+                await self.sio.emit("new_message", {
+                    "text": message,
+                    "sender": sender,
+                    "session_id": self.session_id
+                })
+
+        except Exception as e:
+            print(f"[ERROR] Failed to emit message: {e}")
+
+    async def paraphrase_for_listener(self, user_input):
+        return self.format_listener_paraphrase(user_input, await aparaphrase(user_input))
+
+    async def improve_paraphrase(self, original_user_input, user_feedback):
+        """Generate an improved paraphrase based on user feedback"""
+        try:
+            improved = await aparaphrase(original_user_input)
+            return self.perspective_paraphrase(original_user_input, user_feedback) or improved
+        except Exception as e:
+            print(f"Error improving paraphrase: {e}")
+            return "I hear you sharing something important, and I want to understand it better."
+
+    async def generate_i_statement(self):
+        """Draw an I-statement from the bank; generate one live while the bank is empty"""
+        statement = await asyncio.to_thread(self.draw_banked_i_statement)  # Reads the bank file
+        if statement:
+            return statement
+        try:
+            response = await self.llm_api.agenerate_response([{"role": "user", "content": I_STATEMENT_PROMPT}])
+            return self.clean_i_statement(response)
+        except Exception as e:
+            print(f"Error generating I statement: {e}")
+            return phrases.DEFAULT_I_STATEMENT
+
+    async def clean_and_paraphrase_issue(self, user_input, natural=False):
+        """Clean and properly summarize the user's selected issue using LLM."""
+        cleaned = user_input.strip()
+        if len(cleaned) < 5 or cleaned.lower() in ["yes", "no", "ok", "okay"]:
+            return "a personal topic you'd like to discuss" if natural else "a personal issue you'd like to discuss"
+        try:
+            batched = self.batched_reply_task("issue_summary", cleaned)
+            if batched is not None:
+                return (await batched)[0]
+            response = await self.llm_api.agenerate_response([{"role": "user", "content": self.issue_summary_prompt(cleaned)}], cache_template="issue_summary")
+            return self.finish_issue_summary(response, cleaned)
+        except Exception as e:
+            print(f"Error in issue summarization: {e}")
+            return self.clean_issue_fallback(cleaned)
+
+    async def asave_conversation(self):
+        """Async version of save_conversation(): saves to the local file and Firebase without blocking the event loop"""
+        await asyncio.to_thread(self.save_conversation)
+
+    async def switch_roles(self):
+        announcement = self.next_role_announcement()
+        self.bot_role = "listener" if self.bot_role == "speaker" else "speaker"
+        self.user_role = "speaker" if self.bot_role == "listener" else "listener"
+        self.turn_count += 1
+
+        await self.send_and_wait(announcement)
+        if self.role_explained:
+            await self.add_natural_pause("transition")
+        self.role_explained = True
+
+    async def listen_with_mic(self, reply_tasks=()):
+        """Open the microphone, wait for one reply, close the microphone"""
+        await self.emit_mic_activated(True)
+        user_input = await self.listen(reply_tasks)
+        await self.emit_mic_activated(False)
+        return user_input
+
+    async def paraphrase_or_fallback(self, user_input, paraphrase_task=None):
+        """
+        Speak the listener paraphrase of user_input; paraphrase_task is an already-running atimed(aparaphrase()).
+        Without one, LLM_STREAMING says the paraphrase clause by clause while the LLM streams it.
+        """
+        turn_started = self.reply_received_at or time.time()
+        emotion = self.emotion_memo.get(self.emotion_key(user_input))
+        if paraphrase_task is None and LLM_STREAMING:
+            paraphrased, first_clause_seconds, audio_sent_at = await self.speak_streamed_paraphrase(user_input)
+            self.log_turn_timing(turn_started, {
+                "emotion": emotion.result()[1] if emotion and emotion.done() and not emotion.cancelled() else None,
+                "first paraphrase clause": first_clause_seconds
+            }, audio_sent_at)
+            return paraphrased
+        paraphrase_seconds = None
+        try:
+            if paraphrase_task is None:
+                paraphrase_task = asyncio.ensure_future(atimed(aparaphrase(user_input)))
+            raw_paraphrase, paraphrase_seconds = await paraphrase_task
+            paraphrased = self.format_listener_paraphrase(user_input, raw_paraphrase)
+            print(f"[BOT] Paraphrased: {paraphrased}")
+        except Exception as e:
+            print(f"[BOT] Error in paraphrasing: {e}")
+            # NEVER use verbatim repetition - create a proper paraphrase fallback
+            paraphrased = self.create_fallback_paraphrase(user_input)
+        paraphrase_ready_at = time.time()
+        await self.send_and_wait(paraphrased)
+        self.log_turn_timing(turn_started, {
+            "emotion": emotion.result()[1] if emotion and emotion.done() and not emotion.cancelled() else None,
+            "paraphrase": paraphrase_seconds,
+            "tts": self.last_audio_sent_at - paraphrase_ready_at if (self.last_audio_sent_at or 0) >= paraphrase_ready_at else None
+        })
+        return paraphrased
+
+    async def listener_mode(self):
+        try:
+            await self.emit_mic_activated(False)
+            # The next speaker turn's I-statement does not depend on anything said here
+            self.discard_unused_prefetch()
+            self.prefetch_i_statement()
+            if not self.role_explained:
+                await self.send_and_wait(phrases.SWITCH_TO_LISTENING)
+                self.role_explained = True
+
+            last_paraphrase = None
+            max_listener_attempts = 3  # Prevent infinite loops
+            listener_attempt = 0
+
+            while listener_attempt < max_listener_attempts:
+                listener_attempt += 1
+                print(f"[BOT] Listener attempt {listener_attempt}/{max_listener_attempts}")
+
+                user_input = await self.listen_with_mic(reply_tasks=() if LLM_STREAMING else ("paraphrase",))
+
+                if not user_input or len(user_input.strip()) < 5:
+                    if listener_attempt >= max_listener_attempts:
+                        await self.send_and_wait(phrases.CONTINUE_CONVERSATION)
+                        self.listener_turns_completed += 1
+                        break
+                    await self.send_and_wait(phrases.SHARE_MORE)
+                    continue
+
+                if self.is_goodbye(user_input):
+                    await self.send_and_wait(phrases.GOODBYE)
+                    await self.asave_conversation()
+                    return False
+
+                if user_input.strip().lower() in ["so you said?", "so you said", "what did you say?", "what did you say"] and last_paraphrase:
+                    await self.send_and_wait(f"{last_paraphrase}")
+                    continue
+
+                # ALWAYS paraphrase user input - this is the core of listener mode
+                # Emotion (started when the reply arrived) and paraphrase run together; TTS starts on the paraphrase alone
+                emotion_task = self.user_emotion(user_input)
+                emotion_task.add_done_callback(lambda task: task.cancelled() or setattr(self, "current_emotion", task.result()[0]))
+                paraphrase_task = None if LLM_STREAMING else (self.batched_reply_task("paraphrase", user_input)
+                                                              or asyncio.get_running_loop().create_task(atimed(aparaphrase(user_input))))
+                # Synthesized while the paraphrase plays and the user answers
+                self.prefetch_speech(phrases.DID_I_GET_IT)
+                self.prefetch_speech(phrases.THANK_YOU)
+                self.prefetch_speech(self.next_role_announcement())
+                last_paraphrase = await self.paraphrase_or_fallback(user_input, paraphrase_task)
+                await self.send_and_wait(phrases.DID_I_GET_IT)
+
+                print(f"[BOT] Waiting for confirmation from user")
+                confirmation = await self.listen_with_mic()
+                print(f"[BOT] Received confirmation: {confirmation}")
+                if confirmation and self.is_feedback_about_paraphrasing(confirmation):
+                    print(f"[BOT] User gave paraphrasing feedback: {confirmation}")
+                    await self.send_and_wait(phrases.PARAPHRASE_BETTER)
+                    better_paraphrase = await self.improve_paraphrase(user_input, confirmation)
+                    await self.send_and_wait(better_paraphrase)
+                    await self.send_and_wait(phrases.CAPTURED_BETTER)
+
+                    final_confirmation = await self.listen_with_mic()
+                    if final_confirmation and self.is_confirmation(final_confirmation):
+                        await self.send_and_wait(phrases.THANKS_FOR_FEEDBACK)
+                    else:
+                        await self.send_and_wait(phrases.THANKS_FOR_PATIENCE)
+
+                    self.listener_turns_completed += 1
+                    break
+                elif self.is_confirmation(confirmation):
+                    await self.send_and_wait(phrases.THANK_YOU)
+                    self.listener_turns_completed += 1
+                    break
+                elif confirmation and len(confirmation.strip()) > 2:
+                    print(f"[BOT] User gave non-confirmation response: {confirmation}")
+                    if listener_attempt >= max_listener_attempts:
+                        await self.send_and_wait(phrases.CONTINUE_CONVERSATION)
+                        self.listener_turns_completed += 1
+                        break
+                    await self.send_and_wait(phrases.TRY_AGAIN)
+                    continue
+                else:
+                    await self.send_and_wait(phrases.SAY_IT_AGAIN)
+                    retry_input = await self.listen_with_mic()
+                    if retry_input and len(retry_input.strip()) >= 5:
+                        last_paraphrase = await self.paraphrase_or_fallback(retry_input)
+                        await self.send_and_wait(phrases.DID_I_GET_IT)
+                        retry_confirmation = await self.listen_with_mic()
+                        if retry_confirmation and self.is_confirmation(retry_confirmation):
+                            await self.send_and_wait(phrases.THANK_YOU)
+                        else:
+                            await self.send_and_wait(phrases.CONTINUE)
+                    else:
+                        await self.send_and_wait(phrases.CONTINUE)
+                    self.listener_turns_completed += 1
+                    break
+
+            if listener_attempt >= max_listener_attempts and self.listener_turns_completed == 0:
+                print(f"[BOT] Listener mode timed out, forcing completion")
+                await self.send_and_wait(phrases.THANKS_FOR_SHARING)
+                self.listener_turns_completed += 1
+
+            min_rounds_each_role = 2
+            if (self.speaker_turns_completed >= min_rounds_each_role and
+                    self.listener_turns_completed >= min_rounds_each_role):
+                await self.send_and_wait(phrases.GREAT_PRACTICE)
+                await self.asave_conversation()
+                return False
+            else:
+                await self.switch_roles()
+            return True
+        except Exception as e:
+            print(f"[BOT] Exception in listener_mode: {e}")
+            print(f"[BOT] Traceback: {traceback.format_exc()}")
+            try:
+                await self.send_and_wait(phrases.APOLOGIZE_AND_CONTINUE)
+                self.listener_turns_completed += 1
+                await self.switch_roles()
+                return True
+            except Exception:
+                return False
+
+    async def speaker_mode(self):
+        try:
+            print("[BOT] Entering speaker mode")
+            await self.emit_mic_activated(False)
+            if not self.role_explained:
+                await self.send_and_wait(phrases.BOT_SPEAKS_FIRST)
+                self.role_explained = True
+
+            # Usually generated (and synthesized) during the previous turn; None when it will be streamed
+            self.current_i_statement = await self.ready_i_statement()
+            self.discard_unused_prefetch(keep=[("speech", f'"{self.current_i_statement}"')])
+
+            # Synthesized while the I-statement plays and the user paraphrases it
+            self.prefetch_speech(phrases.CORRECT)
+            self.prefetch_speech(self.next_role_announcement())
+
+            if self.current_i_statement:
+                await self.send_and_wait(f'"{self.current_i_statement}"')
+            else:
+                self.current_i_statement = await self.speak_streamed_i_statement()
+            await self.add_natural_pause("thinking")
+
+            user_response = await self.listen_with_mic()
+
+            if not user_response or len(user_response.strip()) < 5:
+                await self.send_and_wait(phrases.REPEAT_WHAT_I_SAID)
+                user_response = await self.listen_with_mic()
+                if not user_response or len(user_response.strip()) < 5:
+                    await self.send_and_wait(phrases.CONTINUE)
+                    self.speaker_turns_completed += 1
+                    await self.switch_roles()
+                    return True
+
+            if self.is_goodbye(user_response):
+                await self.send_and_wait(phrases.GOODBYE)
+                await self.asave_conversation()
+                return False
+
+            # Scoring may run the embedding model: off the event loop
+            if await asyncio.to_thread(self.is_accurate_paraphrase, self.current_i_statement, user_response):
+                await self.send_and_wait(phrases.CORRECT)
+            else:
+                await self.send_and_wait(phrases.WHAT_I_SAID_WAS)
+                await self.send_and_wait(f'"{self.current_i_statement}"')
+
+                retry_response = await self.listen_with_mic()
+                if retry_response and await asyncio.to_thread(self.is_accurate_paraphrase, self.current_i_statement, retry_response):
+                    await self.send_and_wait(phrases.MUCH_BETTER)
+                else:
+                    summary = self.summarize_i_statement(self.current_i_statement)
+                    await self.send_and_wait(f"That's okay. {summary}")
+
+            self.speaker_turns_completed += 1
+            await self.switch_roles()
+            return True
+        except Exception as e:
+            print(f"Error in speaker mode: {e}")
+            return False
+
+    async def issue_selection_phase(self):
+        try:
+            print("[BOT] Starting issue selection phase")
+            topics = self.generate_issue_suggestions()
+            await self.send_and_wait(f"What would you like to talk about today? For example: {topics}.")
+
+            user_issue = await self.listen_with_mic(reply_tasks=("issue_summary",))
+            own_topic_answers = ["my own topic", "own topic", "my topic", "my own"]
+
+            if not user_issue or len(user_issue.strip()) < 3:
+                await self.send_and_wait(phrases.ASK_TOPIC)
+                user_issue = await self.listen_with_mic(reply_tasks=("issue_summary",))
+            elif user_issue.lower().strip() in own_topic_answers:
+                attempts = 0
+                while attempts < 3:
+                    await self.send_and_wait(phrases.ASK_SPECIFIC_TOPIC)
+                    specific_topic = await self.listen_with_mic(reply_tasks=("issue_summary",))
+                    if specific_topic and len(specific_topic.strip()) > 5 and specific_topic.lower().strip() not in own_topic_answers:
+                        user_issue = specific_topic
+                        break
+                    attempts += 1
+                    if attempts < 3:
+                        await self.send_and_wait(phrases.SUGGEST_TOPIC)
+
+                if not user_issue or user_issue.lower().strip() in own_topic_answers:
+                    user_issue = "communication and understanding"
+
+            cleaned_issue = self.clean_issue_choice(user_issue)
+            self.selected_issue = await self.clean_and_paraphrase_issue(cleaned_issue, natural=True)
+            await self.send_and_wait(f"Thanks for sharing. We'll talk about: {self.selected_issue}")
+            await self.add_natural_pause("thinking")
+            return True
+        except Exception as e:
+            print(f"Error in issue selection phase: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return False
+
+    async def integrated_mode(self):
+        print(f"[BOT] Starting integrated_mode for session {self.session_id}")
+        conversation_rounds = 0
+        max_rounds = 5  # Limit conversation to prevent infinite loops
+
+        self.bot_role = "speaker"
+        self.user_role = "listener"
+        self.selected_issue = None
+
+        # The first I-statement is generated while the introduction plays
+        self.prefetch_i_statement()
+        await self.send_and_wait(phrases.GREETING)
+        await self.add_natural_pause("introduction")
+
+        while conversation_rounds < max_rounds and not self.stopped:
+            print(f"[BOT] Starting conversation round {conversation_rounds + 1}/{max_rounds}")
+
+            if self.bot_role == "listener":
+                success = await self.listener_mode()
+            else:
+                success = await self.speaker_mode()
+
+            if not success:
+                print("[BOT] Conversation ended by user or error")
+                break
+
+            conversation_rounds += 1
+
+        if conversation_rounds >= max_rounds:
+            await self.send_and_wait(phrases.WRAP_UP)
+            await self.asave_conversation()
+
+        if not self.conversation_saved:
+            print(f"[BOT] Safety save: Ensuring conversation is saved for session {self.session_id}")
+            await self.asave_conversation()
+
+    async def main_loop(self):
+        try:
+            if self.owns_connection:
+                await self.connect_to_server()
+            print(f"[BOT] main_loop started for session {self.session_id}")
+            await self.integrated_mode()
+            print(f"[BOT] integrated_mode() completed")
+            print(f"[BOT] TTS cache: {tts_cache.stats()}")
+            print(f"[BOT] LLM cache: {response_cache.stats()}")
+            print(f"[BOT] Latency: {self.latency_report()}")
+            print(f"[BOT] LLM routing: {self.llm_api.stats()}")
+            print(f"[BOT] LLM multi-task calls: {multi_task_stats.stats()}")
+        except Exception as e:
+            print(f"[ERROR] Exception in main_loop: {e}")
+            print(f"[ERROR] Traceback: {traceback.format_exc()}")
+            await self.asave_conversation()
+        finally:
+            self.prefetcher.discard()
+            if self.owns_connection and self.sio.connected:
+                await self.sio.disconnect()
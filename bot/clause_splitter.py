@@ -0,0 +1,73 @@
+"""
+Split a token stream from the LLM into speakable clauses.
+
+TTS can start on the first clause of a reply while the LLM is still decoding the rest. A clause ends at
+sentence punctuation (. ! ?) followed by whitespace, or at a comma, semicolon, colon or dash once it has
+at least min_words words - shorter pieces sound choppy when synthesized on their own.
+"""
+
+import re
+from config import LLM_STREAM_CLAUSE_MIN_WORDS
+
+SENTENCE_END = ".!?"
+CLAUSE_END = ",;:—"
+CLOSERS = "\"')”"
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e"}
+# Punctuation, any closing quotes or brackets, then whitespace - a boundary at the end of the buffer waits for more text
+_BOUNDARY = re.compile(f"[{re.escape(SENTENCE_END + CLAUSE_END)}]+[{re.escape(CLOSERS)}]*(?=\\s)")
+
+
+def is_abbreviation(clause):
+    """True if the period ending clause belongs to an abbreviation or an initial, not a sentence end"""
+    words = clause.rstrip(CLOSERS).rstrip(".").split()
+    last_word = words[-1].lower() if words else ""
+    return last_word in ABBREVIATIONS or (len(last_word) == 1 and last_word.isalpha() and last_word not in "ai")
+
+
+class ClauseSplitter:
+    """Incremental splitter: feed() text deltas as they arrive, flush() the remainder at the end."""
+
+    def __init__(self, min_words=LLM_STREAM_CLAUSE_MIN_WORDS):
+        self.min_words = min_words
+        self.buffer = ""
+
+    def feed(self, delta):
+        """Add a text delta; returns the clauses it completed"""
+        self.buffer += delta
+        clauses = []
+        start = 0
+        for match in _BOUNDARY.finditer(self.buffer):
+            clause = self.buffer[start:match.end()].strip()
+            punctuation = match.group().rstrip(CLOSERS)
+            if punctuation[-1] in SENTENCE_END:
+                if punctuation == "." and is_abbreviation(clause):
+                    continue
+            elif len(clause.split()) < self.min_words:
+                continue
+            if clause:
+                clauses.append(clause)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return clauses
+
+    def flush(self):
+        clause, self.buffer = self.buffer.strip(), ""
+        return [clause] if clause else []
+
+
+def split_clauses(deltas, min_words=LLM_STREAM_CLAUSE_MIN_WORDS):
+    """Clauses from an iterable of text deltas, each yielded as soon as it is complete"""
+    splitter = ClauseSplitter(min_words)
+    for delta in deltas:
+        yield from splitter.feed(delta)
+    yield from splitter.flush()
+
+
+async def asplit_clauses(deltas, min_words=LLM_STREAM_CLAUSE_MIN_WORDS):
+    """Async version of split_clauses() for an async iterable of deltas"""
+    splitter = ClauseSplitter(min_words)
+    async for delta in deltas:
+        for clause in splitter.feed(delta):
+            yield clause
+    for clause in splitter.flush():
+        yield clause
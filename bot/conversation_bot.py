@@ -1,21 +1,33 @@
 import os 
+import base64
 import json
 import random
 import sys
 from datetime import datetime
 import pandas as pd
+from bot import phrases
 from bot.character_manager import select_character
-from bot.emotion_detector import detect_emotion
-from bot.response_generator import generate_response, paraphrase, generate_topic, generate_validation_response, detect_hardship, generate_empathetic_response
-from speech.groq_stt_tts import groq_text_to_speech, groq_speech_to_text
+from bot.emotion_detector import detect_emotion, emotion_needs_llm, emotion_task
+from bot.session_signal import SessionSignal
+from bot.prefetch import PrefetchScheduler, get_reply_executor
+from bot.intent_matcher import match_intents
+from bot.paraphrase_scorer import paraphrase_scorer
+from bot.i_statement_bank import i_statement_bank, statement_key, I_STATEMENT_OPENERS
+from bot.clause_splitter import split_clauses
+from bot.response_generator import generate_response, paraphrase, paraphrase_task, stream_paraphrase, clean_paraphrase_input, finish_paraphrase, generate_topic, generate_validation_response, detect_hardship, generate_empathetic_response
+from speech.groq_stt_tts import groq_text_to_speech, groq_speech_to_text, stream_text_to_speech, negotiate_audio_format
 from speech.speech_recognition_service import listen_for_speech
-from llm.llm_api import LLMApi
-from config import CONVERSATION_DIR, LLM_CONFIG
+from llm.llm_router import get_llm_router
+from llm.multi_task import LLMTask, run_tasks, multi_task_stats
+from config import PARAPHRASE_SIMILARITY_THRESHOLD, I_STATEMENT_BANK_ENABLED, LLM_MULTI_TASK, LLM_STREAMING, LLM_REQUEST_TIMEOUT, CONVERSATION_DIR, LLM_CONFIG, TTS_STREAMING, TTS_STREAM_SAMPLE_RATE, TTS_STREAM_CHUNK_BYTES, AUDIO_TRANSPORT, TTS_FORMAT_MIME, PREFETCH_ENABLED
 import traceback
 import socketio
 import firebase_admin
 from firebase_admin import credentials, firestore
 import time
+import threading
+import queue
+from concurrent.futures import Future
 from uuid import uuid4
 import tempfile
 import speech_recognition as sr
@@ -33,49 +45,70 @@ except Exception as e:
     print("[INFO] Continuing without Firebase...")
     db = None
 
-# Initialize SocketIO client with reconnection settings
-sio = socketio.Client(
-    reconnection=True,
-    reconnection_attempts=5,
-    reconnection_delay=1,
-    reconnection_delay_max=5,
-    logger=True,
-    engineio_logger=True
-)
 SERVER_URL = os.environ.get("SERVER_URL", "http://127.0.0.1:5000")
 
-# Try to connect to SocketIO server with error handling and reconnection
-try:
-    # Don't connect here - wait until we have the session ID
-    pass
-except Exception as e:
-    print(f"[WARNING] Failed to connect to SocketIO server: {e}")
-    print("[INFO] Will attempt to reconnect automatically...")
+def timed(fn, *args, **kwargs):
+    """Call fn and return (result, elapsed seconds), for per-stage turn timing"""
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return result, time.time() - started
+
+def create_socket_client(reconnection_attempts=5):
+    """Create a SocketIO client with reconnection settings and connection logging."""
+    client = socketio.Client(
+        reconnection=True,
+        reconnection_attempts=reconnection_attempts,
+        reconnection_delay=1,
+        reconnection_delay_max=5,
+        logger=True,
+        engineio_logger=True
+    )
+
+    # Add connection event handlers
+    @client.event
+    def connect():
+        print("[INFO] Connected to SocketIO server")
+
+    @client.event
+    def disconnect():
+        print("[INFO] Disconnected from SocketIO server")
+
+    @client.event
+    def connect_error(data):
+        print(f"[WARNING] Connection error: {data}")
 
-# Add connection event handlers
-@sio.event
-def connect():
-    print("[INFO] Connected to SocketIO server")
+    @client.event
+    def session_assigned(data):
+        print(f"[BOT] Received session assignment: {data}")
+        # The server is assigning us a session ID - this should match our intended session
 
-@sio.event
-def disconnect():
-    print("[INFO] Disconnected from SocketIO server")
+    return client
+
+I_STATEMENT_PROMPT = '''Generate a proper "I" statement for a practice conversation.
+
+Rules:
+1. Start with "I feel...", "I think...", or "I believe..."
+2. Do NOT mention any specific topic or issue (keep it open-ended)
+3. Include a specific example or situation, but do not reference any particular subject (e.g., no chores, work, family, etc.)
+4. Express emotions and thoughts clearly
+5. Avoid blaming language
+6. Keep it under 20 words
+7. Make it personal and relatable
+8. Focus on your perspective, not the other person's actions
+9. Use simple, clear language
+10. Do NOT suggest or hint at any particular topic
 
-@sio.event
-def connect_error(data):
-    print(f"[WARNING] Connection error: {data}")
+Only return the statement, nothing else.'''
 
-@sio.event  
-def session_assigned(data):
-    print(f"[BOT] Received session assignment: {data}")
-    # The server is assigning us a session ID - this should match our intended session
+# A paraphrase opening with one of these is said as-is; anything else is wrapped in a listener template
+LISTENER_TEMPLATE_STARTERS = ("it sounds like", "i hear you saying", "what i hear", "if i understand")
 
 class ConversationBot:
-    def __init__(self, character_type=None, llm_provider="openai", session_id=None):
+    def __init__(self, character_type=None, llm_provider="openai", session_id=None, sio=None, audio_formats=None):
         if llm_provider not in LLM_CONFIG:
             raise ValueError(f"Invalid LLM provider: {llm_provider}")
         self.llm_provider = llm_provider
-        self.llm_api = LLMApi(provider=self.llm_provider)
+        self.llm_api = get_llm_router(self.llm_provider)
         self.conversation_history = []
         
         # Use session ID for unique session identification
@@ -99,37 +132,62 @@ class ConversationBot:
         self.introduced = False  # Track if the bot has introduced itself
         self.role_explained = False  # Track if role explanations have been given
         self.waiting_for_user_input = False
-        self.user_input_received = None
-        self.audio_finished = False
+        # Set directly by the SocketIO handlers so waiting threads wake without polling
+        self.user_input_signal = SessionSignal()
+        self.audio_finished_signal = SessionSignal()
         self.current_i_statement = ""
+        self.i_statement_deck = None  # This session's draws from the I-statement bank
+        # TTS codec for this session, from the formats the browser said it can play
+        self.audio_format = negotiate_audio_format(audio_formats)
+        # Likely next utterances prepared while the current one plays
+        self.prefetcher = PrefetchScheduler()
+        self.reply_received_at = None  # When the user's last reply arrived, until the bot's next audio
+        self.reply_gaps = []  # Seconds from user reply to bot audio, per turn
+        self.last_audio_sent_at = None  # When the bot's latest audio was emitted
+        self.emotion_memo = {}  # Normalized user text -> Future of (emotion, seconds), so each utterance is classified once
+        self.emotion_memo_lock = threading.Lock()  # on_user_input runs on the SocketIO thread, listener_mode on the bot's
+        self.emotion_calls_avoided = 0
+        self.reply_tasks = ()  # LLM tasks the awaited reply will need besides its emotion (set by listen())
+        self.reply_task_memo = {}  # (task name, normalized text) -> Future of (result, seconds) from a combined call
         self.conversation_saved = False  # Flag to prevent duplicate saves
+        self.stopped = False  # Set by stop() when the session is ended from the server
 
-        # Connect to SocketIO server with session ID
-        self.connect_to_server()
-        
-        sio.on("bot_audio_ended", self.on_audio_finished)
-        sio.on("user_input", self.on_user_input)
-        self.waiting_for_audio_end = False
+        if sio is None:
+            # Standalone bot (main.py): own connection, joined to the session room on connect
+            self.sio = create_socket_client()
+            self.connect_to_server()
+
+            self.sio.on("bot_audio_ended", self.on_audio_finished)
+            self.sio.on("user_input", self.on_user_input)
+        else:
+            # Pooled bot: the worker's shared connection routes events to us by session_id
+            self.sio = sio
 
     def connect_to_server(self):
         """Connect to SocketIO server with session ID"""
         try:
             # Connect with session ID parameter so server assigns us to correct room
             connect_url = f"{SERVER_URL}?session_id={self.session_id}"
-            sio.connect(connect_url)
+            self.sio.connect(connect_url)
             print(f"[INFO] Connected to SocketIO server at {connect_url}")
         except Exception as e:
             print(f"[WARNING] Failed to connect to SocketIO server: {e}")
             print("[INFO] Will attempt to reconnect automatically...")
 
     def on_audio_finished(self, data=None):
-        self.waiting_for_audio_end = False
+        self.audio_finished_signal.set()
+
+    def stop(self):
+        """Ask the conversation to wind down; pending waits return immediately."""
+        self.stopped = True
+        self.prefetcher.discard()
+        self.waiting_for_user_input = False
+        self.user_input_signal.set()
+        self.audio_finished_signal.set()
 
     def wait_for_audio_to_finish(self):
-        self.waiting_for_audio_end = True
-        timeout = time.time() + 20  # Extended from 12 to 20 seconds for audio playback
-        while self.waiting_for_audio_end and time.time() < timeout:
-            time.sleep(0.1)
+        # The signal is cleared before the audio is emitted, so an early "ended" event is not lost
+        self.audio_finished_signal.wait(timeout=20)  # Extended from 12 to 20 seconds for audio playback
 
     def add_natural_pause(self, message_type="normal"):
         """Add natural conversational pauses for more realistic bot pacing"""
@@ -146,39 +204,22 @@ class ConversationBot:
         time.sleep(duration)
 
     def get_confirmation_prompt(self):
-        prompts = [
-            "Did I get that right? Please say yes or repeat.",
-            "Did I understand you correctly?",
-            "Let me know if I got it right.",
-            "Could you clarify if I missed anything?",
-            "Is that accurate? Please let me know.",
-            "Does that sound right to you?",
-            "Did I capture your meaning?"
-        ]
-        return random.choice(prompts)
+        return random.choice(phrases.CONFIRMATION_PROMPTS)
 
     def get_clarify_prompt(self):
-        prompts = [
-            "Could you tell me a bit more about that?",
-            "I'd love to hear more details.",
-            "Can you explain that a little more?",
-            "Please share a bit more.",
-            "I want to make sure I understand. Could you say it again in your own words?",
-            "Could you help me understand by saying it another way?",
-            "Could you repeat your full statement so I can get it right?"
-        ]
-        return random.choice(prompts)
+        return random.choice(phrases.CLARIFY_PROMPTS)
 
     def paraphrase_for_listener(self, user_input):
         # ALWAYS paraphrase - never shortcut with "Yes, that's right"
         # This is essential for the Speaker-Listener Technique
-        
+        return self.format_listener_paraphrase(user_input, paraphrase(user_input))
+
+    def format_listener_paraphrase(self, user_input, paraphrased):
+        """Wrap a raw paraphrase in a listener template and tidy its punctuation"""
         is_question = user_input.strip().endswith('?')
-        paraphrased = paraphrase(user_input)
         
         # Check if paraphrased already has template phrases to avoid duplication
-        template_starters = ["it sounds like", "i hear you saying", "what i hear", "if i understand"]
-        already_has_template = any(paraphrased.lower().startswith(starter) for starter in template_starters)
+        already_has_template = paraphrased.lower().startswith(LISTENER_TEMPLATE_STARTERS)
         
         if already_has_template:
             # Paraphrase function already provided a complete response
@@ -193,7 +234,6 @@ class ConversationBot:
         # If the paraphrased text contains quotes, it might be a quoted response that needs unwrapping
         if '"' in paraphrased or '"' in paraphrased or '"' in paraphrased:
             # Extract the actual content from quotes
-            import re
             quoted_match = re.search(r'["""]([^"""]+)["""]', paraphrased)
             if quoted_match:
                 paraphrased = quoted_match.group(1).strip()
@@ -252,9 +292,12 @@ class ConversationBot:
     def listener_mode(self):
         try:
             self.emit_mic_activated(False)
+            # The next speaker turn's I-statement does not depend on anything said here
+            self.discard_unused_prefetch()
+            self.prefetch_i_statement()
             # Brief combined introduction (reduce from 2 messages to 1)
             if not self.role_explained:
-                self.send_and_wait("Let's switch roles now! I'm ready to listen. Take your time.")
+                self.send_and_wait(phrases.SWITCH_TO_LISTENING)
                 self.role_explained = True
                 
             last_paraphrase = None
@@ -266,42 +309,66 @@ class ConversationBot:
                 print(f"[BOT] Listener attempt {listener_attempt}/{max_listener_attempts}")
             
                 self.emit_mic_activated(True)
-                user_input = self.listen()
+                user_input = self.listen(reply_tasks=() if LLM_STREAMING else ("paraphrase",))
                 self.emit_mic_activated(False)
                 
                 if not user_input or len(user_input.strip()) < 5:
                     if listener_attempt >= max_listener_attempts:
-                        self.send_and_wait("Let's continue with our conversation.")
+                        self.send_and_wait(phrases.CONTINUE_CONVERSATION)
                         self.listener_turns_completed += 1
                         break
-                    self.send_and_wait("Could you share more?")
+                    self.send_and_wait(phrases.SHARE_MORE)
                     continue
                     
                 if self.is_goodbye(user_input):
-                    self.send_and_wait("Goodbye! Thanks for practicing with me.")
+                    self.send_and_wait(phrases.GOODBYE)
                     self.save_conversation()  # Save conversation before ending
                     return False
                     
-                self.current_emotion = detect_emotion(user_input)
                 # Handle "So you said?" or similar
                 if user_input.strip().lower() in ["so you said?", "so you said", "what did you say?", "what did you say"] and last_paraphrase:
                     self.send_and_wait(f"{last_paraphrase}")
                     continue
                 
                 # ALWAYS paraphrase user input - this is the core of listener mode
-                try:
-                    paraphrased = self.paraphrase_for_listener(user_input)
-                    print(f"[BOT] Paraphrased: {paraphrased}")
-                    last_paraphrase = paraphrased
-                    self.send_and_wait(paraphrased)
-                except Exception as e:
-                    print(f"[BOT] Error in paraphrasing: {e}")
-                    # NEVER use verbatim repetition - create a proper paraphrase fallback
-                    paraphrased = self.create_fallback_paraphrase(user_input)
-                    last_paraphrase = paraphrased
+                # Emotion (started when the reply arrived) and paraphrase are independent LLM calls, so they
+                # run together; TTS starts as soon as the paraphrase text is ready, without waiting for emotion
+                turn_started = self.reply_received_at or time.time()
+                emotion_future = self.user_emotion(user_input)
+                emotion_future.add_done_callback(lambda future: setattr(self, "current_emotion", future.result()[0]))
+                paraphrase_future = None if LLM_STREAMING else (self.batched_reply_task("paraphrase", user_input)
+                                                                or get_reply_executor().submit(timed, paraphrase, user_input))
+                # Synthesized while the paraphrase plays and the user answers
+                self.prefetch_speech(phrases.DID_I_GET_IT)
+                self.prefetch_speech(phrases.THANK_YOU)
+                self.prefetch_speech(self.next_role_announcement())
+                if paraphrase_future is None:
+                    # Spoken clause by clause while the LLM is still generating the rest
+                    paraphrased, first_clause_seconds, audio_sent_at = self.speak_streamed_paraphrase(user_input)
+                    self.log_turn_timing(turn_started, {
+                        "emotion": emotion_future.result()[1] if emotion_future.done() else None,
+                        "first paraphrase clause": first_clause_seconds
+                    }, audio_sent_at)
+                else:
+                    paraphrase_seconds = None
+                    try:
+                        raw_paraphrase, paraphrase_seconds = paraphrase_future.result()
+                        paraphrased = self.format_listener_paraphrase(user_input, raw_paraphrase)
+                        print(f"[BOT] Paraphrased: {paraphrased}")
+                    except Exception as e:
+                        print(f"[BOT] Error in paraphrasing: {e}")
+                        # NEVER use verbatim repetition - create a proper paraphrase fallback
+                        paraphrased = self.create_fallback_paraphrase(user_input)
+                    paraphrase_ready_at = time.time()
                     self.send_and_wait(paraphrased)
+                    self.log_turn_timing(turn_started, {
+                        "emotion": emotion_future.result()[1] if emotion_future.done() else None,
+                        "paraphrase": paraphrase_seconds,
+                        "tts": self.last_audio_sent_at - paraphrase_ready_at if (self.last_audio_sent_at or 0) >= paraphrase_ready_at else None
+                    })
+                last_paraphrase = paraphrased
                 # Brief confirmation prompt
-                self.send_and_wait("Did I get that right?")
+                self.send_and_wait(phrases.DID_I_GET_IT)
                 
                 print(f"[BOT] Waiting for confirmation from user")
                 self.emit_mic_activated(True)
@@ -312,39 +379,39 @@ class ConversationBot:
                 if confirmation and self.is_feedback_about_paraphrasing(confirmation):
                     # User is giving feedback about paraphrasing quality
                     print(f"[BOT] User gave paraphrasing feedback: {confirmation}")
-                    self.send_and_wait("You're absolutely right. Let me paraphrase that better:")
+                    self.send_and_wait(phrases.PARAPHRASE_BETTER)
                     # Try to generate a better paraphrase
                     better_paraphrase = self.improve_paraphrase(user_input, confirmation)
                     self.send_and_wait(better_paraphrase)
-                    self.send_and_wait("Does that capture it better?")
+                    self.send_and_wait(phrases.CAPTURED_BETTER)
                     
                     self.emit_mic_activated(True)
                     final_confirmation = self.listen()
                     self.emit_mic_activated(False)
                     
                     if final_confirmation and self.is_confirmation(final_confirmation):
-                        self.send_and_wait("Great! Thank you for the feedback.")
+                        self.send_and_wait(phrases.THANKS_FOR_FEEDBACK)
                     else:
-                        self.send_and_wait("Thank you for your patience.")
+                        self.send_and_wait(phrases.THANKS_FOR_PATIENCE)
                     
                     self.listener_turns_completed += 1
                     break
                 elif self.is_confirmation(confirmation):
-                    self.send_and_wait("Thank you!")
+                    self.send_and_wait(phrases.THANK_YOU)
                     self.listener_turns_completed += 1
                     break
                 elif confirmation and len(confirmation.strip()) > 2:
                     # User gave a substantive response but it wasn't a clear confirmation
                     print(f"[BOT] User gave non-confirmation response: {confirmation}")
                     if listener_attempt >= max_listener_attempts:
-                        self.send_and_wait("Let's continue with our conversation.")
+                        self.send_and_wait(phrases.CONTINUE_CONVERSATION)
                         self.listener_turns_completed += 1
                         break
-                    self.send_and_wait("Let me try again to understand what you said.")
+                    self.send_and_wait(phrases.TRY_AGAIN)
                     continue  # Go back to the beginning of the loop
                 else:
                     # Brief retry
-                    self.send_and_wait("Could you say it again?")
+                    self.send_and_wait(phrases.SAY_IT_AGAIN)
                     self.emit_mic_activated(True)
                     retry_input = self.listen()
                     self.emit_mic_activated(False)
@@ -360,27 +427,27 @@ class ConversationBot:
                             paraphrased = self.create_fallback_paraphrase(retry_input)
                             last_paraphrase = paraphrased
                             self.send_and_wait(paraphrased)
-                        self.send_and_wait("Did I get that right?")
+                        self.send_and_wait(phrases.DID_I_GET_IT)
                         self.emit_mic_activated(True)
                         retry_confirmation = self.listen()
                         self.emit_mic_activated(False)
                         if retry_confirmation and self.is_confirmation(retry_confirmation):
-                            self.send_and_wait("Thank you!")
+                            self.send_and_wait(phrases.THANK_YOU)
                             self.listener_turns_completed += 1
                             break
                         else:
-                            self.send_and_wait("Let's continue.")
+                            self.send_and_wait(phrases.CONTINUE)
                             self.listener_turns_completed += 1
                             break
                     else:
-                        self.send_and_wait("Let's continue.")
+                        self.send_and_wait(phrases.CONTINUE)
                         self.listener_turns_completed += 1
                         break
                     
             # Safety check: if we exit the loop without completing, force completion
             if listener_attempt >= max_listener_attempts and self.listener_turns_completed == 0:
                 print(f"[BOT] Listener mode timed out, forcing completion")
-                self.send_and_wait("Thank you for sharing.")
+                self.send_and_wait(phrases.THANKS_FOR_SHARING)
                 self.listener_turns_completed += 1
             
             # FIXED: Require minimum 2-3 complete rounds before ending
@@ -388,7 +455,7 @@ class ConversationBot:
             if (self.speaker_turns_completed >= min_rounds_each_role and 
                 self.listener_turns_completed >= min_rounds_each_role):
                 # End with understanding validation, NOT problem-solving
-                self.send_and_wait("Great practice! We both had a chance to feel heard and understood.")
+                self.send_and_wait(phrases.GREAT_PRACTICE)
                 self.save_conversation()
                 return False
             else:
@@ -400,7 +467,7 @@ class ConversationBot:
             print(f"[BOT] Traceback: {traceback.format_exc()}")
             # Try to continue gracefully
             try:
-                self.send_and_wait("I apologize, let's continue our conversation.")
+                self.send_and_wait(phrases.APOLOGIZE_AND_CONTINUE)
                 self.listener_turns_completed += 1
                 self.switch_roles()
                 return True
@@ -412,19 +479,22 @@ class ConversationBot:
             print("[BOT] Entering speaker mode")
             self.emit_mic_activated(False)
             if not self.role_explained:
-                self.send_and_wait("I'll start as speaker. You listen and repeat what you heard.")
+                self.send_and_wait(phrases.BOT_SPEAKS_FIRST)
                 self.role_explained = True
             
-            i_statement = self.generate_i_statement()
-            # Ensure I-statement is complete (ends with a period)
-            if not i_statement.strip().endswith(('.', '!', '?')):
-                i_statement = i_statement.strip() + '.'
+            # Usually generated (and synthesized) during the previous turn; None when it will be streamed
+            self.current_i_statement = self.ready_i_statement()
+            self.discard_unused_prefetch(keep=[("speech", f'"{self.current_i_statement}"')])
             
-            # Store the I-statement for later comparison
-            self.current_i_statement = i_statement.strip()
-            
-            # Send the I-statement with quotes to make it clear
-            self.send_and_wait(f'"{self.current_i_statement}"')
+            # Synthesized while the I-statement plays and the user paraphrases it
+            self.prefetch_speech(phrases.CORRECT)
+            self.prefetch_speech(self.next_role_announcement())
+
+            if self.current_i_statement:
+                # Send the I-statement with quotes to make it clear
+                self.send_and_wait(f'"{self.current_i_statement}"')
+            else:
+                self.current_i_statement = self.speak_streamed_i_statement()
             
             # Brief prompt - combine with short pause
             self.add_natural_pause("thinking")
@@ -436,29 +506,29 @@ class ConversationBot:
             
             # Simple retry logic - only one attempt
             if not user_response or len(user_response.strip()) < 5:
-                self.send_and_wait("Could you repeat what I said?")
+                self.send_and_wait(phrases.REPEAT_WHAT_I_SAID)
                 self.emit_mic_activated(True)
                 user_response = self.listen()
                 self.emit_mic_activated(False)
                 if not user_response or len(user_response.strip()) < 5:
-                    self.send_and_wait("Let's continue.")
+                    self.send_and_wait(phrases.CONTINUE)
                     self.speaker_turns_completed += 1
                     self.switch_roles()
                     return True
             
             if self.is_goodbye(user_response):
-                self.send_and_wait("Goodbye! Thanks for practicing with me.")
+                self.send_and_wait(phrases.GOODBYE)
                 self.save_conversation()  # Save conversation before ending
                 return False
             
             # Check if user's paraphrase is accurate
             if self.is_accurate_paraphrase(self.current_i_statement, user_response):
-                self.send_and_wait("Yes, that's correct!")
+                self.send_and_wait(phrases.CORRECT)
                 self.speaker_turns_completed += 1
                 self.switch_roles()
             else:
                 # User didn't paraphrase accurately - provide feedback and correct paraphrase
-                self.send_and_wait("Let me help you with that. What I said was:")
+                self.send_and_wait(phrases.WHAT_I_SAID_WAS)
                 self.send_and_wait(f'"{self.current_i_statement}"')
                 # self.send_and_wait("Try to repeat back the key points: my feelings, the situation, and the impact.")
                 
@@ -468,7 +538,7 @@ class ConversationBot:
                 self.emit_mic_activated(False)
                 
                 if retry_response and self.is_accurate_paraphrase(self.current_i_statement, retry_response):
-                    self.send_and_wait("Much better! Thank you.")
+                    self.send_and_wait(phrases.MUCH_BETTER)
                 else:
                     # Provide a summary based on the actual I-statement that was said
                     summary = self.summarize_i_statement(self.current_i_statement)
@@ -507,99 +577,199 @@ class ConversationBot:
             return "Let me repeat what I said to help you practice."
 
     def generate_i_statement(self):
-        """Generate a proper "I" statement with specific examples, but keep the topic open-ended"""
-        prompt = '''Generate a proper "I" statement for a practice conversation.
+        """Draw an I-statement from the bank (audio already cached); generate one live while the bank is empty"""
+        statement = self.draw_banked_i_statement()
+        return statement or self.generate_fresh_i_statement()
 
-Rules:
-1. Start with "I feel...", "I think...", or "I believe..."
-2. Do NOT mention any specific topic or issue (keep it open-ended)
-3. Include a specific example or situation, but do not reference any particular subject (e.g., no chores, work, family, etc.)
-4. Express emotions and thoughts clearly
-5. Avoid blaming language
-6. Keep it under 20 words
-7. Make it personal and relatable
-8. Focus on your perspective, not the other person's actions
-9. Use simple, clear language
-10. Do NOT suggest or hint at any particular topic
+    def draw_banked_i_statement(self):
+        if not I_STATEMENT_BANK_ENABLED:
+            return None
+        # Top the bank up in the background; this turn never waits for it
+        i_statement_bank.refill_async(self.character_type, self.generate_fresh_i_statement, phrases.DEFAULT_I_STATEMENT)
+        if self.i_statement_deck is None or self.i_statement_deck.character_type != self.character_type:
+            self.i_statement_deck = i_statement_bank.deck(self.character_type)
+        statement = self.i_statement_deck.draw()
+        if statement:
+            print(f"[BOT] I-statement from bank: {statement}")
+        return statement
 
-Only return the statement, nothing else.'''
+    def generate_fresh_i_statement(self):
+        """Generate a proper "I" statement with specific examples, but keep the topic open-ended"""
         try:
-            response = self.llm_api.generate_response([{"role": "user", "content": prompt}])
-            if response and response.strip():
-                cleaned_response = response.strip()
-                # Remove any extra quotes or periods that might be malformed
-                cleaned_response = cleaned_response.strip('"\'.,;:')
-                # Remove double quotes at start/end if present
-                if cleaned_response.startswith('"') and cleaned_response.endswith('"'):
-                    cleaned_response = cleaned_response[1:-1].strip()
-                # Ensure it ends with a period
-                if not cleaned_response.endswith(('.', '!', '?')):
-                    cleaned_response += '.'
-                
-                if len(cleaned_response.split()) > 30 or "?" in cleaned_response:
-                    return "I feel that open communication is important. I want to make sure we both feel heard and understood."
-                return cleaned_response
-            else:
-                return "I feel that open communication is important. I want to make sure we both feel heard and understood."
+            response = self.llm_api.generate_response([{"role": "user", "content": I_STATEMENT_PROMPT}])
+            return self.clean_i_statement(response)
         except Exception as e:
             print(f"Error generating I statement: {e}")
-            return "I feel that open communication is important. I want to make sure we both feel heard and understood."
+            return phrases.DEFAULT_I_STATEMENT
+
+    def clean_i_statement(self, response):
+        """Normalize an LLM I-statement, falling back to the default when it is unusable"""
+        if response and response.strip():
+            cleaned_response = response.strip()
+            # Remove any extra quotes or periods that might be malformed
+            cleaned_response = cleaned_response.strip('"\'.,;:')
+            # Remove double quotes at start/end if present
+            if cleaned_response.startswith('"') and cleaned_response.endswith('"'):
+                cleaned_response = cleaned_response[1:-1].strip()
+            # Ensure it ends with a period
+            if not cleaned_response.endswith(('.', '!', '?')):
+                cleaned_response += '.'
+            
+            if len(cleaned_response.split()) > 30 or "?" in cleaned_response:
+                return phrases.DEFAULT_I_STATEMENT
+            return cleaned_response
+        else:
+            return phrases.DEFAULT_I_STATEMENT
+
+    def complete_i_statement(self, i_statement):
+        """Ensure the I-statement is a complete sentence (ends with a period)"""
+        if not i_statement.strip().endswith(('.', '!', '?')):
+            i_statement = i_statement.strip() + '.'
+        return i_statement.strip()
+
+    def prepare_i_statement(self):
+        """Generate the next I-statement and start synthesizing how speaker_mode will say it"""
+        i_statement = self.complete_i_statement(self.generate_i_statement())
+        self.prefetch_speech(f'"{i_statement}"')
+        return i_statement
+
+    def ready_i_statement(self):
+        """
+        The speaker turn's I-statement: prefetched, or banked with its audio cached. Without either it is
+        generated now, or None when LLM_STREAMING says it while the LLM streams it (speak_streamed_i_statement).
+        """
+        i_statement = self.prefetcher.take("i_statement")
+        if i_statement:
+            return i_statement
+        if not LLM_STREAMING:
+            return self.prepare_i_statement()
+        banked = self.draw_banked_i_statement()
+        return self.complete_i_statement(banked) if banked else None
+
+    def prefetch_i_statement(self):
+        """Prepare the next speaker turn's I-statement early - it never depends on the user's reply"""
+        if PREFETCH_ENABLED and not self.stopped:
+            self.prefetcher.schedule("i_statement", self.prepare_i_statement)
+
+    def synthesize_speech(self, text):
+        """TTS audio in the form send_and_wait() emits it: PCM when streaming, else the session codec"""
+        if TTS_STREAMING:
+            return b"".join(stream_text_to_speech(text)) or None
+        return groq_text_to_speech(text, return_bytes=True, audio_format=self.audio_format)
+
+    def prefetch_speech(self, text):
+        """Synthesize a likely next utterance while the current audio plays or the user speaks"""
+        if PREFETCH_ENABLED and not self.stopped:
+            self.prefetcher.schedule(("speech", text), self.synthesize_speech, text)
+
+    def discard_unused_prefetch(self, keep=()):
+        """Drop prefetched utterances the conversation went past; the pending I-statement is kept"""
+        for key in self.prefetcher.keys():
+            if key != "i_statement" and key not in keep:
+                self.prefetcher.discard(key)
+
+    def record_reply_gap(self):
+        """Log the time from the user's reply to the bot's next audio"""
+        self.last_audio_sent_at = time.time()
+        if self.reply_received_at is not None:
+            gap = time.time() - self.reply_received_at
+            self.reply_received_at = None
+            self.reply_gaps.append(gap)
+            print(f"[BOT] Reply-to-audio gap: {gap * 1000:.0f} ms")
+
+    @staticmethod
+    def emotion_key(text):
+        """Memo key for a user utterance: case and whitespace don't change its emotion"""
+        return " ".join(text.lower().split())
+
+    def user_emotion(self, text):
+        """
+        Future of (emotion, seconds) for a user reply, memoized for the session by normalized text.
+        on_user_input starts it; listener_mode and repeated answers ("yes", "no") reuse it instead of
+        paying for another emotion LLM call.
+        """
+        key = self.emotion_key(text)
+        with self.emotion_memo_lock:
+            future = self.emotion_memo.get(key)
+            if future is not None:
+                self.emotion_calls_avoided += 1
+                return future
+            if LLM_MULTI_TASK and self.reply_tasks and emotion_needs_llm(text):
+                future = self.batch_reply_tasks(text)["emotion"]
+            else:
+                future = get_reply_executor().submit(timed, detect_emotion, text)
+            self.emotion_memo[key] = future
+            return future
+
+    def reply_tasks_for(self, text):
+        """{task name: (LLMTask, text its caller passes)} for the emotion of a reply and the self.reply_tasks it needs"""
+        tasks = {"emotion": (emotion_task(text), text)}
+        if "paraphrase" in self.reply_tasks:
+            tasks["paraphrase"] = (paraphrase_task(text), text)
+        if "issue_summary" in self.reply_tasks:
+            cleaned_issue = self.clean_issue_choice(text)
+            task = self.issue_summary_task(cleaned_issue)
+            if task is not None:
+                tasks["issue_summary"] = (task, cleaned_issue)
+        return tasks
+
+    def batch_reply_tasks(self, text):
+        """
+        Start one combined LLM call for every task a reply needs (called under emotion_memo_lock).
+        Returns {task name: Future of (result, seconds)}; all but the emotion wait in reply_task_memo for batched_reply_task().
+        """
+        tasks = self.reply_tasks_for(text)
+        futures = {name: Future() for name in tasks}
+        for name, (_, lookup_text) in tasks.items():
+            if name != "emotion":
+                self.reply_task_memo[(name, self.emotion_key(lookup_text))] = futures[name]
+
+        def run():
+            started = time.time()
+            try:
+                results = run_tasks(self.llm_api, text, [task for task, _ in tasks.values()])
+            except Exception as e:
+                print(f"[BOT] Error in combined LLM call: {e}")
+                results = {name: task.finish(None) for name, (task, _) in tasks.items()}
+            for name, future in futures.items():
+                future.set_result((results[name], time.time() - started))
+
+        get_reply_executor().submit(run)
+        return futures
+
+    def batched_reply_task(self, name, text):
+        """Future of (result, seconds) for task name on text if a combined call already covers it, else None"""
+        with self.emotion_memo_lock:
+            return self.reply_task_memo.pop((name, self.emotion_key(text)), None)
+
+    def log_turn_timing(self, turn_started, stages, audio_sent_at=None):
+        """Print each stage's duration and the reply-to-audio critical path for one turn"""
+        breakdown = " | ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in stages.items() if seconds is not None)
+        audio_sent_at = audio_sent_at or self.last_audio_sent_at
+        if audio_sent_at and audio_sent_at >= turn_started:
+            breakdown += f" | reply->audio {(audio_sent_at - turn_started) * 1000:.0f} ms"
+        print(f"[BOT] Turn timing: {breakdown}")
+
+    def latency_report(self):
+        gaps = sorted(self.reply_gaps)
+        return {
+            "turns": len(gaps),
+            "reply_gap_p50_ms": round(gaps[len(gaps) // 2] * 1000) if gaps else None,
+            "reply_gap_max_ms": round(gaps[-1] * 1000) if gaps else None,
+            "emotion_calls_avoided": self.emotion_calls_avoided,
+            "prefetch": self.prefetcher.stats()
+        }
 
     def send_and_wait(self, text):
         """
         Send a message to the user with optional TTS and wait for audio to finish
         """
+        if self.stopped:
+            return
         try:
             print(f"[BOT] send_and_wait called with: {text}")
-            
-            # Generate TTS audio using Groq
-            print(f"[BOT] Generating TTS audio")
-            try:
-                audio_data_url = groq_text_to_speech(text, return_bytes=False)
-            except Exception as tts_error:
-                print(f"[BOT] TTS error: {tts_error}")
-                audio_data_url = None
-            print(f"[BOT] TTS generation completed, audio_data_url: {bool(audio_data_url)}")
-            
-            if sio.connected:
-                print(f"[BOT] SocketIO is connected")
-                if audio_data_url:  # Only emit audio if TTS succeeded
-                    # Extract base64 data from data URL
-                    if audio_data_url.startswith("data:audio/wav;base64,"):
-                        audio_base64 = audio_data_url.split(",")[1]
-                        print(f"[BOT] Emitting audio to session {self.session_id}")
-                        sio.emit("play_audio_base64", {
-                            "audio_base64": audio_base64, 
-                            "mime": "audio/wav",
-                            "session_id": self.session_id
-                        })
-                        # Wait for audio to finish playing
-                        print(f"[BOT] Waiting for audio to finish")
-                        self.wait_for_audio_to_finish()
-                        print(f"[BOT] Audio playback completed")
-                    else:
-                        # Fallback to old method
-                        print(f"[BOT] Using fallback audio method")
-                        sio.emit("play_audio", {
-                            "url": audio_data_url,
-                            "session_id": self.session_id
-                        })
-                        self.wait_for_audio_to_finish()
-                else:
-                    # TTS failed, emit a notification and continue with text only
-                    print(f"[BOT] TTS failed, continuing with text only")
-                    sio.emit("tts_failed", {
-                        "message": "Audio unavailable - text message only",
-                        "session_id": self.session_id
-                    })
-                    # Brief pause to simulate speech timing
-                    time.sleep(len(text) * 0.05)  # Rough estimate of speech duration
-                    
-            else:
-                print(f"[BOT] SocketIO not connected, skipping audio")
-                # Brief pause
-                time.sleep(1)
-                
+            self.play_speech(text)
+
             # Always emit the text message
             print(f"[BOT] Emitting text message")
             self.emit_message(text, "bot")
@@ -614,8 +784,207 @@ Only return the statement, nothing else.'''
             # Brief pause
             time.sleep(1)
 
-    def listen(self):
-        """Listen for user input with multiple retry attempts and proactive reactivation"""
+    def play_speech(self, text):
+        """Synthesize (or take prefetched) audio for text, send it to the browser and wait until it has played"""
+        if TTS_STREAMING and self.sio.connected:
+            if self.stream_audio(text):
+                return
+            print(f"[BOT] Streaming TTS produced no audio, falling back to full WAV")
+        
+        # Generate TTS audio using Groq
+        print(f"[BOT] Generating TTS audio")
+        try:
+            audio_bytes = self.prefetcher.take(("speech", text)) or groq_text_to_speech(text, return_bytes=True, audio_format=self.audio_format)
+        except Exception as tts_error:
+            print(f"[BOT] TTS error: {tts_error}")
+            audio_bytes = None
+        print(f"[BOT] TTS generation completed, audio: {bool(audio_bytes)}")
+        
+        if self.sio.connected:
+            print(f"[BOT] SocketIO is connected")
+            if audio_bytes:  # Only emit audio if TTS succeeded
+                print(f"[BOT] Emitting audio to session {self.session_id}")
+                self.audio_finished_signal.clear()
+                self.record_reply_gap()
+                self.sio.emit(*self.audio_event(audio_bytes, TTS_FORMAT_MIME[self.audio_format]))
+                # Wait for audio to finish playing
+                print(f"[BOT] Waiting for audio to finish")
+                self.wait_for_audio_to_finish()
+                print(f"[BOT] Audio playback completed")
+            else:
+                # TTS failed, emit a notification and continue with text only
+                print(f"[BOT] TTS failed, continuing with text only")
+                self.sio.emit("tts_failed", {
+                    "message": "Audio unavailable - text message only",
+                    "session_id": self.session_id
+                })
+                # Brief pause to simulate speech timing
+                time.sleep(len(text) * 0.05)  # Rough estimate of speech duration
+                
+        else:
+            print(f"[BOT] SocketIO not connected, skipping audio")
+            # Brief pause
+            time.sleep(1)
+
+    def start_streamed_speech(self, clauses, accept=None):
+        """
+        Consume an LLM clause stream in the background, starting TTS for each clause as soon as it is complete.
+        Returns a queue of (speak, clause) items ending with None. If accept(first clause) is False nothing is
+        synthesized and the whole text arrives as one (False, text) item, for the caller to tidy and say itself.
+        """
+        clause_queue = queue.Queue()
+
+        def produce():
+            try:
+                pending, first = [], True
+                for clause in clauses:
+                    if pending or (first and accept and not accept(clause)):
+                        pending.append(clause)
+                        continue
+                    first = False
+                    self.prefetcher.schedule_reply(("speech", clause), self.synthesize_speech, clause)
+                    clause_queue.put((True, clause))
+                if pending:
+                    clause_queue.put((False, " ".join(pending)))
+            except Exception as e:
+                print(f"[BOT] LLM stream failed: {e}")
+            finally:
+                clause_queue.put(None)
+
+        get_reply_executor().submit(produce)
+        return clause_queue
+
+    def speak_streamed(self, clause_queue):
+        """
+        Play streamed clauses in order, each as soon as its audio is ready, while later ones are still being
+        generated. Returns (spoken text, unspoken text, seconds to the first clause, when its audio was sent).
+        """
+        started = time.time()
+        first_clause_seconds = first_audio_at = None
+        spoken = []
+        unspoken = ""
+        while True:
+            try:
+                item = clause_queue.get(timeout=LLM_REQUEST_TIMEOUT)
+            except queue.Empty:
+                print(f"[BOT] LLM stream timed out")
+                break
+            if item is None:
+                break
+            speak, clause = item
+            if not speak:
+                unspoken = clause
+                continue
+            if first_clause_seconds is None:
+                first_clause_seconds = time.time() - started
+                print(f"[BOT] First streamed clause after {first_clause_seconds * 1000:.0f} ms")
+            if not self.stopped:
+                self.play_speech(clause)
+                if first_audio_at is None and (self.last_audio_sent_at or 0) >= started:
+                    first_audio_at = self.last_audio_sent_at
+            spoken.append(clause)
+        return " ".join(spoken), unspoken, first_clause_seconds, first_audio_at
+
+    def speak_streamed_paraphrase(self, user_input):
+        """
+        Say the listener paraphrase while the LLM streams it. A reply that doesn't open with a listener template
+        is formatted like a non-streamed paraphrase and said whole.
+        Returns (paraphrase, seconds to the first clause, when the first audio was sent).
+        """
+        clauses = stream_paraphrase(user_input)
+        clause_queue = self.start_streamed_speech(clauses, accept=lambda clause: clause.lower().startswith(LISTENER_TEMPLATE_STARTERS))
+        spoken, unspoken, first_clause_seconds, first_audio_at = self.speak_streamed(clause_queue)
+        if spoken:
+            paraphrased = spoken if spoken.endswith(('.', '!', '?')) else spoken + '.'
+            self.emit_message(paraphrased, "bot")
+        else:
+            paraphrased = self.format_listener_paraphrase(user_input, finish_paraphrase(unspoken, clean_paraphrase_input(user_input)))
+            self.send_and_wait(paraphrased)
+            first_audio_at = self.last_audio_sent_at
+        print(f"[BOT] Paraphrased: {paraphrased}")
+        return paraphrased, first_clause_seconds, first_audio_at
+
+    def speak_streamed_i_statement(self):
+        """Generate a live I-statement and say it while the LLM streams it; returns the statement"""
+        clauses = (clause.strip('"') for clause in split_clauses(
+            self.llm_api.stream_response([{"role": "user", "content": I_STATEMENT_PROMPT}])))
+        clause_queue = self.start_streamed_speech(clauses, accept=lambda clause: statement_key(clause).startswith(I_STATEMENT_OPENERS))
+        spoken, unspoken, _, _ = self.speak_streamed(clause_queue)
+        if spoken:
+            i_statement = self.complete_i_statement(spoken)
+            self.emit_message(f'"{i_statement}"', "bot")
+        else:
+            i_statement = self.complete_i_statement(self.clean_i_statement(unspoken))
+            self.send_and_wait(f'"{i_statement}"')
+        return i_statement
+
+    def audio_event(self, audio_bytes, mime="audio/wav"):
+        """
+        Build the SocketIO event for one utterance: raw bytes sent as a binary frame,
+        or a base64 string when AUDIO_TRANSPORT=base64.
+        """
+        if AUDIO_TRANSPORT == "base64":
+            return "play_audio_base64", {
+                "audio_base64": base64.b64encode(audio_bytes).decode("utf-8"),
+                "mime": mime,
+                "session_id": self.session_id
+            }
+        return "play_audio_binary", {
+            "audio": audio_bytes,
+            "mime": mime,
+            "session_id": self.session_id
+        }
+
+    def stream_audio(self, text):
+        """
+        Emit TTS audio as sequenced PCM chunks while it is synthesized, then wait for playback.
+        Returns False if no audio was produced so the caller can fall back to a full WAV.
+        """
+        stream_id = uuid4().hex
+        seq = 0
+        started = time.time()
+        self.audio_finished_signal.clear()
+        prefetched = self.prefetcher.take(("speech", text))
+        if prefetched:
+            chunks = (prefetched[i:i + TTS_STREAM_CHUNK_BYTES] for i in range(0, len(prefetched), TTS_STREAM_CHUNK_BYTES))
+        else:
+            chunks = stream_text_to_speech(text)
+        for chunk in chunks:
+            if self.stopped:
+                break
+            if seq == 0:
+                print(f"[BOT] First audio chunk after {(time.time() - started) * 1000:.0f} ms")
+                self.record_reply_gap()
+            self.sio.emit("audio_chunk", {
+                "session_id": self.session_id,
+                "stream_id": stream_id,
+                "seq": seq,
+                "audio": chunk,
+                "format": "pcm_s16le",
+                "sample_rate": TTS_STREAM_SAMPLE_RATE
+            })
+            seq += 1
+
+        if seq == 0:
+            return False
+        self.sio.emit("audio_stream_end", {
+            "session_id": self.session_id,
+            "stream_id": stream_id,
+            "chunks": seq
+        })
+        print(f"[BOT] Streamed {seq} audio chunks, waiting for playback")
+        self.wait_for_audio_to_finish()
+        return True
+
+    def listen(self, reply_tasks=()):
+        """
+        Listen for user input with multiple retry attempts and proactive reactivation.
+        reply_tasks names the LLM tasks the reply will need ("paraphrase", "issue_summary"), so they can share
+        one call with its emotion (LLM_MULTI_TASK).
+        """
+        if self.stopped:
+            return None
+        self.reply_tasks = tuple(reply_tasks)
         try:
             print(f"[BOT] Starting to listen for user input for session {self.session_id}")
             
@@ -625,34 +994,38 @@ Only return the statement, nothing else.'''
             while attempt <= max_attempts:
                 print(f"[BOT] Listen attempt {attempt}/{max_attempts}")
                 
+                self.user_input_signal.clear()
                 self.waiting_for_user_input = True
-                self.user_input_received = None
                 
                 print("[BOT] Set waiting_for_user_input to True")
                 
-                # Set up a timeout for user input with shorter check intervals for responsiveness
+                # Set up a timeout for user input; the thread sleeps until input arrives or a keep-alive is due
                 timeout = time.time() + 45  # Extended from 30 to 45 second timeout
                 last_keepalive = time.time()
                 keepalive_interval = 5  # Reduced from 10 to 5 seconds for more frequent microphone reactivation
                 
-                while self.waiting_for_user_input and time.time() < timeout:
-                    time.sleep(0.1)
-                    
-                    # Check for user input
-                    if self.user_input_received:
-                        result = self.user_input_received
-                        self.user_input_received = None
-                        self.waiting_for_user_input = False
-                        print(f"[BOT] Received user input: {result}")
-                        return result
+                while time.time() < timeout:
+                    wait_time = min(timeout, last_keepalive + keepalive_interval) - time.time()
+                    if self.user_input_signal.wait(timeout=max(wait_time, 0)) or self.stopped:
+                        break
                     
                     # Send periodic keep-alive microphone signals to maintain responsiveness
                     current_time = time.time()
-                    if current_time - last_keepalive > keepalive_interval:
+                    if current_time - last_keepalive >= keepalive_interval:
                         print(f"[BOT] Sending microphone keep-alive signal (attempt {attempt})")
                         self.emit_mic_activated(True)
                         last_keepalive = current_time
                 
+                if self.stopped:
+                    return None
+
+                # Check for user input
+                if self.user_input_signal.is_set():
+                    result = self.user_input_signal.value
+                    self.user_input_signal.clear()
+                    print(f"[BOT] Received user input: {result}")
+                    return result
+
                 print(f"[BOT] Timeout on attempt {attempt} waiting for user input (45 seconds)")
                 self.waiting_for_user_input = False
                 
@@ -691,23 +1064,25 @@ Only return the statement, nothing else.'''
             
             user_text = data.get('text', '') if isinstance(data, dict) else str(data)
             print(f"[BOT] Processing user input: {user_text}")
-            self.user_input_received = user_text
             self.waiting_for_user_input = False
+            self.reply_received_at = time.time()
+            self.user_input_signal.set(user_text)  # Wakes listen() immediately
             
             # Add user message to conversation history only (don't emit to frontend to avoid duplication)
             if user_text and user_text.strip():
-                # Add to conversation history with emotion detection
-                user_emotion = detect_emotion(user_text)
-                self.conversation_history.append({
+                # Add to conversation history; emotion detection is an LLM round trip, filled in when it finishes
+                entry = {
                     "speaker": "user",
                     "message": user_text.strip(),
-                    "emotion": user_emotion,
+                    "emotion": "neutral",
                     "turn_count": self.turn_count,
                     "bot_role": self.bot_role,
                     "user_role": self.user_role,
                     "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     "session_id": self.session_id
-                })
+                }
+                self.conversation_history.append(entry)
+                self.user_emotion(user_text).add_done_callback(lambda future: entry.update(emotion=future.result()[0]))
                 
             # Real-time Firebase save disabled to prevent overwrites
             # Final save will happen in save_conversation() with unique timestamp
@@ -715,32 +1090,36 @@ Only return the statement, nothing else.'''
         else:
             print("[BOT] Not waiting for user input, ignoring message")
 
+    def next_role_announcement(self):
+        """What switch_roles() will say next, so it can be prefetched"""
+        next_bot_role = "listener" if self.bot_role == "speaker" else "speaker"
+        if not self.role_explained:
+            if next_bot_role == "listener":
+                return phrases.SWITCH_USER_SPEAKER_COACHED
+            return phrases.SWITCH_BOT_SPEAKER_COACHED
+        # Clearly announce who has the floor after role switch
+        if next_bot_role == "listener":
+            return phrases.SWITCH_USER_SPEAKER
+        return phrases.SWITCH_BOT_SPEAKER
+
     def switch_roles(self):
         # Removed intermediate save - will save at conversation end
+        announcement = self.next_role_announcement()
         self.bot_role = "listener" if self.bot_role == "speaker" else "speaker"
         self.user_role = "speaker" if self.bot_role == "listener" else "listener"
         # Increment turn count when roles switch
         self.turn_count += 1
         
-        if not self.role_explained:
-            if self.bot_role == "listener":
-                self.send_and_wait("Let's switch roles now! Now you are the speaker and I'll listen. As the speaker, share your thoughts. I'll listen and repeat what I hear.")
-            else:
-                self.send_and_wait("Let's switch roles now! Now I'm the speaker and you'll listen. As the listener, repeat what you hear so I feel understood.")
-            self.role_explained = True
-        else:
-            # Clearly announce who has the floor after role switch
-            if self.bot_role == "listener":
-                self.send_and_wait("Let's switch roles now! Now you're the speaker - please share your thoughts.")
-            else:
-                self.send_and_wait("Let's switch roles now! Now I'm the speaker - please listen.")
+        self.send_and_wait(announcement)
+        if self.role_explained:
             self.add_natural_pause("transition")
+        self.role_explained = True
 
     def emit_mic_activated(self, activated):
         """Emit mic activation status to specific session."""
         try:
-            if sio.connected:
-                sio.emit('mic_activated', {
+            if self.sio.connected:
+                self.sio.emit('mic_activated', {
                     'activated': activated,
                     'session_id': self.session_id
                 })
@@ -762,10 +1141,10 @@ Only return the statement, nothing else.'''
                     "session_id": self.session_id
                 })
 
-            if sio.connected:
+            if self.sio.connected:
                 print(f"[BOT] Emitting message: {message[:50]}... from {sender} for session {self.session_id}")
                 # Send to specific session room instead of broadcasting
-                sio.emit("new_message", {
+                self.sio.emit("new_message", {
                     "text": message, 
                     "sender": sender,
                     "session_id": self.session_id
@@ -794,13 +1173,16 @@ Only return the statement, nothing else.'''
         
         print(f"[BOT] Bot's topic is open-ended.")
         
+        # The first I-statement is generated while the introduction plays
+        self.prefetch_i_statement()
+
         # Send introduction message
-        self.send_and_wait("Hi, I'm Charisma Bot. Today we'll practice the Speaker-Listener Technique")
+        self.send_and_wait(phrases.GREETING)
         self.add_natural_pause("introduction")
         
         print(f"[BOT] Starting conversation rounds")
         
-        while conversation_rounds < max_rounds:
+        while conversation_rounds < max_rounds and not self.stopped:
             print(f"[BOT] Starting conversation round {conversation_rounds + 1}/{max_rounds}")
             
             if self.bot_role == "listener":
@@ -815,7 +1197,7 @@ Only return the statement, nothing else.'''
             conversation_rounds += 1
         
         if conversation_rounds >= max_rounds:
-            self.send_and_wait("Thank you for this wonderful conversation! Let's wrap up here.")
+            self.send_and_wait(phrases.WRAP_UP)
             print("[BOT] Conversation completed - reached maximum rounds")
             self.save_conversation()  # Save conversation when max rounds reached
         
@@ -839,23 +1221,23 @@ Only return the statement, nothing else.'''
             print("[BOT] Topic prompt sent, activating mic")
             
             self.emit_mic_activated(True)
-            user_issue = self.listen()
+            user_issue = self.listen(reply_tasks=("issue_summary",))
             self.emit_mic_activated(False)
             print(f"[BOT] Received user issue: {user_issue}")
             
             # Handle "My own topic" properly
             if not user_issue or len(user_issue.strip()) < 3:
-                self.send_and_wait("What topic would you like to discuss?")
+                self.send_and_wait(phrases.ASK_TOPIC)
                 self.emit_mic_activated(True)
-                user_issue = self.listen()
+                user_issue = self.listen(reply_tasks=("issue_summary",))
                 self.emit_mic_activated(False)
             elif user_issue.lower().strip() in ["my own topic", "own topic", "my topic", "my own"]:
                 # Keep asking until we get a specific topic
                 attempts = 0
                 while attempts < 3:
-                    self.send_and_wait("What specific topic would you like to talk about?")
+                    self.send_and_wait(phrases.ASK_SPECIFIC_TOPIC)
                     self.emit_mic_activated(True)
-                    specific_topic = self.listen()
+                    specific_topic = self.listen(reply_tasks=("issue_summary",))
                     self.emit_mic_activated(False)
                     
                     if specific_topic and len(specific_topic.strip()) > 5 and specific_topic.lower().strip() not in ["my own topic", "own topic", "my topic", "my own"]:
@@ -864,7 +1246,7 @@ Only return the statement, nothing else.'''
                     
                     attempts += 1
                     if attempts < 3:
-                        self.send_and_wait("Please share a specific topic you'd like to discuss, like 'work stress' or 'family relationships'.")
+                        self.send_and_wait(phrases.SUGGEST_TOPIC)
                 
                 # If still no specific topic after 3 attempts, use a default
                 if not user_issue or user_issue.lower().strip() in ["my own topic", "own topic", "my topic", "my own"]:
@@ -925,7 +1307,29 @@ Only return the statement, nothing else.'''
             return "a personal topic you'd like to discuss" if natural else "a personal issue you'd like to discuss"
         
         # Use LLM for intelligent issue summarization
-        prompt = f"""Summarize this topic into a clear, natural phrase for conversation:
+        try:
+            batched = self.batched_reply_task("issue_summary", cleaned)
+            if batched is not None:
+                return batched.result()[0]
+            response = self.llm_api.generate_response([{"role": "user", "content": self.issue_summary_prompt(cleaned)}], cache_template="issue_summary")
+            return self.finish_issue_summary(response, cleaned)
+                
+        except Exception as e:
+            print(f"Error in issue summarization: {e}")
+            return self.clean_issue_fallback(cleaned)
+
+    def issue_summary_task(self, user_input):
+        """clean_and_paraphrase_issue() as an LLMTask, or None when the input is too short to summarize"""
+        cleaned = user_input.strip()
+        if len(cleaned) < 5 or cleaned.lower() in ["yes", "no", "ok", "okay"]:
+            return None
+        return LLMTask("issue_summary", self.issue_summary_prompt(cleaned),
+                       'the topic as a clear, natural phrase under 12 words that fits "We\'ll talk about: ...", '
+                       'e.g. "work-life balance" or "managing homework workload and stress"',
+                       lambda response: self.finish_issue_summary(response, cleaned), cache_template="issue_summary")
+
+    def issue_summary_prompt(self, cleaned):
+        return f"""Summarize this topic into a clear, natural phrase for conversation:
 
 User input: "{cleaned}"
 
@@ -945,31 +1349,26 @@ Examples:
 
 Only return the clean summary, nothing else."""
 
-        try:
-            response = self.llm_api.generate_response([{"role": "user", "content": prompt}])
+    def finish_issue_summary(self, response, cleaned):
+        """Tidy the LLM issue summary, or clean the raw input if the LLM returned nothing"""
+        if response and response.strip():
+            summary = response.strip()
             
-            if response and response.strip():
-                summary = response.strip()
-                
-                # Ensure proper capitalization
-                if summary and not summary[0].isupper():
-                    summary = summary[0].lower() + summary[1:]
-                
-                # Remove any quotes or extra punctuation
-                summary = summary.strip('"\'.,;:')
-                
-                # Ensure it's not too long
-                if len(summary.split()) <= 12:
-                    return summary
-                else:
-                    # Truncate if too long
-                    return ' '.join(summary.split()[:12])
+            # Ensure proper capitalization
+            if summary and not summary[0].isupper():
+                summary = summary[0].lower() + summary[1:]
+            
+            # Remove any quotes or extra punctuation
+            summary = summary.strip('"\'.,;:')
+            
+            # Ensure it's not too long
+            if len(summary.split()) <= 12:
+                return summary
             else:
-                # Fallback - clean the original input
-                return self.clean_issue_fallback(cleaned)
-                
-        except Exception as e:
-            print(f"Error in issue summarization: {e}")
+                # Truncate if too long
+                return ' '.join(summary.split()[:12])
+        else:
+            # Fallback - clean the original input
             return self.clean_issue_fallback(cleaned)
     
     def clean_issue_fallback(self, user_input):
@@ -1009,28 +1408,23 @@ Only return the clean summary, nothing else."""
         return random.choice(suggestions)
 
     def is_confirmation(self, text):
-        confirmation_phrases = ["yes", "correct", "right", "that is correct", "yes that is correct", 
-                               "affirmative", "indeed", "uh yes", "uh, yes", "um yes", "um, yes", 
-                               "yeah", "yep", "yup", "that's right", "exactly"]
-        negation_phrases = ["no", "not", "incorrect", "wrong", "that's not right", "nope", "that's wrong"]
         if not text:
             return False
-        text_lower = text.lower().strip()
+        intents = match_intents(text)
         
         # Handle feedback with corrections (these are NOT simple confirmations)
-        feedback_phrases = ["but you should", "you should have", "but it should", "however you", "except you"]
-        if any(phrase in text_lower for phrase in feedback_phrases):
+        if "correction" in intents:
             return False  # This is feedback, not confirmation
         
         # If both yes and no/negation present, treat as ambiguous
-        if any(yes in text_lower for yes in confirmation_phrases) and any(no in text_lower for no in negation_phrases):
+        if "confirmation" in intents and "negation" in intents:
             return None  # ambiguous
         
         # Check for clear confirmations
-        return any(phrase in text_lower for phrase in confirmation_phrases) and not any(no in text_lower for no in negation_phrases)
+        return "confirmation" in intents and "negation" not in intents
 
     def is_goodbye(self, text):
-        return any(word in text.lower() for word in ['goodbye', 'bye', 'ok bye', 'exit', 'quit'])
+        return "goodbye" in match_intents(text)
 
     def generate_follow_up_response(self):
         prompts = [
@@ -1139,6 +1533,9 @@ Only return the clean summary, nothing else."""
             print(f"[BOT] About to call integrated_mode()")
             self.integrated_mode()
             print(f"[BOT] integrated_mode() completed")
+            print(f"[BOT] Latency: {self.latency_report()}")
+            print(f"[BOT] LLM routing: {self.llm_api.stats()}")
+            print(f"[BOT] LLM multi-task calls: {multi_task_stats.stats()}")
         except KeyboardInterrupt:
             print("\n[INFO] Keyboard Interrupt detected. Saving conversation...")
             self.save_conversation()
@@ -1152,24 +1549,16 @@ Only return the clean summary, nothing else."""
 
     def is_user_paraphrase(self, user_input):
         # Detect if user input is a paraphrase/confirmation
-        user_input_lower = user_input.lower().strip()
+        intents = match_intents(user_input)
         
-        # Paraphrase markers that indicate user is trying to repeat back
-        paraphrase_markers = [
-            'you said', 'you feel', 'you think', 'you believe', 'you mentioned',
-            'i heard you say', 'what i heard', 'you talked about', 'you were saying'
-        ]
-        
-        # Check if input contains paraphrase markers
-        has_markers = any(marker in user_input_lower for marker in paraphrase_markers)
+        # Check if input contains paraphrase markers ("you said", "what I heard", ...)
+        has_markers = "paraphrase_marker" in intents
         
         # Check if input is substantial enough to be a paraphrase (more than 10 words)
         is_substantial = len(user_input.split()) >= 10
         
         # Check if it's not just a simple confirmation (including hesitant ones)
-        simple_confirmations = ['yes', 'correct', 'right', 'that is correct', 'yes that is correct', 
-                              'uh yes', 'uh, yes', 'um yes', 'um, yes', 'yeah', 'yep', 'yup']
-        is_simple_confirmation = any(conf in user_input_lower for conf in simple_confirmations)
+        is_simple_confirmation = "simple_confirmation" in intents
         
         # It's a paraphrase if it has markers and is substantial, or if it's clearly referencing what was said
         return (has_markers and is_substantial) or (is_substantial and not is_simple_confirmation)
@@ -1185,13 +1574,7 @@ Only return the clean summary, nothing else."""
             print(f"[BOT] Original: {original_clean}")
             print(f"[BOT] User said: {user_clean}")
             
-            # STRICT: Immediately reject obvious nonsense content
-            nonsense_patterns = [
-                'mangoes', 'apples', 'bananas', 'oranges',  # Fruit nonsense
-                'blah', 'bla', 'whatever', 'random', 'nonsense',
-                'asdfgh', 'qwerty', 'xyz', 'abc',  # Random typing
-                'test', 'testing', '123', 'hello world'  # Test inputs
-            ]
+            intents = match_intents(user_paraphrase)
             
             # Check for repeated nonsense words (like "mangoes, mangoes, mangoes")
             words = user_clean.split()
@@ -1202,8 +1585,8 @@ Only return the clean summary, nothing else."""
                         print(f"[BOT] Detected repeated nonsense word: {words[i]}")
                         return False
             
-            # Check for any nonsense content
-            if any(pattern in user_clean for pattern in nonsense_patterns):
+            # STRICT: Immediately reject obvious nonsense content (fruit, keyboard mashing, test inputs)
+            if "nonsense" in intents:
                 print(f"[BOT] Detected nonsense content in paraphrase")
                 return False
             
@@ -1225,17 +1608,19 @@ Only return the clean summary, nothing else."""
                 print(f"[BOT] Detected incomplete/broken sentence structure or speech recognition errors")
                 return False
             
-            # STRICT: Must contain key perspective transformation words
-            required_perspective_indicators = [
-                'you feel', 'you said', 'you think', 'you believe', 'you mentioned',
-                'you talked about', 'you were saying', 'you expressed', 'you shared'
-            ]
-            
-            has_perspective_transformation = any(indicator in user_clean for indicator in required_perspective_indicators)
+            # STRICT: Must contain key perspective transformation words ("you feel", "you said", ...)
+            has_perspective_transformation = "perspective" in intents
             if not has_perspective_transformation:
                 print(f"[BOT] Paraphrase lacks proper perspective transformation")
                 return False
             
+            # Semantic similarity when the embedding model is available: synonyms and word forms still match
+            similarity = paraphrase_scorer.similarity(original_statement, user_paraphrase)
+            if similarity is not None:
+                is_accurate = similarity >= PARAPHRASE_SIMILARITY_THRESHOLD
+                print(f"[BOT] Paraphrase similarity: {similarity:.2f} -> {is_accurate} (threshold {PARAPHRASE_SIMILARITY_THRESHOLD})")
+                return is_accurate
+            
             # Extract key concepts from original statement
             original_concepts = self.extract_key_concepts(original_clean)
             user_concepts = self.extract_key_concepts(user_clean)
@@ -1286,39 +1671,34 @@ Only return the clean summary, nothing else."""
 
     def is_feedback_about_paraphrasing(self, text):
         """Detect if user is giving feedback about paraphrasing quality"""
-        feedback_indicators = [
-            "but you should", "you should have", "in your perspective", "from your perspective",
-            "you should say", "you didn't paraphrase", "not paraphrasing", "just repeating",
-            "that's not paraphrasing", "you're just saying", "you repeated", "say it differently"
-        ]
-        text_lower = text.lower()
-        return any(indicator in text_lower for indicator in feedback_indicators)
+        return "paraphrase_feedback" in match_intents(text)
 
     def improve_paraphrase(self, original_user_input, user_feedback):
         """Generate an improved paraphrase based on user feedback"""
         try:
             # Use the paraphrase function but with specific instructions based on feedback
             improved = paraphrase(original_user_input)
-            
-            # If the feedback mentions perspective, ensure we transform pronouns properly
-            if "perspective" in user_feedback.lower() or "your" in user_feedback.lower():
-                # Transform "I" statements to "you" statements properly
-                transformed = original_user_input.lower()
-                transformed = transformed.replace("i want you to know", "you want me to understand")
-                transformed = transformed.replace("i have been", "you've been")  
-                transformed = transformed.replace("i am", "you are")
-                transformed = transformed.replace("i'm", "you're")
-                transformed = transformed.replace("i feel", "you feel")
-                transformed = transformed.replace("i don't know", "you're uncertain")
-                
-                return f"It sounds like {transformed}."
-            
-            return improved
+            return self.perspective_paraphrase(original_user_input, user_feedback) or improved
             
         except Exception as e:
             print(f"Error improving paraphrase: {e}")
             return "I hear you sharing something important, and I want to understand it better."
 
+    def perspective_paraphrase(self, original_user_input, user_feedback):
+        """If the feedback mentions perspective, transform pronouns properly; otherwise None"""
+        if "perspective" in user_feedback.lower() or "your" in user_feedback.lower():
+            # Transform "I" statements to "you" statements properly
+            transformed = original_user_input.lower()
+            transformed = transformed.replace("i want you to know", "you want me to understand")
+            transformed = transformed.replace("i have been", "you've been")  
+            transformed = transformed.replace("i am", "you are")
+            transformed = transformed.replace("i'm", "you're")
+            transformed = transformed.replace("i feel", "you feel")
+            transformed = transformed.replace("i don't know", "you're uncertain")
+            
+            return f"It sounds like {transformed}."
+        return None
+
     def create_fallback_paraphrase(self, user_input):
         """Create a proper paraphrase fallback that NEVER repeats verbatim"""
         try:
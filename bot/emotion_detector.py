@@ -1,37 +1,178 @@
-from llm.llm_api import LLMApi
+import re
+from llm.llm_router import get_llm_router
+from llm.multi_task import LLMTask
+from config import EMOTION_BACKEND, EMOTION_AMBIGUITY_MARGIN
+
+VALID_EMOTIONS = ['happy', 'sad', 'angry', 'anxious', 'excited', 'calm', 'neutral', 'frustrated', 'grateful', 'confused']
+
+# Word -> (emotion, weight). Spoken-transcript spellings (no apostrophes) are listed alongside written ones.
+EMOTION_LEXICON = {}
+for _emotion, _words in {
+    'happy': {'happy': 1, 'glad': 1, 'great': 0.7, 'fantastic': 1, 'awesome': 1, 'wonderful': 1, 'amazing': 1,
+              'love': 1, 'loved': 1, 'enjoy': 1, 'enjoyed': 1, 'enjoying': 1, 'joy': 1, 'fun': 0.7, 'pleased': 1,
+              'delighted': 1, 'cheerful': 1, 'good': 0.5, 'nice': 0.5, 'cool': 0.5, 'better': 0.3, 'haha': 0.5},
+    'sad': {'sad': 1, 'unhappy': 1, 'depressed': 1, 'hurt': 1, 'lonely': 1, 'miss': 0.7, 'missed': 0.5, 'cry': 1,
+            'crying': 1, 'heartbroken': 1, 'disappointed': 1, 'disappointing': 1, 'miserable': 1, 'hopeless': 1,
+            'grief': 1, 'down': 0.3, 'alone': 0.5, 'sorry': 0.3},
+    'angry': {'angry': 1, 'mad': 1, 'furious': 1, 'annoyed': 1, 'annoying': 1, 'irritated': 1, 'hate': 1,
+              'hated': 1, 'rage': 1, 'resent': 1, 'unfair': 0.7, 'upset': 0.5},
+    'anxious': {'anxious': 1, 'worried': 1, 'worry': 1, 'worrying': 1, 'nervous': 1, 'scared': 1, 'afraid': 1,
+                'fear': 1, 'stressed': 1, 'stress': 0.7, 'stressful': 1, 'overwhelmed': 1, 'overwhelming': 1,
+                'panic': 1, 'tense': 0.7, 'uneasy': 1, 'dread': 1, 'pressure': 0.5},
+    'excited': {'excited': 1, 'exciting': 1, 'thrilled': 1, 'eager': 1, 'pumped': 1, 'interested': 0.5,
+                'cant_wait': 1, 'looking_forward': 1},
+    'calm': {'calm': 1, 'peaceful': 1, 'relaxed': 1, 'relaxing': 1, 'serene': 1, 'stillness': 0.7, 'centered': 1,
+             'grounded': 1, 'content': 0.5, 'present': 0.5, 'focused': 0.5, 'quiet': 0.3, 'at_peace': 1},
+    'frustrated': {'frustrated': 1, 'frustrating': 1, 'frustration': 1, 'stuck': 0.7, 'struggle': 0.7,
+                   'struggling': 0.7, 'ugh': 1, 'difficult': 0.5, 'hard': 0.3, 'troubleshooting': 0.3, 'fed_up': 1},
+    'grateful': {'grateful': 1, 'thankful': 1, 'thank': 0.7, 'thanks': 0.7, 'appreciate': 1, 'appreciated': 1,
+                 'appreciative': 1, 'blessed': 1, 'meaningful': 0.5, 'lucky': 0.5},
+    'confused': {'confused': 1, 'confusing': 1, 'unclear': 1, 'unsure': 1, 'puzzled': 1, 'lost': 0.5,
+                 'wondering': 0.5, 'not_sure': 1, 'could_not_follow': 1, 'couldnt_follow': 1}
+}.items():
+    for _word, _weight in _words.items():
+        EMOTION_LEXICON[_word] = (_emotion, _weight)
+
+# Multi-word cues and intensifiers, joined into one token before lookup
+LEXICON_PHRASES = {
+    "can't wait": "cant_wait", "cant wait": "cant_wait", "looking forward": "looking_forward",
+    "at peace": "at_peace", "fed up": "fed_up", "not sure": "not_sure",
+    "could not follow": "could_not_follow", "couldn't follow": "couldnt_follow", "couldnt follow": "couldnt_follow",
+    "kind of": "kind_of", "sort of": "sort_of"
+}
+_PHRASE_PATTERN = re.compile(r"\b(" + "|".join(re.escape(p) for p in LEXICON_PHRASES) + r")\b")
+
+NEGATORS = {'not', 'no', 'never', 'hardly', "don't", 'dont', "didn't", 'didnt', "isn't", 'isnt', "wasn't", 'wasnt',
+            "aren't", 'arent', "wouldn't", 'wouldnt', "can't", 'cant'}
+INTENSIFIERS = {'really': 1.5, 'very': 1.5, 'so': 1.3, 'extremely': 2, 'super': 1.5, 'totally': 1.5, 'kinda': 0.7,
+                'kind_of': 0.7, 'sort_of': 0.7, 'bit': 0.7, 'little': 0.7}
+CLAUSE_BREAKS = {',', '.', ';', '!', '?'}  # Negators and intensifiers don't reach past these
+SELF_REPORT = {'feel', 'feels', 'feeling', 'felt'}  # "I feel overwhelmed" outweighs a passing mention
+# "not worried" reads as calm, "not happy" as sad; other negated cues are just dropped
+NEGATED_EMOTION = {'happy': 'sad', 'excited': 'sad', 'calm': 'anxious', 'anxious': 'calm'}
+
+
+def lexicon_emotion_scores(text):
+    """Sum lexicon weights per emotion, scaling for intensifiers and flipping or dropping negated cues."""
+    text = _PHRASE_PATTERN.sub(lambda m: LEXICON_PHRASES[m.group(1)], (text or "").lower())
+    tokens = re.findall(r"[a-z_']+|[,.;!?]", text)
+    scores = {}
+    clause_start = 0
+    for i, token in enumerate(tokens):
+        if token in CLAUSE_BREAKS:
+            clause_start = i + 1
+            continue
+        entry = EMOTION_LEXICON.get(token)
+        if entry is None:
+            continue
+        emotion, weight = entry
+        previous = tokens[max(clause_start, i - 3):i]
+        if any(word in NEGATORS for word in previous):
+            emotion = NEGATED_EMOTION.get(emotion)
+            if emotion is None:
+                continue
+        if previous and previous[-1] in INTENSIFIERS:
+            weight *= INTENSIFIERS[previous[-1]]
+        if any(word in SELF_REPORT for word in previous):
+            weight *= 1.5
+        scores[emotion] = scores.get(emotion, 0) + weight
+    return scores
+
+
+def lexicon_emotion(text):
+    """
+    Local classification: (emotion, ambiguous). ambiguous is True when the top two emotions are within
+    EMOTION_AMBIGUITY_MARGIN of each other, or a longer utterance has no lexicon cue at all.
+    """
+    scores = lexicon_emotion_scores(text)
+    if not scores:
+        return "neutral", len((text or "").split()) >= 6
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], VALID_EMOTIONS.index(item[0])))
+    emotion, top = ranked[0]
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0
+    return emotion, runner_up > top * (1 - EMOTION_AMBIGUITY_MARGIN)
+
+
+def emotion_prompt(text):
+    """Build the LLM prompt that classifies the emotional tone of text."""
+    return f"""Analyze the emotional tone of this text: '{text}'
 
-def detect_emotion(text, provider="openai"):
-    """Analyze text for emotional tone using OpenAI by default."""
-    try:
-        llm_api = LLMApi(provider=provider)
-        emotion_prompt = f"""Analyze the emotional tone of this text: '{text}'
-        
         Return only one of these emotions: happy, sad, angry, anxious, excited, calm, neutral, frustrated, grateful, confused
-        
+
         Rules:
         1. Return only the emotion word, nothing else
         2. Choose the most dominant emotion
         3. If unclear, default to 'neutral'
         4. Don't include quotes or extra text"""
-        
-        emotion_response = llm_api.generate_response([{"role": "user", "content": emotion_prompt}])
-        
-        if emotion_response:
-            # Clean up the response to get just the emotion
-            emotion = emotion_response.strip().lower()
-            # Remove quotes and extra text
-            emotion = emotion.replace('"', '').replace("'", "")
-            
-            # Validate it's one of our expected emotions
-            valid_emotions = ['happy', 'sad', 'angry', 'anxious', 'excited', 'calm', 'neutral', 'frustrated', 'grateful', 'confused']
-            if emotion in valid_emotions:
-                return emotion
-            else:
-                return "neutral"
+
+def parse_emotion(emotion_response):
+    """Map an LLM reply to one of VALID_EMOTIONS, defaulting to neutral."""
+    if emotion_response:
+        # Clean up the response to get just the emotion
+        emotion = emotion_response.strip().lower()
+        # Remove quotes and extra text
+        emotion = emotion.replace('"', '').replace("'", "")
+
+        # Validate it's one of our expected emotions
+        if emotion in VALID_EMOTIONS:
+            return emotion
         else:
             return "neutral"
-            
+    else:
+        return "neutral"
+
+def emotion_task(text):
+    """The emotion classification as an LLMTask, to batch with other tasks on the same utterance."""
+    return LLMTask("emotion", emotion_prompt(text),
+                   f"the dominant emotion as one word from: {', '.join(VALID_EMOTIONS)} ('neutral' if unclear)",
+                   parse_emotion)
+
+def emotion_needs_llm(text, backend=None):
+    """True when detect_emotion() would make an LLM call for text."""
+    backend = backend or EMOTION_BACKEND
+    return backend == "llm" or (backend == "hybrid" and lexicon_emotion(text)[1])
+
+def llm_detect_emotion(text, provider="openai"):
+    """Analyze text for emotional tone with an LLM round trip (OpenAI by default)."""
+    try:
+        llm_api = get_llm_router(provider)
+        emotion_response = llm_api.generate_response([{"role": "user", "content": emotion_prompt(text)}])
+        return parse_emotion(emotion_response)
+
     except Exception as e:
         print(f"Error detecting emotion: {e}")
         return "neutral"
 
+async def allm_detect_emotion(text, provider="openai"):
+    """Async version of llm_detect_emotion()."""
+    try:
+        llm_api = get_llm_router(provider)
+        emotion_response = await llm_api.agenerate_response([{"role": "user", "content": emotion_prompt(text)}])
+        return parse_emotion(emotion_response)
+
+    except Exception as e:
+        print(f"Error detecting emotion: {e}")
+        return "neutral"
+
+def detect_emotion(text, provider="openai", backend=None):
+    """
+    Classify text into one of VALID_EMOTIONS with the configured EMOTION_BACKEND:
+    "lexicon" (local only), "hybrid" (lexicon, LLM for ambiguous text) or "llm" (always the LLM).
+    """
+    backend = backend or EMOTION_BACKEND
+    if backend == "llm":
+        return llm_detect_emotion(text, provider)
+    emotion, ambiguous = lexicon_emotion(text)
+    if backend == "hybrid" and ambiguous:
+        return llm_detect_emotion(text, provider)
+    return emotion
+
+async def adetect_emotion(text, provider="openai", backend=None):
+    """Async version of detect_emotion(); the lexicon path never awaits."""
+    backend = backend or EMOTION_BACKEND
+    if backend == "llm":
+        return await allm_detect_emotion(text, provider)
+    emotion, ambiguous = lexicon_emotion(text)
+    if backend == "hybrid" and ambiguous:
+        return await allm_detect_emotion(text, provider)
+    return emotion
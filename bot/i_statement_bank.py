@@ -0,0 +1,188 @@
+"""
+Persistent bank of validated I-statements, per character type.
+
+The I-statement prompt does not depend on the session, so statements are generated ahead of time by a
+background refill job, deduplicated, synthesized into the shared TTS cache and stored on disk. Speaker
+turns draw one instead of waiting on an LLM call and a TTS call: each session holds a StatementDeck, a
+shuffled copy of the bank popped in O(1) and rebuilt only when it runs out.
+
+Each character type is one JSON file under I_STATEMENT_BANK_DIR, written with write-then-rename so
+worker processes always read a whole file; a process reloads a bank when its file changes on disk,
+checking at most every I_STATEMENT_BANK_RELOAD_INTERVAL seconds.
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from bot.prefetch import get_prefetch_executor
+from config import I_STATEMENT_BANK_DIR, I_STATEMENT_BANK_SIZE, I_STATEMENT_BANK_REFILL_BATCH, I_STATEMENT_BANK_RELOAD_INTERVAL
+
+I_STATEMENT_OPENERS = ("i feel", "i think", "i believe")
+
+
+def statement_key(statement):
+    """Dedup key: case, punctuation and spacing don't make a new statement"""
+    return " ".join(re.sub(r"[^\w\s']", " ", statement.lower()).split())
+
+
+def is_valid_i_statement(statement, default=None):
+    """An open-ended first-person statement the speaker turn can use as-is"""
+    if not statement or statement == default:
+        return False
+    return (statement_key(statement).startswith(I_STATEMENT_OPENERS)
+            and len(statement.split()) <= 30 and "?" not in statement)
+
+
+class StatementDeck:
+    """One session's draws from a bank: a shuffled copy popped in O(1), rebuilt only when it runs out."""
+
+    def __init__(self, bank, character_type):
+        self.bank = bank
+        self.character_type = character_type
+        self.source = None  # The bank's statement list the deck was last dealt from
+        self.remaining = []
+        self.drawn = set()  # Never dealt again this session
+
+    def draw(self):
+        """A random banked statement this session has not had yet, or None"""
+        if not self.remaining:
+            statements = self.bank.statements(self.character_type)
+            if statements is self.source:
+                return None  # Nothing new banked since the deck ran out
+            self.source = statements
+            self.remaining = [statement for statement in statements if statement not in self.drawn]
+            random.shuffle(self.remaining)
+            if not self.remaining:
+                return None
+        statement = self.remaining.pop()
+        self.drawn.add(statement)
+        return statement
+
+
+class IStatementBank:
+    """On-disk I-statements per character type, drawn through per-session decks, with an asynchronous refill."""
+
+    def __init__(self, directory=I_STATEMENT_BANK_DIR, target_size=I_STATEMENT_BANK_SIZE,
+                 refill_batch=I_STATEMENT_BANK_REFILL_BATCH, reload_interval=I_STATEMENT_BANK_RELOAD_INTERVAL):
+        self.directory = directory
+        self.target_size = target_size
+        self.refill_batch = refill_batch
+        self.reload_interval = reload_interval
+        self.banks = {}  # character type -> (mtime, [statements], {keys})
+        self.checked = {}  # character type -> when its file's mtime was last checked
+        self.lock = threading.Lock()
+        self.refilling = set()  # Character types with a refill job running in this process
+
+    def _path(self, character_type):
+        return os.path.join(self.directory, f"{character_type}.json")
+
+    def _load(self, character_type, force=False):
+        # Caller holds self.lock. Without force, the file is looked at only every reload_interval seconds.
+        cached = self.banks.get(character_type)
+        now = time.time()
+        if cached is not None and not force and now - self.checked.get(character_type, 0) < self.reload_interval:
+            return cached
+        self.checked[character_type] = now
+        path = self._path(character_type)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        if cached is not None and cached[0] == mtime:
+            return cached
+        statements = []
+        if mtime is not None:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    statements = json.load(f).get("statements", [])
+            except (OSError, ValueError) as e:
+                print(f"[I-STATEMENT BANK] Could not read {path}: {e}")
+        self.banks[character_type] = (mtime, statements, {statement_key(s) for s in statements})
+        return self.banks[character_type]
+
+    def size(self, character_type):
+        with self.lock:
+            return len(self._load(character_type)[1])
+
+    def statements(self, character_type):
+        """The banked statements; a new list whenever the bank changes, the same one otherwise"""
+        with self.lock:
+            return self._load(character_type)[1]
+
+    def deck(self, character_type):
+        return StatementDeck(self, character_type)
+
+    def add(self, character_type, statements):
+        """Add new statements, skipping duplicates. Returns how many were added."""
+        with self.lock:
+            # Another process may have added statements since the last check; don't write over them
+            mtime, banked, keys = self._load(character_type, force=True)
+            new = []
+            for statement in statements:
+                key = statement_key(statement)
+                if key not in keys:
+                    keys.add(key)
+                    new.append(statement)
+            if not new:
+                return 0
+            banked = banked + new
+            path = self._path(character_type)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump({"statements": banked}, f, indent=1)
+                os.replace(temp_path, path)
+                mtime = os.path.getmtime(path)
+            except OSError as e:
+                print(f"[I-STATEMENT BANK] Failed to write {path}: {e}")
+            self.banks[character_type] = (mtime, banked, keys)
+            return len(new)
+
+    def refill(self, character_type, generate, default=None):
+        """
+        Generate up to refill_batch statements with generate(), keep the valid new ones, synthesize
+        their audio into the TTS cache, then bank them - a banked statement always has its audio ready.
+        """
+        from speech.groq_stt_tts import prewarm_tts_cache
+
+        with self.lock:
+            keys = set(self._load(character_type)[2])
+        fresh = []
+        for _ in range(self.refill_batch):
+            statement = generate()
+            key = statement_key(statement or "")
+            if is_valid_i_statement(statement, default) and key not in keys:
+                keys.add(key)
+                fresh.append(statement)
+        if fresh:
+            # speaker_mode says the statement in quotes
+            prewarm_tts_cache([f'"{statement}"' for statement in fresh])
+        added = self.add(character_type, fresh)
+        print(f"[I-STATEMENT BANK] {character_type}: +{added} statements, {self.size(character_type)} banked")
+        return added
+
+    def refill_async(self, character_type, generate, default=None):
+        """Start a background refill unless the bank is full or one is already running"""
+        with self.lock:
+            if character_type in self.refilling or len(self._load(character_type)[1]) >= self.target_size:
+                return False
+            self.refilling.add(character_type)
+
+        def run():
+            try:
+                self.refill(character_type, generate, default)
+            except Exception as e:
+                print(f"[I-STATEMENT BANK] Refill failed for {character_type}: {e}")
+            finally:
+                with self.lock:
+                    self.refilling.discard(character_type)
+
+        get_prefetch_executor().submit(run)
+        return True
+
+
+i_statement_bank = IStatementBank()
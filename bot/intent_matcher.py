@@ -0,0 +1,106 @@
+"""
+Single-pass intent matching for user replies.
+
+All intent phrases are compiled into one word-level Aho-Corasick automaton, so an utterance is
+tokenized once and scanned once for every intent, and a phrase only matches whole words
+("no" does not match inside "know", "bye" does not match inside "maybe").
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+
+INTENT_PHRASES = {
+    "confirmation": ["yes", "correct", "right", "that is correct", "yes that is correct", "affirmative", "indeed",
+                     "uh yes", "um yes", "yeah", "yep", "yup", "that's right", "exactly", "you got it"],
+    "negation": ["no", "not", "incorrect", "wrong", "that's not right", "nope", "that's wrong"],
+    # Answers that confirm only part of a paraphrase and then correct it
+    "correction": ["but you should", "you should have", "but it should", "however you", "except you",
+                   "but i meant", "i also meant", "you missed", "did not mention", "didn't mention", "sort of",
+                   "mostly yes but", "close but"],
+    "goodbye": ["goodbye", "bye", "ok bye", "exit", "quit"],
+    "paraphrase_feedback": ["but you should", "you should have", "in your perspective", "from your perspective",
+                            "you should say", "you didn't paraphrase", "not paraphrasing", "just repeating",
+                            "that's not paraphrasing", "you're just saying", "you repeated", "say it differently"],
+    "paraphrase_marker": ["you said", "you feel", "you think", "you believe", "you mentioned", "i heard you say",
+                          "what i heard", "you talked about", "you were saying", "you are saying", "you're saying",
+                          "it sounds like"],
+    "simple_confirmation": ["yes", "correct", "right", "that is correct", "yes that is correct", "uh yes", "um yes",
+                            "yeah", "yep", "yup"],
+    "perspective": ["you feel", "you said", "you think", "you believe", "you mentioned", "you talked about",
+                    "you were saying", "you expressed", "you shared"],
+    "nonsense": ["mangoes", "apples", "bananas", "oranges", "blah", "bla", "whatever", "random", "nonsense",
+                 "asdfgh", "qwerty", "xyz", "abc", "test", "testing", "123", "hello world"],
+    # Whole-word matching: inflected forms are listed, since "struggling" no longer matches "struggle" as a substring
+    "hardship": ["difficult", "difficulty", "difficulties", "hard", "hardship", "hardships", "struggle", "struggles",
+                 "struggled", "struggling", "challenging", "challenge", "challenges", "tough", "worried", "worry",
+                 "worrying", "anxious", "anxiety", "scared", "afraid", "nervous", "sad", "sadness", "depressed",
+                 "depressing", "unhappy", "hurt", "hurts", "hurting", "pain", "painful", "frustrated", "frustrating",
+                 "frustration", "angry", "upset", "upsetting", "mad", "annoyed", "annoying"],
+    "theme_communication": ["talk", "talks", "talked", "talking", "speak", "speaks", "speaking", "spoke", "listen",
+                            "listens", "listened", "listening", "understand", "understands", "understanding",
+                            "understood", "share", "shares", "shared", "sharing"],
+    "theme_understanding": ["understand", "understands", "understanding", "understood", "learn", "learns", "learned",
+                            "learnt", "learning", "know", "knows", "knew", "knowing", "realize", "realized",
+                            "realizing", "realise", "realised"],
+    "theme_improvement": ["better", "improve", "improves", "improved", "improving", "improvement", "change",
+                          "changes", "changed", "changing", "grow", "grows", "grew", "growing", "growth", "develop",
+                          "develops", "developed", "developing", "development"],
+}
+
+
+def tokenize(text):
+    """Lowercase words with apostrophes dropped, so "that's" and a transcribed "thats" match alike"""
+    return re.findall(r"[a-z0-9]+", (text or "").lower().replace("'", "").replace("’", ""))
+
+
+class PhraseMatcher:
+    """Word-level Aho-Corasick automaton mapping phrases to the intents they signal."""
+
+    def __init__(self, intent_phrases):
+        self.goto = [{}]  # state -> {word: next state}
+        self.fail = [0]
+        self.output = [set()]  # state -> intents of every phrase ending here (including via fail links)
+        for intent, phrases in intent_phrases.items():
+            for phrase in phrases:
+                state = 0
+                for word in tokenize(phrase):
+                    if word not in self.goto[state]:
+                        self.goto.append({})
+                        self.fail.append(0)
+                        self.output.append(set())
+                        self.goto[state][word] = len(self.goto) - 1
+                    state = self.goto[state][word]
+                self.output[state].add(intent)
+
+        # Breadth-first failure links: the longest proper suffix that is also a trie path
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(word, 0)
+                self.output[child] |= self.output[self.fail[child]]
+
+    def match(self, text):
+        """Every intent with at least one phrase in text, in one pass over its words"""
+        intents = set()
+        state = 0
+        for word in tokenize(text):
+            while state and word not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(word, 0)
+            intents |= self.output[state]
+        return frozenset(intents)
+
+
+intent_matcher = PhraseMatcher(INTENT_PHRASES)
+
+
+@lru_cache(maxsize=1024)
+def match_intents(text):
+    """Intents present in a user reply. Cached: one reply is checked by several is_* helpers."""
+    return intent_matcher.match(text)
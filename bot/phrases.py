@@ -0,0 +1,94 @@
+"""
+Fixed phrases the bot speaks.
+
+Kept apart from the bot so the web server can pre-warm the TTS cache with them without importing the
+bot stack; the bot speaks these constants, so the pre-warmed list cannot drift from what is said.
+"""
+
+DEFAULT_I_STATEMENT = "I feel that open communication is important. I want to make sure we both feel heard and understood."
+
+CONFIRMATION_PROMPTS = [
+    "Did I get that right? Please say yes or repeat.",
+    "Did I understand you correctly?",
+    "Let me know if I got it right.",
+    "Could you clarify if I missed anything?",
+    "Is that accurate? Please let me know.",
+    "Does that sound right to you?",
+    "Did I capture your meaning?"
+]
+
+CLARIFY_PROMPTS = [
+    "Could you tell me a bit more about that?",
+    "I'd love to hear more details.",
+    "Can you explain that a little more?",
+    "Please share a bit more.",
+    "I want to make sure I understand. Could you say it again in your own words?",
+    "Could you help me understand by saying it another way?",
+    "Could you repeat your full statement so I can get it right?"
+]
+
+GREETING = "Hi, I'm Charisma Bot. Today we'll practice the Speaker-Listener Technique"
+BOT_SPEAKS_FIRST = "I'll start as speaker. You listen and repeat what you heard."
+SWITCH_TO_LISTENING = "Let's switch roles now! I'm ready to listen. Take your time."
+SWITCH_USER_SPEAKER_COACHED = "Let's switch roles now! Now you are the speaker and I'll listen. As the speaker, share your thoughts. I'll listen and repeat what I hear."
+SWITCH_BOT_SPEAKER_COACHED = "Let's switch roles now! Now I'm the speaker and you'll listen. As the listener, repeat what you hear so I feel understood."
+SWITCH_USER_SPEAKER = "Let's switch roles now! Now you're the speaker - please share your thoughts."
+SWITCH_BOT_SPEAKER = "Let's switch roles now! Now I'm the speaker - please listen."
+DID_I_GET_IT = "Did I get that right?"
+CAPTURED_BETTER = "Does that capture it better?"
+THANK_YOU = "Thank you!"
+CORRECT = "Yes, that's correct!"
+MUCH_BETTER = "Much better! Thank you."
+THANKS_FOR_FEEDBACK = "Great! Thank you for the feedback."
+THANKS_FOR_PATIENCE = "Thank you for your patience."
+THANKS_FOR_SHARING = "Thank you for sharing."
+SHARE_MORE = "Could you share more?"
+SAY_IT_AGAIN = "Could you say it again?"
+REPEAT_WHAT_I_SAID = "Could you repeat what I said?"
+WHAT_I_SAID_WAS = "Let me help you with that. What I said was:"
+TRY_AGAIN = "Let me try again to understand what you said."
+PARAPHRASE_BETTER = "You're absolutely right. Let me paraphrase that better:"
+CONTINUE = "Let's continue."
+CONTINUE_CONVERSATION = "Let's continue with our conversation."
+APOLOGIZE_AND_CONTINUE = "I apologize, let's continue our conversation."
+ASK_TOPIC = "What topic would you like to discuss?"
+ASK_SPECIFIC_TOPIC = "What specific topic would you like to talk about?"
+SUGGEST_TOPIC = "Please share a specific topic you'd like to discuss, like 'work stress' or 'family relationships'."
+GREAT_PRACTICE = "Great practice! We both had a chance to feel heard and understood."
+WRAP_UP = "Thank you for this wonderful conversation! Let's wrap up here."
+GOODBYE = "Goodbye! Thanks for practicing with me."
+
+# Constant text the bot speaks in every session; used to pre-warm the TTS cache
+CANNED_PHRASES = CONFIRMATION_PROMPTS + CLARIFY_PROMPTS + [
+    GREETING,
+    BOT_SPEAKS_FIRST,
+    SWITCH_TO_LISTENING,
+    SWITCH_USER_SPEAKER_COACHED,
+    SWITCH_BOT_SPEAKER_COACHED,
+    SWITCH_USER_SPEAKER,
+    SWITCH_BOT_SPEAKER,
+    DID_I_GET_IT,
+    CAPTURED_BETTER,
+    THANK_YOU,
+    CORRECT,
+    MUCH_BETTER,
+    THANKS_FOR_FEEDBACK,
+    THANKS_FOR_PATIENCE,
+    THANKS_FOR_SHARING,
+    SHARE_MORE,
+    SAY_IT_AGAIN,
+    REPEAT_WHAT_I_SAID,
+    WHAT_I_SAID_WAS,
+    TRY_AGAIN,
+    PARAPHRASE_BETTER,
+    CONTINUE,
+    CONTINUE_CONVERSATION,
+    APOLOGIZE_AND_CONTINUE,
+    ASK_TOPIC,
+    ASK_SPECIFIC_TOPIC,
+    SUGGEST_TOPIC,
+    GREAT_PRACTICE,
+    WRAP_UP,
+    GOODBYE,
+    f'"{DEFAULT_I_STATEMENT}"'
+]
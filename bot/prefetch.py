@@ -0,0 +1,139 @@
+"""
+Speculative prefetch for the bot's next utterance.
+
+The Speaker-Listener flow is predictable enough that the next LLM text and its TTS audio can be
+prepared while the current audio plays or the user is speaking. Work is keyed by what it produces;
+the conversation takes it when it gets there, and anything left over is discarded.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import PREFETCH_WORKERS, REPLY_WORKERS
+
+_executor = None
+_reply_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_prefetch_executor():
+    """Thread pool shared by every bot in the process, so pooled workers don't spawn threads per session."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+        return _executor
+
+
+def get_reply_executor():
+    """Thread pool for the critical path (work a user is waiting on), kept apart from speculative prefetch work."""
+    global _reply_executor
+    with _executor_lock:
+        if _reply_executor is None:
+            _reply_executor = ThreadPoolExecutor(max_workers=REPLY_WORKERS, thread_name_prefix="reply")
+        return _reply_executor
+
+
+class PrefetchScheduler:
+    """Run likely-next work in the background; hand the result over if it is used, drop it otherwise."""
+
+    def __init__(self, executor=None):
+        self.executor = executor or get_prefetch_executor()
+        self.pending = {}  # key -> Future
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.failed = 0
+        self.discarded = 0
+
+    def schedule(self, key, fn, *args, **kwargs):
+        """Start fn(*args, **kwargs) in the background unless work for key is already pending."""
+        self._submit(self.executor, key, fn, *args, **kwargs)
+
+    def schedule_reply(self, key, fn, *args, **kwargs):
+        """schedule() on the reply executor, for work the user is already waiting on (clauses of a streamed reply)."""
+        self._submit(get_reply_executor(), key, fn, *args, **kwargs)
+
+    def _submit(self, executor, key, fn, *args, **kwargs):
+        with self.lock:
+            if key in self.pending:
+                return
+            self.pending[key] = executor.submit(fn, *args, **kwargs)
+
+    def take(self, key, timeout=30):
+        """
+        Return the prefetched result for key, waiting if it is still running.
+        Returns None if nothing was scheduled for key or the work failed, so the caller computes it itself.
+        """
+        with self.lock:
+            future = self.pending.pop(key, None)
+        if future is None:
+            return None
+        try:
+            result = future.result(timeout=timeout)
+        except Exception as e:
+            print(f"[PREFETCH] {key} failed: {e}")
+            result = None
+        with self.lock:
+            if result is None:
+                self.failed += 1
+            else:
+                self.hits += 1
+        return result
+
+    def keys(self):
+        with self.lock:
+            return list(self.pending)
+
+    def discard(self, key=None):
+        """Drop pending work for key, or all pending work when key is None."""
+        with self.lock:
+            keys = list(self.pending) if key is None else [key] if key in self.pending else []
+            for k in keys:
+                self.pending.pop(k).cancel()
+            self.discarded += len(keys)
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "failed": self.failed, "discarded": self.discarded, "pending": len(self.pending)}
+
+
+class AsyncPrefetchScheduler:
+    """asyncio counterpart of PrefetchScheduler: work runs as tasks on the bot's event loop."""
+
+    def __init__(self):
+        self.pending = {}  # key -> Task
+        self.hits = 0
+        self.failed = 0
+        self.discarded = 0
+
+    def schedule(self, key, coroutine_fn, *args, **kwargs):
+        if key in self.pending:
+            return
+        self.pending[key] = asyncio.get_running_loop().create_task(coroutine_fn(*args, **kwargs))
+
+    async def take(self, key, timeout=30):
+        task = self.pending.pop(key, None)
+        if task is None:
+            return None
+        try:
+            result = await asyncio.wait_for(task, timeout=timeout)
+        except Exception as e:
+            print(f"[PREFETCH] {key} failed: {e}")
+            result = None
+        if result is None:
+            self.failed += 1
+        else:
+            self.hits += 1
+        return result
+
+    def keys(self):
+        return list(self.pending)
+
+    def discard(self, key=None):
+        keys = list(self.pending) if key is None else [key] if key in self.pending else []
+        for k in keys:
+            self.pending.pop(k).cancel()
+        self.discarded += len(keys)
+
+    def stats(self):
+        return {"hits": self.hits, "failed": self.failed, "discarded": self.discarded, "pending": len(self.pending)}
@@ -1,6 +1,10 @@
-from llm.llm_api import LLMApi
+from llm.llm_router import get_llm_router
+from bot.emotion_detector import lexicon_emotion
+from bot.intent_matcher import match_intents
+from bot.clause_splitter import split_clauses, asplit_clauses
+from llm.multi_task import LLMTask
 
-llm_api = LLMApi(provider="openai")
+llm_api = get_llm_router("openai")
 
 def generate_response(user_input, character_type):
     """Generate an AI-powered response based on user input and personality."""
@@ -34,17 +38,17 @@ def generate_response(user_input, character_type):
         print(f"Error generating response: {str(e)}")
         return "I appreciate your input. Let's continue."
 
-def paraphrase(text):
-    """Enhanced paraphrasing using LLM for better Speaker-Listener Technique responses."""
-    try:
-        # Remove filler words and clean up text
-        filler_words = ['um', 'uh', 'like', 'you know', 'well']
-        cleaned_text = text.strip()
-        for word in filler_words:
-            cleaned_text = cleaned_text.replace(f' {word} ', ' ').replace(f'{word} ', '').replace(f' {word}', '')
-        
-        # Use LLM for intelligent paraphrasing following Speaker-Listener Technique principles
-        prompt = f"""Transform this statement into a proper Speaker-Listener Technique paraphrase:
+def clean_paraphrase_input(text):
+    """Remove filler words before paraphrasing."""
+    filler_words = ['um', 'uh', 'like', 'you know', 'well']
+    cleaned_text = text.strip()
+    for word in filler_words:
+        cleaned_text = cleaned_text.replace(f' {word} ', ' ').replace(f'{word} ', '').replace(f' {word}', '')
+    return cleaned_text
+
+def paraphrase_prompt(cleaned_text):
+    """Build the Speaker-Listener Technique paraphrase prompt."""
+    return f"""Transform this statement into a proper Speaker-Listener Technique paraphrase:
 
 Original: "{cleaned_text}"
 
@@ -64,50 +68,106 @@ CRITICAL: Do NOT repeat their exact words. Rephrase using different vocabulary w
 
 Only return the paraphrase, nothing else."""
 
-        response = llm_api.generate_response([{"role": "user", "content": prompt}])
+def finish_paraphrase(response, cleaned_text):
+    """Tidy the LLM paraphrase, or build a rule-based one if the LLM returned nothing."""
+    if response and response.strip():
+        paraphrased = response.strip()
         
-        if response and response.strip():
-            paraphrased = response.strip()
-            
-            # Ensure proper sentence structure
-            if not paraphrased.endswith(('.', '!', '?')):
-                paraphrased += '.'
-            
-            # Capitalize first letter
-            if paraphrased:
-                paraphrased = paraphrased[0].upper() + paraphrased[1:]
-            
-            return paraphrased
+        # Ensure proper sentence structure
+        if not paraphrased.endswith(('.', '!', '?')):
+            paraphrased += '.'
+        
+        # Capitalize first letter
+        if paraphrased:
+            paraphrased = paraphrased[0].upper() + paraphrased[1:]
+        
+        return paraphrased
+    else:
+        # Enhanced fallback that properly paraphrases instead of repeating
+        if cleaned_text.lower().startswith('i feel'):
+            emotion_part = cleaned_text[6:].strip()
+            return f"It sounds like you're feeling {emotion_part}."
+        elif cleaned_text.lower().startswith('i think'):
+            thought_part = cleaned_text[7:].strip()
+            return f"I hear you expressing the belief that {thought_part}."
+        elif cleaned_text.lower().startswith('i want'):
+            desire_part = cleaned_text[6:].strip()
+            return f"I understand that you're hoping to {desire_part}."
+        elif cleaned_text.lower().startswith('i am') or cleaned_text.lower().startswith("i'm"):
+            state_part = cleaned_text.replace("i am", "").replace("i'm", "").strip()
+            return f"I hear you saying that you're {state_part}."
         else:
-            # Enhanced fallback that properly paraphrases instead of repeating
-            if cleaned_text.lower().startswith('i feel'):
-                emotion_part = cleaned_text[6:].strip()
-                return f"It sounds like you're feeling {emotion_part}."
-            elif cleaned_text.lower().startswith('i think'):
-                thought_part = cleaned_text[7:].strip()
-                return f"I hear you expressing the belief that {thought_part}."
-            elif cleaned_text.lower().startswith('i want'):
-                desire_part = cleaned_text[6:].strip()
-                return f"I understand that you're hoping to {desire_part}."
-            elif cleaned_text.lower().startswith('i am') or cleaned_text.lower().startswith("i'm"):
-                state_part = cleaned_text.replace("i am", "").replace("i'm", "").strip()
-                return f"I hear you saying that you're {state_part}."
-            else:
-                # Generic paraphrase that transforms perspective
-                return f"What I understand from what you shared is: {cleaned_text.lower().replace('i ', 'you ').replace('my ', 'your ')}."
+            # Generic paraphrase that transforms perspective
+            return f"What I understand from what you shared is: {cleaned_text.lower().replace('i ', 'you ').replace('my ', 'your ')}."
+
+def paraphrase_error_fallback(text):
+    """Safe fallback that paraphrases instead of repeating."""
+    text_lower = text.lower().strip()
+    if 'i feel' in text_lower:
+        return f"It sounds like you're experiencing some feelings about this situation."
+    elif 'i want' in text_lower or 'i need' in text_lower:
+        return f"I hear you expressing what you're hoping for."
+    elif 'i think' in text_lower or 'i believe' in text_lower:
+        return f"I understand you're sharing your perspective on this."
+    else:
+        return f"I hear you sharing something important with me."
+
+def paraphrase_task(text):
+    """paraphrase() as an LLMTask, to batch with other tasks on the same utterance"""
+    cleaned_text = clean_paraphrase_input(text)
+    return LLMTask("paraphrase", paraphrase_prompt(cleaned_text),
+                   'a Speaker-Listener paraphrase under 25 words starting with "I hear you saying that...", '
+                   '"It sounds like you feel..." or "What I understand is...", turned from their "I" to "you", '
+                   'capturing the emotion and main point in different words than the statement',
+                   lambda response: finish_paraphrase(response, cleaned_text), cache_template="paraphrase")
+
+def paraphrase(text):
+    """Enhanced paraphrasing using LLM for better Speaker-Listener Technique responses."""
+    try:
+        cleaned_text = clean_paraphrase_input(text)
+        # Use LLM for intelligent paraphrasing following Speaker-Listener Technique principles
+        response = llm_api.generate_response([{"role": "user", "content": paraphrase_prompt(cleaned_text)}], cache_template="paraphrase")
+        return finish_paraphrase(response, cleaned_text)
             
     except Exception as e:
         print(f"Error in paraphrasing: {e}")
-        # Safe fallback that paraphrases instead of repeating
-        text_lower = text.lower().strip()
-        if 'i feel' in text_lower:
-            return f"It sounds like you're experiencing some feelings about this situation."
-        elif 'i want' in text_lower or 'i need' in text_lower:
-            return f"I hear you expressing what you're hoping for."
-        elif 'i think' in text_lower or 'i believe' in text_lower:
-            return f"I understand you're sharing your perspective on this."
-        else:
-            return f"I hear you sharing something important with me."
+        return paraphrase_error_fallback(text)
+
+async def aparaphrase(text):
+    """Async version of paraphrase()."""
+    try:
+        cleaned_text = clean_paraphrase_input(text)
+        response = await llm_api.agenerate_response([{"role": "user", "content": paraphrase_prompt(cleaned_text)}], cache_template="paraphrase")
+        return finish_paraphrase(response, cleaned_text)
+
+    except Exception as e:
+        print(f"Error in paraphrasing: {e}")
+        return paraphrase_error_fallback(text)
+
+def tidy_paraphrase_clause(clause, first):
+    """Per-clause version of finish_paraphrase(): no quotes, capitalized first clause."""
+    clause = clause.replace('"', '').strip()
+    return clause[0].upper() + clause[1:] if first and clause else clause
+
+def stream_paraphrase(text):
+    """Paraphrase clauses, each yielded as soon as the LLM has finished it (see paraphrase())."""
+    messages = [{"role": "user", "content": paraphrase_prompt(clean_paraphrase_input(text))}]
+    first = True
+    for clause in split_clauses(llm_api.stream_response(messages, cache_template="paraphrase")):
+        clause = tidy_paraphrase_clause(clause, first)
+        if clause:
+            first = False
+            yield clause
+
+async def astream_paraphrase(text):
+    """Async version of stream_paraphrase()."""
+    messages = [{"role": "user", "content": paraphrase_prompt(clean_paraphrase_input(text))}]
+    first = True
+    async for clause in asplit_clauses(llm_api.astream_response(messages, cache_template="paraphrase")):
+        clause = tidy_paraphrase_clause(clause, first)
+        if clause:
+            first = False
+            yield clause
 
 def generate_topic(character_type):
     """Generate a topic-related statement based on the user's personality type."""
@@ -126,6 +186,7 @@ def generate_topic(character_type):
     """
 
     try:
+        # Not cached: the prompt has no user input, so a cached reply would hand every session the same topic
         response = llm_api.generate_response([{"role": "user", "content": prompt}])
         statement = response.strip() if response else "Personal growth comes from understanding different perspectives."
         if '?' in statement or len(statement.split()) > 20:
@@ -139,7 +200,7 @@ def generate_validation_response(user_input, emotion):
     """Generate a validation response that shows empathy and understanding, matching the user's emotional tone."""
     prompt = f"""Generate a brief, empathetic response under 15 words that validates the user's feelings about: {user_input}\nDetected emotion: {emotion}\nNo questions. Show empathy. Match the user's emotional tone. Use warm, natural language. Avoid robotic or formulaic language. Only the response."""
     try:
-        response = llm_api.generate_response([{"role": "user", "content": prompt}])
+        response = llm_api.generate_response([{"role": "user", "content": prompt}], cache_template="validation")
         if response and response.strip():
             short_resp = " ".join(response.strip().split()[:15])
             return short_resp
@@ -152,7 +213,7 @@ def generate_validation_response(user_input, emotion):
 def generate_problem_solving(issue, user_solution, character_type):
     prompt = f"""Generate a collaborative response under 20 words to this solution: {user_solution}\nIssue: {issue}\nUse 'we' statements. Be positive, warm, and friendly. No questions. Avoid robotic or formulaic language."""
     try:
-        response = llm_api.generate_response([{"role": "user", "content": prompt}])
+        response = llm_api.generate_response([{"role": "user", "content": prompt}], cache_template="problem_solving")
         if response and response.strip():
             short_resp = " ".join(response.strip().split()[:20])
             return short_resp
@@ -165,15 +226,7 @@ def generate_problem_solving(issue, user_solution, character_type):
 def detect_hardship(text):
     """Detect if the text indicates hardship or difficulty."""
     try:
-        hardship_indicators = [
-            'difficult', 'hard', 'struggle', 'challenging', 'tough', 
-            'worried', 'anxious', 'scared', 'afraid', 'nervous',
-            'sad', 'depressed', 'unhappy', 'hurt', 'pain',
-            'frustrated', 'angry', 'upset', 'mad', 'annoyed'
-        ]
-        
-        text_lower = text.lower()
-        return any(indicator in text_lower for indicator in hardship_indicators)
+        return "hardship" in match_intents(text)
         
     except Exception as e:
         return False
@@ -198,22 +251,10 @@ def generate_empathetic_response(text):
         return "I hear you, and I'm here to support you. Let's work through this together."
 
 def detect_emotion(text):
-    """Detect the primary emotion in text."""
+    """Detect the primary emotion in text with the local lexicon classifier."""
     try:
-        # Simple keyword-based emotion detection
-        emotions = {
-            'happy': ['happy', 'joy', 'excited', 'great', 'wonderful', 'love', 'glad'],
-            'sad': ['sad', 'unhappy', 'depressed', 'down', 'hurt', 'pain'],
-            'angry': ['angry', 'mad', 'frustrated', 'annoyed', 'upset'],
-            'anxious': ['worried', 'anxious', 'nervous', 'scared', 'afraid'],
-            'neutral': []
-        }
-        
-        text_lower = text.lower()
-        for emotion, keywords in emotions.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return emotion
-        return 'neutral'
+        emotion, _ = lexicon_emotion(text)
+        return emotion
         
     except Exception as e:
         return 'neutral'
@@ -240,21 +281,8 @@ def generate_collaborative_response(user_input):
 def extract_themes(text):
     """Extract key themes from text."""
     try:
-        themes = set()
-        
-        # Theme keywords
-        theme_keywords = {
-            'communication': ['talk', 'speak', 'listen', 'understand', 'share'],
-            'understanding': ['understand', 'learn', 'know', 'realize'],
-            'improvement': ['better', 'improve', 'change', 'grow', 'develop']
-        }
-        
-        text_lower = text.lower()
-        for theme, keywords in theme_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                themes.add(theme)
-        
-        return themes
+        # Theme keywords live in bot.intent_matcher as theme_<name> intents
+        return {intent[len("theme_"):] for intent in match_intents(text) if intent.startswith("theme_")}
         
     except Exception as e:
         return set()
@@ -0,0 +1,31 @@
+import threading
+
+
+class SessionSignal:
+    """Condition-backed slot that a SocketIO handler sets and a waiting bot thread wakes on."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._is_set = False
+        self.value = None
+
+    def clear(self):
+        """Re-arm the signal before starting a new wait."""
+        with self._condition:
+            self._is_set = False
+            self.value = None
+
+    def set(self, value=None):
+        """Store a value and wake every waiter immediately."""
+        with self._condition:
+            self.value = value
+            self._is_set = True
+            self._condition.notify_all()
+
+    def is_set(self):
+        return self._is_set
+
+    def wait(self, timeout=None):
+        """Block until set() or timeout without polling. Returns True if the signal was set."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._is_set, timeout)
@@ -0,0 +1,283 @@
+"""
+Bot worker pool: a bounded set of long-lived processes that each host many ConversationBot sessions.
+
+Each worker imports the bot stack once, keeps one Firebase client and one shared SocketIO
+connection, and runs every session it is assigned in its own thread. The web server sends
+JSON commands to a worker's stdin; workers report finished sessions back on their stdout, which
+the pool reads anyway, so a slot is freed even if the SocketIO connection is down.
+
+Run a worker by hand with: python -m bot.worker_pool <worker_id>
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from config import BOT_WORKERS, BOT_SESSIONS_PER_WORKER, TTS_BACKEND
+
+SERVER_URL = os.environ.get("SERVER_URL", "http://127.0.0.1:5000")
+SESSION_ENDED = "[SESSION ENDED]"  # Worker stdout line prefix, followed by the session id
+
+
+def run_worker(worker_id, commands, server_url=SERVER_URL):
+    """Host ConversationBot sessions, driven by JSON command lines, until told to shut down."""
+    from bot.conversation_bot import ConversationBot, create_socket_client
+    from speech.tts_cache import tts_cache
+    from bot.paraphrase_scorer import paraphrase_scorer
+    from llm.response_cache import response_cache
+    from speech.local_tts import vits_batcher
+
+    # Keep retrying forever - a worker outlives any single server restart
+    sio = create_socket_client(reconnection_attempts=0)
+    bots = {}
+    threads = {}
+    bots_lock = threading.Lock()
+
+    def route(method_name):
+        """Dispatch a SocketIO event to the bot that owns data['session_id']."""
+        def handler(data=None):
+            session_id = data.get("session_id") if isinstance(data, dict) else None
+            with bots_lock:
+                bot = bots.get(session_id)
+            if bot is not None:
+                getattr(bot, method_name)(data)
+        return handler
+
+    sio.on("user_input", route("on_user_input"))
+    sio.on("bot_audio_ended", route("on_audio_finished"))
+
+    @sio.event
+    def connect():
+        print(f"[WORKER-{worker_id}] Connected to SocketIO server", flush=True)
+        # Rejoin every session room after a reconnect
+        with bots_lock:
+            session_ids = list(bots)
+        for session_id in session_ids:
+            sio.emit("join_session", {"session_id": session_id})
+
+    def ensure_connected():
+        if sio.connected:
+            return
+        try:
+            sio.connect(f"{server_url}?bot_worker={worker_id}")
+        except Exception as e:
+            print(f"[WORKER-{worker_id}] Failed to connect to SocketIO server: {e}", flush=True)
+
+    def run_session(session_id, character_type, audio_formats):
+        try:
+            bot = ConversationBot(character_type=character_type, session_id=session_id, sio=sio, audio_formats=audio_formats)
+        except Exception as e:
+            print(f"[WORKER-{worker_id}] Failed to create bot for session {session_id}: {e}", flush=True)
+            bot = None
+
+        if bot is not None:
+            with bots_lock:
+                bots[session_id] = bot
+            sio.emit("join_session", {"session_id": session_id})
+            try:
+                bot.main_loop()
+            except SystemExit:
+                # main_loop exits the interpreter on fatal errors when it owns the process
+                pass
+            bot.prefetcher.discard()
+
+        with bots_lock:
+            bots.pop(session_id, None)
+            threads.pop(session_id, None)
+        if sio.connected:
+            sio.emit("leave_session", {"session_id": session_id})
+        # One write, so the line is not interleaved with other sessions' output
+        sys.stdout.write(f"{SESSION_ENDED} {session_id}\n")
+        sys.stdout.flush()
+        print(f"[WORKER-{worker_id}] Session {session_id} finished, TTS cache: {tts_cache.stats()}, "
+              f"LLM cache: {response_cache.stats()}" + (f", VITS: {vits_batcher.stats()}" if TTS_BACKEND == "vits" else ""),
+              flush=True)
+
+    # Load the paraphrase model once per worker, off the first session's critical path (PARAPHRASE_SCORER=embedding)
+    paraphrase_scorer.load_in_background()
+
+    print(f"[WORKER-{worker_id}] Ready (pid {os.getpid()})", flush=True)
+
+    for line in commands:
+        try:
+            command = json.loads(line)
+        except ValueError:
+            continue
+
+        action = command.get("command")
+        session_id = command.get("session_id")
+        if action == "start":
+            ensure_connected()
+            thread = threading.Thread(target=run_session, args=(session_id, command.get("character"), command.get("audio_formats")), daemon=True)
+            with bots_lock:
+                threads[session_id] = thread
+            thread.start()
+        elif action == "stop":
+            with bots_lock:
+                bot = bots.get(session_id)
+            if bot is not None:
+                bot.stop()
+        elif action == "shutdown":
+            break
+
+    # Let running sessions save their conversations before the process exits
+    with bots_lock:
+        running = list(bots.values())
+        pending = list(threads.values())
+    for bot in running:
+        bot.stop()
+    for thread in pending:
+        thread.join(timeout=5)
+    if sio.connected:
+        sio.disconnect()
+
+
+class BotWorkerPool:
+    """Pre-started, bounded pool of bot worker processes with load-aware session assignment."""
+
+    def __init__(self, num_workers=BOT_WORKERS, sessions_per_worker=BOT_SESSIONS_PER_WORKER, server_url=SERVER_URL):
+        self.num_workers = num_workers
+        self.sessions_per_worker = sessions_per_worker
+        self.server_url = server_url
+        self.workers = []  # One dict per worker: process, sessions
+        self.session_workers = {}  # session_id -> worker index
+        self.lock = threading.Lock()
+        self.started = False
+
+    def start(self):
+        """Launch the worker processes. Safe to call more than once."""
+        with self.lock:
+            if self.started:
+                return
+            self.workers = [self._spawn_worker(index) for index in range(self.num_workers)]
+            self.started = True
+        print(f"[POOL] Started {self.num_workers} bot workers x {self.sessions_per_worker} sessions")
+
+    def worker_command(self, index):
+        return [sys.executable, "-m", "bot.worker_pool", str(index)]
+
+    def _spawn_worker(self, index):
+        env = os.environ.copy()
+        env["SERVER_URL"] = self.server_url
+        process = subprocess.Popen(
+            self.worker_command(index),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            bufsize=1,
+            env=env
+        )
+        threading.Thread(target=self._monitor_worker, args=(index, process), daemon=True).start()
+        return {"process": process, "sessions": set()}
+
+    def _monitor_worker(self, index, process):
+        """Relay a worker's output to the server log, like run_bot does for main.py, and free ended sessions' slots."""
+        for line in iter(process.stdout.readline, ''):
+            if line.startswith(SESSION_ENDED):
+                self.session_ended(line[len(SESSION_ENDED):].strip())
+            elif line.strip() and not line.startswith('[CLIENT]') and not line.startswith('[DEBUG]'):
+                print(f"[BOT-W{index}] {line.strip()}")
+        process.wait()
+
+    def _send(self, index, command):
+        process = self.workers[index]["process"]
+        process.stdin.write(json.dumps(command) + "\n")
+        process.stdin.flush()
+
+    def _replace_worker(self, index):
+        # Caller holds self.lock
+        worker = self.workers[index]
+        if worker["process"].poll() is None:
+            worker["process"].kill()
+        for session_id in worker["sessions"]:
+            self.session_workers.pop(session_id, None)
+        self.workers[index] = self._spawn_worker(index)
+
+    def _replace_dead_workers(self):
+        for index, worker in enumerate(self.workers):
+            if worker["process"].poll() is not None:
+                print(f"[POOL] Worker {index} exited, starting a replacement")
+                self._replace_worker(index)
+
+    def start_session(self, character_type, session_id, audio_formats=None):
+        """
+        Assign a session to the least-loaded worker. Returns False when every worker is full, or when the
+        worker died as the session was sent to it and its replacement could not take it either.
+        """
+        self.start()
+        with self.lock:
+            for attempt in range(2):
+                self._replace_dead_workers()
+                index = min(range(len(self.workers)), key=lambda i: len(self.workers[i]["sessions"]))
+                worker = self.workers[index]
+                if len(worker["sessions"]) >= self.sessions_per_worker:
+                    return False
+                try:
+                    self._send(index, {
+                        "command": "start",
+                        "session_id": session_id,
+                        "character": character_type,
+                        "audio_formats": audio_formats
+                    })
+                    break
+                except (OSError, ValueError) as e:
+                    # Exited after the poll above; its sessions are gone with it
+                    print(f"[POOL] Failed to send session {session_id} to worker {index}: {e}, starting a replacement")
+                    self._replace_worker(index)
+            else:
+                return False
+            worker["sessions"].add(session_id)
+            self.session_workers[session_id] = index
+            active = len(worker["sessions"])
+        print(f"[POOL] Session {session_id} assigned to worker {index} ({active} active)")
+        return True
+
+    def stop_session(self, session_id):
+        """Ask the owning worker to end a session; it reports back on its stdout, see _monitor_worker()."""
+        with self.lock:
+            index = self.session_workers.get(session_id)
+            if index is None:
+                return
+            try:
+                self._send(index, {"command": "stop", "session_id": session_id})
+            except (OSError, ValueError) as e:
+                print(f"[POOL] Failed to stop session {session_id}: {e}")
+
+    def session_ended(self, session_id):
+        """Release a finished session's slot on its worker."""
+        with self.lock:
+            index = self.session_workers.pop(session_id, None)
+            if index is not None:
+                self.workers[index]["sessions"].discard(session_id)
+        if index is not None:
+            print(f"[POOL] Bot finished session: {session_id}")
+
+    def stats(self):
+        with self.lock:
+            return {
+                "workers": len(self.workers),
+                "sessions_per_worker": self.sessions_per_worker,
+                "active_sessions": [len(worker["sessions"]) for worker in self.workers]
+            }
+
+    def shutdown(self):
+        with self.lock:
+            for index in range(len(self.workers)):
+                try:
+                    self._send(index, {"command": "shutdown"})
+                except (OSError, ValueError):
+                    pass
+            for worker in self.workers:
+                try:
+                    worker["process"].wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    worker["process"].terminate()
+            self.workers = []
+            self.session_workers = {}
+            self.started = False
+
+
+if __name__ == "__main__":
+    run_worker(int(sys.argv[1]) if len(sys.argv) > 1 else 0, sys.stdin)
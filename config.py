@@ -15,6 +15,7 @@ DATA_DIR = os.path.join(ROOT_DIR, "data")
 MODEL_DIR = os.path.join(DATA_DIR, "models")
 VOSK_DIR = os.path.join(MODEL_DIR, "vosk")
 VITS_DIR = os.path.join(MODEL_DIR, "vits")
+EMBEDDING_DIR = os.path.join(MODEL_DIR, "embeddings")
 OUTPUT_AUDIO_DIR = os.path.join(DATA_DIR, "generated_audio")
 CONVERSATION_DIR = os.path.join(DATA_DIR, "conversations") 
 
@@ -39,7 +40,8 @@ LLM_CONFIG = {
     "openai": {
         "model": "gpt-4-turbo-preview",
         "temperature": 0.7,
-        "max_tokens": 150
+        "max_tokens": 150,
+        "json_output": "json_object"  # "json_schema" on models with structured outputs (gpt-4o and later)
     },
     "gemini": {
         "model": "gemini-pro",
@@ -49,7 +51,8 @@ LLM_CONFIG = {
     "deepseek": {
         "model": "deepseek-chat",
         "temperature": 0.7,
-        "max_tokens": 150
+        "max_tokens": 150,
+        "json_output": "json_object"
     },
     "grok": {
         "model": "grok-1",
@@ -57,3 +60,135 @@ LLM_CONFIG = {
         "max_tokens": 150
     }
 }
+
+# **LLM Client Pool**
+# One keep-alive HTTP client per provider per process (llm.llm_api.get_llm_api), shared by every caller.
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() == "true"  # Needs the h2 package; falls back to HTTP/1.1
+LLM_POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "100"))
+LLM_POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))
+LLM_POOL_KEEPALIVE_EXPIRY = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "60"))  # Seconds an idle connection is kept
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "30"))
+
+# **LLM Routing**
+# Sessions call llm.llm_router.get_llm_router(provider): the session's provider first, then the failover
+# providers that have an API key set, fastest healthy one preferred. A request still running past its provider's
+# LLM_HEDGE_PERCENTILE latency is duplicated to the next provider; the first answer wins. A provider failing
+# LLM_BREAKER_FAILURES times in a row is skipped for LLM_BREAKER_COOLDOWN seconds, then gets one trial call;
+# if that fails too it is skipped for another cooldown.
+LLM_FAILOVER_PROVIDERS = [p.strip() for p in os.getenv("LLM_FAILOVER_PROVIDERS", "openai,deepseek,grok,gemini").split(",") if p.strip()]
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "90"))
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "3.0"))  # Seconds, until a provider has LLM_LATENCY_MIN_SAMPLES
+LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "50"))  # Recent calls per provider kept for percentiles
+LLM_LATENCY_MIN_SAMPLES = int(os.getenv("LLM_LATENCY_MIN_SAMPLES", "5"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "3"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+# **LLM Response Cache**
+# Responses to the fixed prompt templates (paraphrase, validation, problem solving, issue summary),
+# keyed by provider, model, normalized messages and sampling parameters. In-memory LRU per process,
+# optionally shared on disk between worker processes.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))  # Seconds before a cached response is regenerated
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+LLM_CACHE_SHARED = os.getenv("LLM_CACHE_SHARED", "true").lower() == "true"
+LLM_CACHE_DIR = os.path.join(DATA_DIR, "llm_cache")
+LLM_CACHE_MAX_DISK_ENTRIES = int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", "20000"))
+
+# **LLM Multi-Task Calls**
+# When one user reply needs several LLM tasks (an LLM emotion classification plus the listener paraphrase or
+# the issue summary), ask for all of them in one JSON reply instead of one call each (llm.multi_task).
+# Falls back to separate calls when the combined reply can't be parsed.
+LLM_MULTI_TASK = os.getenv("LLM_MULTI_TASK", "true").lower() == "true"
+LLM_MULTI_TASK_MAX_TOKENS = int(os.getenv("LLM_MULTI_TASK_MAX_TOKENS", "100"))  # Per task in the combined reply
+
+# **LLM Streaming**
+# Stream the listener paraphrase and live I-statements token by token and synthesize each clause as soon
+# as it is complete, so speech starts before the LLM has finished the reply.
+LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() == "true"
+LLM_STREAM_CLAUSE_MIN_WORDS = int(os.getenv("LLM_STREAM_CLAUSE_MIN_WORDS", "6"))  # Commas only split clauses this long
+
+# **Emotion Detection**
+# "lexicon": local word-list classifier, no network call (default).
+# "hybrid": lexicon, falling back to the LLM when the lexicon result is ambiguous.
+# "llm": one LLM round trip per utterance.
+EMOTION_BACKEND = os.getenv("EMOTION_BACKEND", "lexicon").lower()
+EMOTION_AMBIGUITY_MARGIN = float(os.getenv("EMOTION_AMBIGUITY_MARGIN", "0.25"))  # Runner-up within 25% of the top score
+
+# **Paraphrase Scoring**
+# "concepts": the original keyword-overlap check (also used whenever the model can't be loaded).
+# "embedding": cosine similarity of sentence embeddings from a small int8-quantized CPU model, loaded once per process.
+# Opt-in until PARAPHRASE_SIMILARITY_THRESHOLD is calibrated on the validation_response turns (bench_paraphrase_scorer.py).
+PARAPHRASE_SCORER = os.getenv("PARAPHRASE_SCORER", "concepts").lower()
+PARAPHRASE_MODEL = os.getenv("PARAPHRASE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+PARAPHRASE_SIMILARITY_THRESHOLD = float(os.getenv("PARAPHRASE_SIMILARITY_THRESHOLD", "0.65"))  # bench_paraphrase_scorer.py calibrates it
+PARAPHRASE_EMBEDDING_CACHE_SIZE = int(os.getenv("PARAPHRASE_EMBEDDING_CACHE_SIZE", "512"))  # Cached I-statement embeddings
+
+# **I-Statement Bank**
+# Validated I-statements per character type, generated and synthesized in the background and stored on disk,
+# so a speaker turn draws one instead of calling the LLM and TTS.
+I_STATEMENT_BANK_ENABLED = os.getenv("I_STATEMENT_BANK_ENABLED", "true").lower() == "true"
+I_STATEMENT_BANK_DIR = os.path.join(DATA_DIR, "i_statement_bank")
+I_STATEMENT_BANK_SIZE = int(os.getenv("I_STATEMENT_BANK_SIZE", "100"))  # Refills stop at this many per character
+I_STATEMENT_BANK_REFILL_BATCH = int(os.getenv("I_STATEMENT_BANK_REFILL_BATCH", "5"))  # LLM calls per refill job
+I_STATEMENT_BANK_RELOAD_INTERVAL = float(os.getenv("I_STATEMENT_BANK_RELOAD_INTERVAL", "10"))  # Seconds between checks for other processes' additions
+
+# **Bot Worker Pool**
+# Long-lived worker processes that each host many ConversationBot sessions.
+# Set BOT_WORKERS=0 to fall back to one `python main.py` subprocess per session.
+BOT_WORKERS = int(os.getenv("BOT_WORKERS", "2"))
+BOT_SESSIONS_PER_WORKER = int(os.getenv("BOT_SESSIONS_PER_WORKER", "25"))
+
+# **Streaming TTS**
+# Send bot speech to the browser as raw PCM chunks while it is being synthesized
+# instead of one complete WAV per utterance.
+TTS_STREAMING = os.getenv("TTS_STREAMING", "false").lower() == "true"
+TTS_STREAM_SAMPLE_RATE = 24000  # OpenAI tts-1 "pcm" output: 24 kHz, 16-bit signed little-endian, mono
+TTS_STREAM_CHUNK_BYTES = int(os.getenv("TTS_STREAM_CHUNK_BYTES", "9600"))  # 200 ms of audio per chunk
+
+# **Local TTS (VITS)**
+# TTS_BACKEND=vits synthesizes speech in-process with DEFAULT_VITS_MODEL (speech.local_tts) instead of OpenAI TTS.
+# It encodes WAV, or 24 kHz PCM when TTS_STREAMING, so sessions negotiate wav. Utterances queued by any session
+# in the process within VITS_BATCH_WAIT_MS share one padded forward pass.
+TTS_BACKEND = os.getenv("TTS_BACKEND", "openai").lower()
+VITS_TORCH_THREADS = int(os.getenv("VITS_TORCH_THREADS", str(max(1, (os.cpu_count() or 1) // max(1, BOT_WORKERS)))))
+# One thread has no idle cores for a batch to fill, and padding makes it slower than one pass per utterance
+VITS_BATCH_SIZE = int(os.getenv("VITS_BATCH_SIZE", "1" if VITS_TORCH_THREADS == 1 else "8"))
+VITS_BATCH_WAIT_MS = float(os.getenv("VITS_BATCH_WAIT_MS", "15"))  # Longest an utterance waits for others to batch with
+VITS_BATCH_LENGTH_RATIO = float(os.getenv("VITS_BATCH_LENGTH_RATIO", "1.5"))  # Longest/shortest text in one batch
+VITS_LATENCY_WINDOW = int(os.getenv("VITS_LATENCY_WINDOW", "200"))  # Recent utterances kept for latency percentiles
+# `python -m speech.speech_model` exports an inference-only copy of the model into VITS_DIR, loaded in preference
+# to the Hugging Face checkpoint. VITS_QUANTIZE runs its Linear layers in dynamic int8.
+VITS_QUANTIZE = os.getenv("VITS_QUANTIZE", "false").lower() == "true"
+
+# **Audio Transport**
+# "binary": send bot audio as raw bytes in a binary SocketIO frame (play_audio_binary).
+# "base64": legacy base64 string in a JSON frame (play_audio_base64), for clients without binary support.
+AUDIO_TRANSPORT = os.getenv("AUDIO_TRANSPORT", "binary").lower()
+
+# **TTS Audio Codec**
+# "auto" negotiates per session: the first format in TTS_FORMAT_PREFERENCE the browser can play.
+# Set to opus, mp3, aac or wav to force one codec for every session.
+TTS_AUDIO_FORMAT = os.getenv("TTS_AUDIO_FORMAT", "auto").lower()
+TTS_FORMAT_PREFERENCE = ["opus", "mp3", "aac", "wav"]  # Smallest first
+TTS_FORMAT_MIME = {
+    "opus": "audio/ogg; codecs=opus",
+    "mp3": "audio/mpeg",
+    "aac": "audio/aac",
+    "wav": "audio/wav"
+}
+
+# **TTS Cache**
+# Synthesized speech keyed by text, voice, model and format: in-memory LRU per process, shared on disk.
+TTS_CACHE_DIR = os.path.join(DATA_DIR, "tts_cache")
+TTS_CACHE_MAX_MEMORY_ENTRIES = int(os.getenv("TTS_CACHE_MAX_MEMORY_ENTRIES", "256"))
+TTS_CACHE_MAX_DISK_ENTRIES = int(os.getenv("TTS_CACHE_MAX_DISK_ENTRIES", "5000"))
+TTS_CACHE_PREWARM = os.getenv("TTS_CACHE_PREWARM", "true").lower() == "true"
+
+# **Speculative Prefetch**
+# Prepare the bot's likely next utterance (LLM text + TTS audio) while the current one plays.
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "8"))  # Threads shared by all bots in a process
+# Separate threads for the LLM calls a user is waiting on (reply emotion, paraphrase, streamed replies), so they
+# never queue behind speculative TTS prefetches or I-statement bank refills
+REPLY_WORKERS = int(os.getenv("REPLY_WORKERS", "16"))
@@ -2,6 +2,10 @@
 LLM Module: Manages API integrations for multiple LLMs (Gemini, OpenAI, Grok, DeepSeek).
 """
 
-from .llm_api import LLMApi
+from .llm_api import LLMApi, get_llm_api
+from .response_cache import ResponseCache, response_cache
+from .llm_router import LLMRouter, get_llm_router
+from .multi_task import LLMTask, run_tasks, arun_tasks, multi_task_stats
 
-__all__ = ["LLMApi"]
+__all__ = ["LLMApi", "get_llm_api", "ResponseCache", "response_cache", "LLMRouter", "get_llm_router",
+           "LLMTask", "run_tasks", "arun_tasks", "multi_task_stats"]
@@ -1,13 +1,72 @@
 import os
 import sys
-from openai import OpenAI
+import threading
+import importlib.util
+import httpx
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 import google.generativeai as genai
-from config import LLM_CONFIG
+from config import LLM_CONFIG, LLM_HTTP2, LLM_POOL_MAX_CONNECTIONS, LLM_POOL_MAX_KEEPALIVE, LLM_POOL_KEEPALIVE_EXPIRY, LLM_REQUEST_TIMEOUT, LLM_CACHE_ENABLED
+from llm.response_cache import response_cache
 
 from dotenv import load_dotenv
 load_dotenv()
 
+# HTTP/2 multiplexes concurrent requests over one connection; it needs the optional h2 package
+USE_HTTP2 = LLM_HTTP2 and importlib.util.find_spec("h2") is not None
+if LLM_HTTP2 and not USE_HTTP2:
+    print("[LLM] h2 not installed, LLM clients will use HTTP/1.1 keep-alive")
+
+API_KEY_ENV = {
+    "openai": "OPENAI_API_KEY",
+    "deepseek": "DEEPSEEK_API_KEY",
+    "grok": "GROK_API_KEY",
+    "gemini": "GEMINI_API_KEY"
+}
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+def get_llm_api(provider="openai"):
+    """
+    Process-wide LLMApi for provider. Every caller shares its HTTP connection pool,
+    so a request reuses a warm (TLS-established) connection instead of opening a new one.
+    """
+    with _registry_lock:
+        llm_api = _registry.get(provider)
+        if llm_api is None:
+            llm_api = _registry[provider] = LLMApi(provider=provider)
+        return llm_api
+
+def http_client_options():
+    """Pool limits and timeouts for the httpx clients behind the OpenAI-compatible providers"""
+    return {
+        "http2": USE_HTTP2,
+        "limits": httpx.Limits(
+            max_connections=LLM_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_POOL_KEEPALIVE_EXPIRY
+        ),
+        "timeout": LLM_REQUEST_TIMEOUT
+    }
+
+def response_format(provider, json_schema):
+    """
+    The chat.completions response_format that constrains a reply to json_schema, per the provider's
+    LLM_CONFIG "json_output": the schema itself, plain JSON mode, or None when the provider has neither.
+    """
+    json_output = LLM_CONFIG[provider].get("json_output") if json_schema else None
+    if json_output == "json_schema":
+        return {"type": "json_schema", "json_schema": {"name": "answer", "schema": json_schema, "strict": True}}
+    if json_output == "json_object":
+        return {"type": "json_object"}
+    return None
+
+def completion_options(provider, json_schema):
+    """Extra chat.completions.create() arguments for json_schema"""
+    constraint = response_format(provider, json_schema)
+    return {"response_format": constraint} if constraint else {}
+
 class LLMApi:
     def __init__(self, provider="openai"):
         """Initialize the API client based on the selected provider"""
@@ -16,52 +75,201 @@ class LLMApi:
         self.provider = provider
         self.api_key = self.get_api_key()
         self.client = self.get_client()
+        self.async_client = None  # Created on first agenerate_response() call
 
     def get_api_key(self):
         """Retrieve API keys based on the selected provider"""
-        keys = {
-            "openai": os.getenv("OPENAI_API_KEY"),
-            "deepseek": os.getenv("DEEPSEEK_API_KEY"),
-            "grok": os.getenv("GROK_API_KEY"),
-            "gemini": os.getenv("GEMINI_API_KEY")
-        }
-        return keys.get(self.provider)
+        return os.getenv(API_KEY_ENV.get(self.provider, ""))
 
     def get_client(self):
         """Return the corresponding API client"""
         if self.provider == "openai":
-            return OpenAI(api_key=self.api_key)
+            return OpenAI(api_key=self.api_key, http_client=httpx.Client(**http_client_options()))
         elif self.provider == "deepseek":
-            return OpenAI(api_key=self.api_key, base_url="https://api.deepseek.com/v1")
+            return OpenAI(api_key=self.api_key, base_url="https://api.deepseek.com/v1", http_client=httpx.Client(**http_client_options()))
         elif self.provider == "grok":
-            return OpenAI(api_key=self.api_key, base_url="https://api.x.ai/v1")
+            return OpenAI(api_key=self.api_key, base_url="https://api.x.ai/v1", http_client=httpx.Client(**http_client_options()))
         elif self.provider == "gemini":
             genai.configure(api_key=self.api_key)
             return genai
         else:
             raise ValueError("Invalid provider specified")
 
-    def generate_response(self, messages, temperature=0.8, max_tokens=100):
-        """Generate a response using the selected LLM with proper provider handling."""
+    def get_async_client(self):
+        """Return the asyncio client for the selected provider, creating it on first use"""
+        if self.async_client is None:
+            if self.provider == "openai":
+                self.async_client = AsyncOpenAI(api_key=self.api_key, http_client=httpx.AsyncClient(**http_client_options()))
+            elif self.provider == "deepseek":
+                self.async_client = AsyncOpenAI(api_key=self.api_key, base_url="https://api.deepseek.com/v1", http_client=httpx.AsyncClient(**http_client_options()))
+            elif self.provider == "grok":
+                self.async_client = AsyncOpenAI(api_key=self.api_key, base_url="https://api.x.ai/v1", http_client=httpx.AsyncClient(**http_client_options()))
+            else:
+                # google.generativeai exposes async calls on the same module
+                self.async_client = self.client
+        return self.async_client
+
+    def generate_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None, json_schema=None):
+        """
+        Generate a response using the selected LLM with proper provider handling.
+        Calls that name a cache_template (a fixed prompt template) are served from the response cache when possible.
+        A json_schema asks providers that support it for a JSON reply matching the schema.
+        """
+        cache_key = self.cache_key(messages, temperature, max_tokens, cache_template)
+        if cache_key is not None:
+            cached = response_cache.get(cache_key, cache_template)
+            if cached is not None:
+                return cached
         try:
-            model_name = LLM_CONFIG[self.provider]["model"]  # Load dynamically from config
+            response = self.complete(messages, temperature, max_tokens, json_schema)
+        except Exception as e:
+            print(f"Error communicating with {self.provider.upper()}: {e}")
+            return "Sorry, I'm having trouble processing that request."
+        if cache_key is not None:
+            response_cache.put(cache_key, response)
+        return response
 
-            if self.provider == "gemini":
-                # Initialize the Gemini Model Correctly
-                model = self.client.GenerativeModel(model_name)
-                response = model.generate_content(messages[-1]["content"])  # Correct API usage
-                return response.text if response else "Sorry, I didn't understand that."
+    def cache_key(self, messages, temperature, max_tokens, cache_template):
+        """Response cache key, or None when this call is not cached"""
+        if cache_template is None or not LLM_CACHE_ENABLED:
+            return None
+        return response_cache.key(self.provider, LLM_CONFIG[self.provider]["model"], messages, temperature, max_tokens)
 
-            else:
-                # For OpenAI-compatible APIs (OpenAI, DeepSeek, Grok)
-                response = self.client.chat.completions.create(
-                    model=model_name, 
-                    messages=messages, 
-                    temperature=temperature, 
-                    max_tokens=max_tokens
-                )
-                return response.choices[0].message.content if response.choices else None
+    def complete(self, messages, temperature, max_tokens, json_schema=None):
+        """One uncached LLM call; raises on provider errors"""
+        model_name = LLM_CONFIG[self.provider]["model"]  # Load dynamically from config
+
+        if self.provider == "gemini":
+            # Initialize the Gemini Model Correctly
+            model = self.client.GenerativeModel(model_name)
+            response = model.generate_content(messages[-1]["content"])  # Correct API usage
+            return response.text if response else "Sorry, I didn't understand that."
+
+        else:
+            # For OpenAI-compatible APIs (OpenAI, DeepSeek, Grok)
+            response = self.client.chat.completions.create(
+                model=model_name, 
+                messages=messages, 
+                temperature=temperature, 
+                max_tokens=max_tokens,
+                **completion_options(self.provider, json_schema)
+            )
+            return response.choices[0].message.content if response.choices else None
 
+    async def agenerate_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None, json_schema=None):
+        """Async version of generate_response() for use inside an asyncio event loop."""
+        cache_key = self.cache_key(messages, temperature, max_tokens, cache_template)
+        if cache_key is not None:
+            cached = response_cache.get(cache_key, cache_template)
+            if cached is not None:
+                return cached
+        try:
+            response = await self.acomplete(messages, temperature, max_tokens, json_schema)
         except Exception as e:
             print(f"Error communicating with {self.provider.upper()}: {e}")
             return "Sorry, I'm having trouble processing that request."
+        if cache_key is not None:
+            response_cache.put(cache_key, response)
+        return response
+
+    async def acomplete(self, messages, temperature, max_tokens, json_schema=None):
+        """Async version of complete()"""
+        model_name = LLM_CONFIG[self.provider]["model"]
+        client = self.get_async_client()
+
+        if self.provider == "gemini":
+            model = client.GenerativeModel(model_name)
+            response = await model.generate_content_async(messages[-1]["content"])
+            return response.text if response else "Sorry, I didn't understand that."
+
+        else:
+            response = await client.chat.completions.create(
+                model=model_name,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **completion_options(self.provider, json_schema)
+            )
+            return response.choices[0].message.content if response.choices else None
+
+    def stream_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None):
+        """
+        Yield the response as text deltas while the LLM generates it. A cached response is yielded whole.
+        On a provider error the stream just ends, so the caller falls back on whatever (if anything) arrived.
+        """
+        cache_key = self.cache_key(messages, temperature, max_tokens, cache_template)
+        if cache_key is not None:
+            cached = response_cache.get(cache_key, cache_template)
+            if cached is not None:
+                yield cached
+                return
+        deltas = []
+        try:
+            for delta in self.stream_deltas(messages, temperature, max_tokens):
+                deltas.append(delta)
+                yield delta
+        except Exception as e:
+            print(f"Error streaming from {self.provider.upper()}: {e}")
+            return
+        if cache_key is not None:
+            response_cache.put(cache_key, "".join(deltas))
+
+    def stream_deltas(self, messages, temperature, max_tokens):
+        """One uncached streaming LLM call, yielding text deltas; raises on provider errors"""
+        model_name = LLM_CONFIG[self.provider]["model"]
+        if self.provider == "gemini":
+            model = self.client.GenerativeModel(model_name)
+            for chunk in model.generate_content(messages[-1]["content"], stream=True):
+                yield chunk.text
+        else:
+            stream = self.client.chat.completions.create(
+                model=model_name,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+
+    async def astream_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None):
+        """Async version of stream_response()"""
+        cache_key = self.cache_key(messages, temperature, max_tokens, cache_template)
+        if cache_key is not None:
+            cached = response_cache.get(cache_key, cache_template)
+            if cached is not None:
+                yield cached
+                return
+        deltas = []
+        try:
+            async for delta in self.astream_deltas(messages, temperature, max_tokens):
+                deltas.append(delta)
+                yield delta
+        except Exception as e:
+            print(f"Error streaming from {self.provider.upper()}: {e}")
+            return
+        if cache_key is not None:
+            response_cache.put(cache_key, "".join(deltas))
+
+    async def astream_deltas(self, messages, temperature, max_tokens):
+        """Async version of stream_deltas()"""
+        model_name = LLM_CONFIG[self.provider]["model"]
+        client = self.get_async_client()
+        if self.provider == "gemini":
+            model = client.GenerativeModel(model_name)
+            async for chunk in await model.generate_content_async(messages[-1]["content"], stream=True):
+                yield chunk.text
+        else:
+            stream = await client.chat.completions.create(
+                model=model_name,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
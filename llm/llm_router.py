@@ -0,0 +1,411 @@
+"""
+Latency-aware routing across LLM providers.
+
+A session names one provider, but any provider with an API key can answer the same prompt. The router
+keeps a rolling window of call latencies and a circuit breaker per provider, and sends each request to
+the fastest healthy provider. If no answer has arrived by that provider's LLM_HEDGE_PERCENTILE latency,
+a duplicate request goes to the next provider; the first answer wins and the other request is cancelled.
+Errors fail over to the next provider at once. When every provider fails the router returns None, so
+callers use their own fallback text instead of speaking an error message.
+
+A provider's circuit breaker opens after LLM_BREAKER_FAILURES failures in a row and skips it for
+LLM_BREAKER_COOLDOWN seconds. Then it is half-open: exactly one trial call goes through, and the rest keep
+skipping the provider until that trial succeeds (closing the breaker) or fails (opening it for another cooldown).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from config import (LLM_CONFIG, LLM_CACHE_ENABLED, LLM_POOL_MAX_CONNECTIONS, LLM_FAILOVER_PROVIDERS, LLM_HEDGE_ENABLED,
+                    LLM_HEDGE_PERCENTILE, LLM_HEDGE_DEFAULT_DELAY, LLM_LATENCY_WINDOW, LLM_LATENCY_MIN_SAMPLES,
+                    LLM_BREAKER_FAILURES, LLM_BREAKER_COOLDOWN)
+from llm.llm_api import API_KEY_ENV, get_llm_api
+from llm.response_cache import response_cache
+
+
+class ProviderUnavailable(Exception):
+    """The provider's breaker refused the call: open, or half-open with its trial call in flight"""
+
+
+class ProviderHealth:
+    """Rolling call latencies and a consecutive-failure circuit breaker for one provider."""
+
+    CLOSED = "closed"  # admit(): an ordinary call
+    TRIAL = "trial"  # admit(): the one call let through after a cooldown
+
+    def __init__(self, window=LLM_LATENCY_WINDOW, failures_to_trip=LLM_BREAKER_FAILURES, cooldown=LLM_BREAKER_COOLDOWN):
+        self.latencies = deque(maxlen=window)
+        self.failures_to_trip = failures_to_trip
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.open_until = 0.0  # Breaker open (provider skipped) until this time; 0.0 when closed
+        self.trial_in_flight = False  # Half-open breaker has let its one trial call through
+        self.successes = 0
+        self.failures = 0
+        self.trips = 0
+        self.lock = threading.Lock()
+
+    def record_success(self, seconds):
+        with self.lock:
+            self.successes += 1
+            self.latencies.append(seconds)
+            self.consecutive_failures = 0
+            self.open_until = 0.0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            now = time.time()
+            if self.open_until and now >= self.open_until:
+                # Half-open: the trial failed, so the provider is skipped for another cooldown
+                self.trips += 1
+                self.trial_in_flight = False
+                self.open_until = now + self.cooldown
+                print(f"[LLM ROUTER] Trial call failed, circuit breaker open for {self.cooldown:.0f} s")
+            elif self.consecutive_failures >= self.failures_to_trip:
+                if not self.open_until:
+                    self.trips += 1
+                    print(f"[LLM ROUTER] Circuit breaker open for {self.cooldown:.0f} s after {self.consecutive_failures} failures")
+                self.open_until = now + self.cooldown
+
+    def _available(self, now):
+        # Caller holds self.lock
+        return not self.open_until or (now >= self.open_until and not self.trial_in_flight)
+
+    def available(self):
+        """Breaker closed, or its cooldown is over and the trial call has not been made"""
+        with self.lock:
+            return self._available(time.time())
+
+    def admit(self):
+        """
+        Called as a request goes out: CLOSED for an ordinary call, TRIAL for the one call a half-open breaker
+        lets through, None when the provider has to be skipped
+        """
+        with self.lock:
+            if not self._available(time.time()):
+                return None
+            if not self.open_until:
+                return self.CLOSED
+            self.trial_in_flight = True
+            return self.TRIAL
+
+    def abandon(self, admission):
+        """A call that ended without a result (cancelled, or the caller stopped reading) frees its trial slot"""
+        if admission == self.TRIAL:
+            with self.lock:
+                self.trial_in_flight = False
+
+    def percentile(self, percent, min_samples=LLM_LATENCY_MIN_SAMPLES):
+        """Latency percentile in seconds over the window, or None with fewer than min_samples calls"""
+        with self.lock:
+            if len(self.latencies) < min_samples:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[int((len(ordered) - 1) * percent / 100)]
+
+    def stats(self):
+        p50 = self.percentile(50, 1)
+        with self.lock:
+            return {
+                "successes": self.successes,
+                "failures": self.failures,
+                "trips": self.trips,
+                "available": self._available(time.time()),
+                "p50_ms": round(p50 * 1000) if p50 is not None else None
+            }
+
+
+class LLMRouter:
+    """Drop-in for LLMApi (generate_response, agenerate_response, stream_response, astream_response) over several providers."""
+
+    def __init__(self, providers, apis=None, executor=None):
+        self.providers = list(providers)
+        self.provider = self.providers[0]
+        self.apis = apis or {provider: get_llm_api(provider) for provider in self.providers}
+        self.health = {provider: ProviderHealth() for provider in self.providers}
+        # Runs the sync calls so a request can be hedged while another is in flight
+        self.executor = executor or ThreadPoolExecutor(max_workers=LLM_POOL_MAX_CONNECTIONS, thread_name_prefix="llm-router")
+        self.lock = threading.Lock()
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+        self.all_failed = 0
+
+    def count(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def ranked_providers(self):
+        """Providers whose breaker is closed, fastest median latency first; unmeasured ones keep their configured order"""
+        def rank(item):
+            index, provider = item
+            median = self.health[provider].percentile(50, 1)
+            return (median is None, median or 0.0, index)
+        return [provider for _, provider in sorted(enumerate(self.providers), key=rank) if self.health[provider].available()]
+
+    def hedge_delay(self, provider):
+        """Seconds to wait on provider before duplicating the request to the next one"""
+        delay = self.health[provider].percentile(LLM_HEDGE_PERCENTILE)
+        return LLM_HEDGE_DEFAULT_DELAY if delay is None else delay
+
+    def cache_key(self, messages, temperature, max_tokens, cache_template):
+        """Response cache key, or None when this call is not cached"""
+        if cache_template is None or not LLM_CACHE_ENABLED:
+            return None
+        # Any provider's answer serves the same prompt; a single-provider router shares LLMApi's entries
+        models = "+".join(LLM_CONFIG[provider]["model"] for provider in self.providers)
+        return response_cache.key("+".join(self.providers), models, messages, temperature, max_tokens)
+
+    def admit(self, provider):
+        """Breaker admission for a call to provider; raises ProviderUnavailable when it is skipped"""
+        admission = self.health[provider].admit()
+        if admission is None:
+            raise ProviderUnavailable(f"{provider} circuit breaker is open")
+        return admission
+
+    def call(self, provider, messages, temperature, max_tokens, json_schema=None):
+        """One provider call, recorded in its health; raises on errors and empty answers"""
+        admission = self.admit(provider)
+        started = time.time()
+        try:
+            response = self.apis[provider].complete(messages, temperature, max_tokens, json_schema=json_schema)
+            if not response or not response.strip():
+                raise ValueError("empty response")
+        except Exception as e:
+            self.health[provider].record_failure()
+            print(f"[LLM ROUTER] {provider} failed: {e}")
+            raise
+        except BaseException:
+            self.health[provider].abandon(admission)
+            raise
+        self.health[provider].record_success(time.time() - started)
+        return response
+
+    async def acall(self, provider, messages, temperature, max_tokens, json_schema=None):
+        """Async version of call(); a cancelled hedge is not counted as a failure"""
+        admission = self.admit(provider)
+        started = time.time()
+        try:
+            response = await self.apis[provider].acomplete(messages, temperature, max_tokens, json_schema=json_schema)
+            if not response or not response.strip():
+                raise ValueError("empty response")
+        except Exception as e:
+            self.health[provider].record_failure()
+            print(f"[LLM ROUTER] {provider} failed: {e}")
+            raise
+        except BaseException:
+            self.health[provider].abandon(admission)
+            raise
+        self.health[provider].record_success(time.time() - started)
+        return response
+
+    def generate_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None, json_schema=None):
+        """Like LLMApi.generate_response(), but hedged across providers; None if every provider failed"""
+        cache_key = self.cache_key(messages, temperature, max_tokens, cache_template)
+        if cache_key is not None:
+            cached = response_cache.get(cache_key, cache_template)
+            if cached is not None:
+                return cached
+        response = self.route(messages, temperature, max_tokens, json_schema)
+        if cache_key is not None:
+            response_cache.put(cache_key, response)
+        return response
+
+    def route(self, messages, temperature, max_tokens, json_schema=None):
+        candidates = self.ranked_providers()
+        pending = {}  # Future -> provider
+        hedged = False
+
+        def launch():
+            provider = candidates.pop(0)
+            pending[self.executor.submit(self.call, provider, messages, temperature, max_tokens, json_schema)] = provider
+            return provider, time.time()
+
+        if not candidates:
+            print(f"[LLM ROUTER] No provider available, every circuit breaker is open")
+            self.count("all_failed")
+            return None
+        primary, started = launch()
+        while pending:
+            hedge = LLM_HEDGE_ENABLED and not hedged and candidates
+            timeout = max(0.0, self.hedge_delay(primary) - (time.time() - started)) if hedge else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                self.count("hedges")
+                print(f"[LLM ROUTER] {primary} slower than p{LLM_HEDGE_PERCENTILE:.0f}, hedging to {candidates[0]}")
+                launch()
+                continue
+            for future in done:
+                provider = pending.pop(future)
+                if future.exception() is None:
+                    # A loser that has not started never runs; one in flight finishes in the background
+                    # and only updates its provider's latency
+                    for loser in pending:
+                        loser.cancel()
+                    if provider != primary:
+                        self.count("hedge_wins")
+                    return future.result()
+            if not pending and candidates:
+                self.count("failovers")
+                primary, started = launch()
+        self.count("all_failed")
+        return None
+
+    async def agenerate_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None, json_schema=None):
+        """Async version of generate_response()"""
+        cache_key = self.cache_key(messages, temperature, max_tokens, cache_template)
+        if cache_key is not None:
+            cached = response_cache.get(cache_key, cache_template)
+            if cached is not None:
+                return cached
+        response = await self.aroute(messages, temperature, max_tokens, json_schema)
+        if cache_key is not None:
+            response_cache.put(cache_key, response)
+        return response
+
+    async def aroute(self, messages, temperature, max_tokens, json_schema=None):
+        """Async version of route(); the losing request is cancelled"""
+        candidates = self.ranked_providers()
+        pending = {}  # Task -> provider
+        hedged = False
+
+        def launch():
+            provider = candidates.pop(0)
+            pending[asyncio.ensure_future(self.acall(provider, messages, temperature, max_tokens, json_schema))] = provider
+            return provider, time.time()
+
+        if not candidates:
+            print(f"[LLM ROUTER] No provider available, every circuit breaker is open")
+            self.count("all_failed")
+            return None
+        primary, started = launch()
+        try:
+            while pending:
+                hedge = LLM_HEDGE_ENABLED and not hedged and candidates
+                timeout = max(0.0, self.hedge_delay(primary) - (time.time() - started)) if hedge else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    self.count("hedges")
+                    print(f"[LLM ROUTER] {primary} slower than p{LLM_HEDGE_PERCENTILE:.0f}, hedging to {candidates[0]}")
+                    launch()
+                    continue
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        if provider != primary:
+                            self.count("hedge_wins")
+                        return task.result()
+                if not pending and candidates:
+                    self.count("failovers")
+                    primary, started = launch()
+        finally:
+            for loser in pending:
+                loser.cancel()
+        self.count("all_failed")
+        return None
+
+    def stream_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None):
+        """
+        Like LLMApi.stream_response(), from the fastest healthy provider. A provider that fails before its first
+        delta fails over to the next; once text has been yielded the stream stays with its provider.
+        Streams are not hedged.
+        """
+        cache_key = self.cache_key(messages, temperature, max_tokens, cache_template)
+        if cache_key is not None:
+            cached = response_cache.get(cache_key, cache_template)
+            if cached is not None:
+                yield cached
+                return
+        for provider in self.ranked_providers():
+            admission = self.health[provider].admit()
+            if admission is None:
+                continue
+            started = time.time()
+            deltas = []
+            try:
+                for delta in self.apis[provider].stream_deltas(messages, temperature, max_tokens):
+                    deltas.append(delta)
+                    yield delta
+                if not deltas:
+                    raise ValueError("empty response")
+            except GeneratorExit:
+                self.health[provider].abandon(admission)
+                raise
+            except Exception as e:
+                self.health[provider].record_failure()
+                print(f"[LLM ROUTER] {provider} stream failed: {e}")
+                if deltas:
+                    return
+                self.count("failovers")
+                continue
+            self.health[provider].record_success(time.time() - started)
+            if cache_key is not None:
+                response_cache.put(cache_key, "".join(deltas))
+            return
+        self.count("all_failed")
+
+    async def astream_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None):
+        """Async version of stream_response()"""
+        cache_key = self.cache_key(messages, temperature, max_tokens, cache_template)
+        if cache_key is not None:
+            cached = response_cache.get(cache_key, cache_template)
+            if cached is not None:
+                yield cached
+                return
+        for provider in self.ranked_providers():
+            admission = self.health[provider].admit()
+            if admission is None:
+                continue
+            started = time.time()
+            deltas = []
+            try:
+                async for delta in self.apis[provider].astream_deltas(messages, temperature, max_tokens):
+                    deltas.append(delta)
+                    yield delta
+                if not deltas:
+                    raise ValueError("empty response")
+            except (GeneratorExit, asyncio.CancelledError):
+                self.health[provider].abandon(admission)
+                raise
+            except Exception as e:
+                self.health[provider].record_failure()
+                print(f"[LLM ROUTER] {provider} stream failed: {e}")
+                if deltas:
+                    return
+                self.count("failovers")
+                continue
+            self.health[provider].record_success(time.time() - started)
+            if cache_key is not None:
+                response_cache.put(cache_key, "".join(deltas))
+            return
+        self.count("all_failed")
+
+    def stats(self):
+        with self.lock:
+            counters = {"hedges": self.hedges, "hedge_wins": self.hedge_wins, "failovers": self.failovers, "all_failed": self.all_failed}
+        return {**counters, "providers": {provider: health.stats() for provider, health in self.health.items()}}
+
+
+_routers = {}
+_routers_lock = threading.Lock()
+
+def failover_providers(provider):
+    """provider, then the LLM_FAILOVER_PROVIDERS that have an API key set"""
+    return [provider] + [p for p in LLM_FAILOVER_PROVIDERS
+                         if p != provider and p in LLM_CONFIG and os.getenv(API_KEY_ENV.get(p, ""))]
+
+def get_llm_router(provider="openai"):
+    """Process-wide LLMRouter with provider first, shared by every session that names it"""
+    with _routers_lock:
+        router = _routers.get(provider)
+        if router is None:
+            router = _routers[provider] = LLMRouter(failover_providers(provider))
+        return router
@@ -0,0 +1,205 @@
+"""
+Multi-task LLM calls.
+
+One user reply can need several LLM tasks: its emotion, the listener paraphrase, the issue summary. Asked
+separately, each one pays a round trip and repeats its own prompt preamble. run_tasks() asks for all of them in
+one request that answers with a JSON object holding one field per task, and hands each field to that task's
+finish function. If the combined reply can't be parsed, every task falls back to its own prompt.
+
+A combined reply is cached under its own prompt once it has parsed, never under the single-task prompts'
+keys: its fields answer a different prompt and token budget than the separate calls.
+"""
+
+import asyncio
+import json
+import re
+import threading
+from config import LLM_MULTI_TASK_MAX_TOKENS
+from llm.response_cache import response_cache
+
+# Sampling parameters of the separate calls, so their cached answers serve a batched run
+TASK_TEMPERATURE = 0.8
+MULTI_TASK_TEMPLATE = "multi_task"  # Response cache template of the combined calls
+TASK_MAX_TOKENS = 100
+
+
+class LLMTask:
+    """One task of a multi-task call"""
+
+    def __init__(self, name, prompt, instruction, finish, cache_template=None):
+        self.name = name  # JSON key of the task's answer
+        self.prompt = prompt  # The task's own prompt, used when it runs as a separate call
+        self.instruction = instruction  # What the JSON field should hold, in the combined prompt
+        self.finish = finish  # Raw LLM text (None on failure) -> the value callers get
+        self.cache_template = cache_template
+
+    @property
+    def messages(self):
+        return [{"role": "user", "content": self.prompt}]
+
+
+def estimate_tokens(text):
+    """Rough token count: about four characters per token in English"""
+    return max(1, round(len(text) / 4))
+
+
+def multi_task_prompt(text, tasks):
+    """One prompt asking for every task's answer about text as a field of a JSON object"""
+    fields = "\n".join(f'- "{task.name}": {task.instruction}' for task in tasks)
+    return f"""Complete these tasks for the user's statement and answer with one JSON object.
+
+Statement: "{text}"
+
+Keys:
+{fields}
+
+Return only the JSON object, without code fences or extra text."""
+
+
+def multi_task_schema(tasks):
+    """JSON schema of the combined reply, for providers that can constrain their output to one"""
+    return {
+        "type": "object",
+        "properties": {task.name: {"type": "string", "description": task.instruction} for task in tasks},
+        "required": [task.name for task in tasks],
+        "additionalProperties": False
+    }
+
+
+def parse_multi_task(response, tasks):
+    """{task name: answer text} from a combined reply, or None if it isn't JSON or a field is missing"""
+    if not response:
+        return None
+    match = re.search(r"\{.*\}", response, re.DOTALL)  # Tolerates code fences and text around the object
+    if not match:
+        return None
+    try:
+        fields = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(fields, dict):
+        return None
+    answers = {}
+    for task in tasks:
+        answer = fields.get(task.name)
+        if not isinstance(answer, str) or not answer.strip():
+            return None
+        answers[task.name] = answer
+    return answers
+
+
+class MultiTaskStats:
+    """Round trips and prompt tokens saved by combined calls, net of the ones that fell back"""
+
+    def __init__(self):
+        self.combined_calls = 0
+        self.fallbacks = 0
+        self.round_trips_saved = 0
+        self.tokens_saved = 0
+        self.lock = threading.Lock()
+
+    def record(self, tasks, prompt, parsed):
+        separate_tokens = sum(estimate_tokens(task.prompt) for task in tasks)
+        names = "+".join(task.name for task in tasks)
+        if parsed:
+            round_trips, tokens = len(tasks) - 1, separate_tokens - estimate_tokens(prompt)
+            print(f"[LLM BATCH] {names} in 1 call instead of {len(tasks)}: ~{tokens} prompt tokens saved")
+        else:
+            # The combined call was wasted on top of the separate ones
+            round_trips, tokens = -1, -estimate_tokens(prompt)
+            print(f"[LLM BATCH] Could not parse the {names} reply, falling back to {len(tasks)} calls")
+        with self.lock:
+            self.combined_calls += 1
+            self.fallbacks += 0 if parsed else 1
+            self.round_trips_saved += round_trips
+            self.tokens_saved += tokens
+
+    def stats(self):
+        with self.lock:
+            return {
+                "combined_calls": self.combined_calls,
+                "fallbacks": self.fallbacks,
+                "round_trips_saved": self.round_trips_saved,
+                "prompt_tokens_saved": self.tokens_saved
+            }
+
+
+multi_task_stats = MultiTaskStats()
+
+
+def cache_keys(llm_api, tasks):
+    return {task.name: llm_api.cache_key(task.messages, TASK_TEMPERATURE, TASK_MAX_TOKENS, task.cache_template) for task in tasks}
+
+
+def cached_answers(tasks, keys):
+    """Answers already in the response cache, and the tasks still to ask"""
+    answers, pending = {}, []
+    for task in tasks:
+        cached = response_cache.get(keys[task.name], task.cache_template) if keys[task.name] is not None else None
+        if cached is not None:
+            answers[task.name] = cached
+        else:
+            pending.append(task)
+    return answers, pending
+
+
+def combined_call(llm_api, text, tasks):
+    """
+    (messages, max_tokens, cache key, cached reply) of the combined call. It is cached only if every task's own
+    call is; the key is None otherwise.
+    """
+    messages = [{"role": "user", "content": multi_task_prompt(text, tasks)}]
+    max_tokens = LLM_MULTI_TASK_MAX_TOKENS * len(tasks)
+    key = None
+    if all(task.cache_template for task in tasks):
+        key = llm_api.cache_key(messages, TASK_TEMPERATURE, max_tokens, MULTI_TASK_TEMPLATE)
+    cached = response_cache.get(key, MULTI_TASK_TEMPLATE) if key is not None else None
+    return messages, max_tokens, key, cached
+
+
+def batched_answers(response, tasks, messages, key, cached):
+    """Parsed combined reply, recorded in the stats and, once it has parsed, in the response cache"""
+    batched = parse_multi_task(response, tasks)
+    if cached is None:
+        multi_task_stats.record(tasks, messages[0]["content"], batched is not None)
+        if batched is not None and key is not None:
+            response_cache.put(key, response)
+    return batched
+
+
+def run_tasks(llm_api, text, tasks):
+    """
+    {task name: finished value} for tasks about text. Tasks not in the response cache are asked in one
+    call to llm_api (an LLMApi or LLMRouter) when there are several, and separately if that reply can't be parsed.
+    """
+    keys = cache_keys(llm_api, tasks)
+    answers, pending = cached_answers(tasks, keys)
+    if len(pending) > 1:
+        messages, max_tokens, key, cached = combined_call(llm_api, text, pending)
+        response = cached if cached is not None else llm_api.generate_response(
+            messages, TASK_TEMPERATURE, max_tokens, json_schema=multi_task_schema(pending))
+        batched = batched_answers(response, pending, messages, key, cached)
+        if batched is not None:
+            answers.update(batched)
+            pending = []
+    for task in pending:
+        answers[task.name] = llm_api.generate_response(task.messages, TASK_TEMPERATURE, TASK_MAX_TOKENS, task.cache_template)
+    return {task.name: task.finish(answers[task.name]) for task in tasks}
+
+
+async def arun_tasks(llm_api, text, tasks):
+    """Async version of run_tasks(); fallback calls run concurrently"""
+    keys = cache_keys(llm_api, tasks)
+    answers, pending = cached_answers(tasks, keys)
+    if len(pending) > 1:
+        messages, max_tokens, key, cached = combined_call(llm_api, text, pending)
+        response = cached if cached is not None else await llm_api.agenerate_response(
+            messages, TASK_TEMPERATURE, max_tokens, json_schema=multi_task_schema(pending))
+        batched = batched_answers(response, pending, messages, key, cached)
+        if batched is not None:
+            answers.update(batched)
+            pending = []
+    separate = await asyncio.gather(*(llm_api.agenerate_response(task.messages, TASK_TEMPERATURE, TASK_MAX_TOKENS, task.cache_template)
+                                      for task in pending))
+    answers.update(zip((task.name for task in pending), separate))
+    return {task.name: task.finish(answers[task.name]) for task in tasks}
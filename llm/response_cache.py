@@ -0,0 +1,152 @@
+"""
+Cache for LLM responses to fixed prompt templates.
+
+Entries are keyed by sha256(provider, model, temperature, max_tokens, messages), with message text
+lowercased and whitespace-collapsed so near-identical user utterances share an entry. Recent entries
+live in an in-memory LRU; with a shared directory every entry is also written to disk as JSON so
+worker processes and restarts reuse it. Entries older than the TTL are regenerated.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from config import LLM_CACHE_DIR, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_SHARED, LLM_CACHE_MAX_DISK_ENTRIES
+
+
+def normalize_content(text):
+    return " ".join(str(text).lower().split())
+
+
+class ResponseCache:
+    """In-memory LRU with TTL, optionally backed by a directory of JSON files, with per-template counters."""
+
+    def __init__(self, directory=LLM_CACHE_DIR, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES,
+                 shared=LLM_CACHE_SHARED, max_disk_entries=LLM_CACHE_MAX_DISK_ENTRIES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared = shared
+        self.max_disk_entries = max_disk_entries
+        self.memory = OrderedDict()  # key -> (created, response), least recently used first
+        self.lock = threading.Lock()
+        self.template_stats = {}  # template -> {"hits": n, "misses": n}
+        self.writes_since_prune = 0
+
+    @staticmethod
+    def key(provider, model, messages, temperature, max_tokens):
+        normalized = [[message.get("role"), normalize_content(message.get("content", ""))] for message in messages]
+        payload = json.dumps([provider, model, temperature, max_tokens, normalized], separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _remember(self, key, created, response):
+        # Caller holds self.lock
+        self.memory[key] = (created, response)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _count(self, template, hit):
+        # Caller holds self.lock
+        counts = self.template_stats.setdefault(template, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+
+    def get(self, key, template):
+        """Return the cached response, or None on a miss or an expired entry."""
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self.memory.move_to_end(key)
+                self._count(template, True)
+                return entry[1]
+
+        entry = None
+        if self.shared:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    data = json.load(f)
+                entry = (data["created"], data["response"])
+            except (OSError, ValueError, KeyError):
+                entry = None
+
+        with self.lock:
+            if entry is not None and now - entry[0] < self.ttl:
+                self._remember(key, *entry)
+                self._count(template, True)
+                return entry[1]
+            self.memory.pop(key, None)
+            self._count(template, False)
+            return None
+
+    def put(self, key, response):
+        """Store a response in memory and, when shared, on disk. Disk errors only cost sharing."""
+        if not response:
+            return
+        created = time.time()
+        with self.lock:
+            self._remember(key, created, response)
+            self.writes_since_prune += 1
+            prune = self.writes_since_prune >= 100
+            if prune:
+                self.writes_since_prune = 0
+        if not self.shared:
+            return
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write-then-rename so concurrent workers never read a partial file
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"created": created, "response": response}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"[LLM CACHE] Failed to write {path}: {e}")
+        if prune:
+            self.prune_disk()
+
+    def prune_disk(self):
+        """Delete expired files and the oldest ones beyond max_disk_entries."""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    files.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+        files.sort()
+        expired_before = time.time() - self.ttl
+        excess = max(0, len(files) - self.max_disk_entries)
+        for index, (mtime, path) in enumerate(files):
+            if index >= excess and mtime >= expired_before:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            templates = {
+                template: {**counts, "hit_rate": counts["hits"] / (counts["hits"] + counts["misses"])}
+                for template, counts in self.template_stats.items()
+            }
+            hits = sum(counts["hits"] for counts in self.template_stats.values())
+            lookups = hits + sum(counts["misses"] for counts in self.template_stats.values())
+            return {
+                "hits": hits,
+                "misses": lookups - hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory),
+                "templates": templates
+            }
+
+
+response_cache = ResponseCache()
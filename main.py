@@ -1,18 +1,20 @@
+import asyncio
 import signal
 import sys
 import os
-from bot.conversation_bot import ConversationBot
+from bot.async_conversation_bot import AsyncConversationBot
 from config import CONVERSATION_DIR  # Ensure paths are centralized
 
 # Get character type and session ID from environment variables
 character_type = os.environ.get("BOT_CHARACTER", "neutral")
 session_id = os.environ.get("SESSION_ID")
+audio_formats = [f for f in os.environ.get("BOT_AUDIO_FORMATS", "").split(",") if f]
 
 print(f"[BOT PROCESS] Starting bot with character: {character_type} for session: {session_id}", flush=True)
-print(f"[BOT PROCESS] Initializing ConversationBot...", flush=True)
+print(f"[BOT PROCESS] Initializing AsyncConversationBot...", flush=True)
 
 # Initialize bot with session ID
-bot = ConversationBot(character_type=character_type, session_id=session_id)
+bot = AsyncConversationBot(character_type=character_type, session_id=session_id, audio_formats=audio_formats)
 
 def signal_handler(sig, frame):
     """Handle Ctrl + C to save conversation before exiting."""
@@ -27,7 +29,7 @@ print(f"[BOT PROCESS] Starting main loop...", flush=True)
 
 if __name__ == "__main__":
     try:
-        bot.main_loop()
+        asyncio.run(bot.main_loop())
     except KeyboardInterrupt:
         print(f"\n[INFO] Session {session_id}: Keyboard Interrupt detected. Saving conversation...")
         bot.save_conversation()
@@ -6,49 +6,212 @@ from dotenv import load_dotenv
 
 from dotenv import load_dotenv
 load_dotenv()
+from config import TTS_BACKEND, TTS_STREAMING, TTS_STREAM_CHUNK_BYTES, TTS_AUDIO_FORMAT, TTS_FORMAT_PREFERENCE, TTS_FORMAT_MIME
+from speech.tts_cache import tts_cache
+from speech.local_tts import local_text_to_speech, alocal_text_to_speech, prewarm_local_tts_cache
 # Import OpenAI for TTS
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     if OPENAI_API_KEY:
         openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        async_openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
         OPENAI_AVAILABLE = True
     else:
         openai_client = None
+        async_openai_client = None
         OPENAI_AVAILABLE = False
 except ImportError:
     OPENAI_AVAILABLE = False
     openai_client = None
+    async_openai_client = None
 
-def groq_text_to_speech(text: str, return_bytes=False):
+TTS_MODEL = "tts-1"
+TTS_VOICE = "alloy"  # Consistent voice throughout
+
+def negotiate_audio_format(browser_formats=None):
+    """
+    Pick the TTS output codec for a session: TTS_AUDIO_FORMAT if it is fixed,
+    otherwise the most compact format the browser reported it can play (wav if none).
+    The local VITS backend only encodes wav.
+    """
+    if TTS_BACKEND == "vits":
+        return "wav"
+    if TTS_AUDIO_FORMAT != "auto":
+        return TTS_AUDIO_FORMAT
+    for audio_format in TTS_FORMAT_PREFERENCE:
+        if browser_formats and audio_format in browser_formats:
+            return audio_format
+    return "wav"
+
+
+def groq_text_to_speech(text: str, return_bytes=False, audio_format="wav"):
     """
-    Converts text to speech using OpenAI TTS only.
+    Converts text to speech using OpenAI TTS (or the local VITS model with TTS_BACKEND=vits),
+    served from the TTS cache when possible.
     Args:
         text: Text to convert to speech
         return_bytes: If True, returns raw bytes. If False, returns base64 data URL.
+        audio_format: OpenAI response_format - wav, opus, mp3 or aac.
     """
-    # Use OpenAI TTS only
-    if OPENAI_AVAILABLE and openai_client and OPENAI_API_KEY:
-        try:
-            response = openai_client.audio.speech.create(
-                model="tts-1",
-                voice="alloy",  # Consistent voice throughout
-                input=text,
-                response_format="wav"
-            )
-            
-            audio_content = response.content
-            
-            if return_bytes:
-                return audio_content
-            else:
-                audio_base64 = base64.b64encode(audio_content).decode("utf-8")
-                return f"data:audio/wav;base64,{audio_base64}"
-        except Exception as openai_error:
-            return None
-    
+    if TTS_BACKEND == "vits":
+        audio_content = local_text_to_speech(text, audio_format)
+        audio_format = "wav"
+    else:
+        audio_content = tts_cache.get(text, TTS_MODEL, TTS_VOICE, audio_format)
+
+        # Use OpenAI TTS only
+        if audio_content is None and OPENAI_AVAILABLE and openai_client and OPENAI_API_KEY:
+            try:
+                response = openai_client.audio.speech.create(
+                    model=TTS_MODEL,
+                    voice=TTS_VOICE,
+                    input=text,
+                    response_format=audio_format
+                )
+                audio_content = response.content
+                tts_cache.put(text, TTS_MODEL, TTS_VOICE, audio_format, audio_content)
+            except Exception as openai_error:
+                return None
+
     # If TTS service fails, return None for text-only mode
-    return None
+    if not audio_content:
+        return None
+    if return_bytes:
+        return audio_content
+    audio_base64 = base64.b64encode(audio_content).decode("utf-8")
+    return f"data:{TTS_FORMAT_MIME[audio_format]};base64,{audio_base64}"
+
+
+async def agroq_text_to_speech(text: str, return_bytes=False, audio_format="wav"):
+    """
+    Async version of groq_text_to_speech() built on the AsyncOpenAI client.
+    """
+    if TTS_BACKEND == "vits":
+        audio_content = await alocal_text_to_speech(text, audio_format)
+        audio_format = "wav"
+    else:
+        audio_content = tts_cache.get(text, TTS_MODEL, TTS_VOICE, audio_format)
+
+        if audio_content is None and OPENAI_AVAILABLE and async_openai_client and OPENAI_API_KEY:
+            try:
+                response = await async_openai_client.audio.speech.create(
+                    model=TTS_MODEL,
+                    voice=TTS_VOICE,
+                    input=text,
+                    response_format=audio_format
+                )
+                audio_content = response.content
+                tts_cache.put(text, TTS_MODEL, TTS_VOICE, audio_format, audio_content)
+            except Exception as openai_error:
+                return None
+
+    if not audio_content:
+        return None
+    if return_bytes:
+        return audio_content
+    audio_base64 = base64.b64encode(audio_content).decode("utf-8")
+    return f"data:{TTS_FORMAT_MIME[audio_format]};base64,{audio_base64}"
+
+
+def stream_text_to_speech(text: str, chunk_size=TTS_STREAM_CHUNK_BYTES):
+    """
+    Stream OpenAI TTS as raw PCM (24 kHz, 16-bit mono) chunks while it is being synthesized.
+    Yields bytes; yields nothing if TTS is unavailable or fails before the first chunk.
+    Cached utterances are replayed from the TTS cache in the same chunk size.
+    The local VITS backend synthesizes the whole utterance in one pass, then sends it in chunks.
+    """
+    if TTS_BACKEND == "vits":
+        cached = local_text_to_speech(text, "pcm") or b""
+    else:
+        cached = tts_cache.get(text, TTS_MODEL, TTS_VOICE, "pcm")
+    if cached is not None:
+        for offset in range(0, len(cached), chunk_size):
+            yield cached[offset:offset + chunk_size]
+        return
+
+    if not (OPENAI_AVAILABLE and openai_client and OPENAI_API_KEY):
+        return
+    chunks = []
+    try:
+        with openai_client.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL,
+            voice=TTS_VOICE,
+            input=text,
+            response_format="pcm"
+        ) as response:
+            for chunk in response.iter_bytes(chunk_size):
+                chunks.append(chunk)
+                yield chunk
+    except Exception as openai_error:
+        print(f"[TTS] Streaming TTS failed: {openai_error}")
+        return
+    # Only complete utterances are cached
+    tts_cache.put(text, TTS_MODEL, TTS_VOICE, "pcm", b"".join(chunks))
+
+
+async def astream_text_to_speech(text: str, chunk_size=TTS_STREAM_CHUNK_BYTES):
+    """
+    Async version of stream_text_to_speech() built on the AsyncOpenAI client.
+    """
+    if TTS_BACKEND == "vits":
+        cached = await alocal_text_to_speech(text, "pcm") or b""
+    else:
+        cached = tts_cache.get(text, TTS_MODEL, TTS_VOICE, "pcm")
+    if cached is not None:
+        for offset in range(0, len(cached), chunk_size):
+            yield cached[offset:offset + chunk_size]
+        return
+
+    if not (OPENAI_AVAILABLE and async_openai_client and OPENAI_API_KEY):
+        return
+    chunks = []
+    try:
+        async with async_openai_client.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL,
+            voice=TTS_VOICE,
+            input=text,
+            response_format="pcm"
+        ) as response:
+            async for chunk in response.iter_bytes(chunk_size):
+                chunks.append(chunk)
+                yield chunk
+    except Exception as openai_error:
+        print(f"[TTS] Streaming TTS failed: {openai_error}")
+        return
+    tts_cache.put(text, TTS_MODEL, TTS_VOICE, "pcm", b"".join(chunks))
+
+
+def prewarm_tts_cache(phrases, audio_formats=None):
+    """
+    Synthesize every phrase/format pair that is not cached yet, so sessions never pay a
+    TTS round trip for the bot's fixed phrases. Returns the number of phrases synthesized.
+    audio_formats defaults to every format a session may negotiate, plus pcm when streaming.
+    """
+    if TTS_BACKEND == "vits":
+        return prewarm_local_tts_cache(phrases, audio_formats)
+    if audio_formats is None:
+        audio_formats = list(TTS_FORMAT_PREFERENCE) if TTS_AUDIO_FORMAT == "auto" else [TTS_AUDIO_FORMAT]
+        if TTS_STREAMING:
+            audio_formats.append("pcm")
+
+    synthesized = 0
+    for audio_format in audio_formats:
+        for text in phrases:
+            if tts_cache.contains(text, TTS_MODEL, TTS_VOICE, audio_format):
+                continue
+            if audio_format == "pcm":
+                for _ in stream_text_to_speech(text):
+                    pass
+            else:
+                groq_text_to_speech(text, return_bytes=True, audio_format=audio_format)
+            if not tts_cache.contains(text, TTS_MODEL, TTS_VOICE, audio_format):
+                print(f"[TTS CACHE] Pre-warm stopped: TTS unavailable")
+                return synthesized
+            synthesized += 1
+    print(f"[TTS CACHE] Pre-warm done: {synthesized} phrases synthesized, "
+          f"{len(phrases) * len(audio_formats) - synthesized} already cached")
+    return synthesized
 
 
 def groq_speech_to_text(audio_input) -> str:
@@ -0,0 +1,240 @@
+"""
+Local text-to-speech on the VITS SpeechModel (TTS_BACKEND=vits): no API call per utterance.
+
+Every session in the process submits to one VitsBatcher. Its thread collects the utterances that arrive
+within VITS_BATCH_WAIT_MS of the oldest waiting one (up to VITS_BATCH_SIZE, texts of similar length only,
+since the shorter ones are padded to the longest), synthesizes them in one forward pass and encodes each in
+memory as WAV, or as 24 kHz PCM for streaming. Synthesized audio goes through the TTS cache like OpenAI TTS
+output. vits_batcher.stats() reports queue depth, the batch size histogram and p50/p99 utterance latency.
+"""
+
+import asyncio
+import io
+import math
+import queue
+import threading
+import time
+import wave
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+from config import (TTS_STREAM_SAMPLE_RATE, TTS_STREAMING, VITS_BATCH_SIZE, VITS_BATCH_WAIT_MS,
+                    VITS_BATCH_LENGTH_RATIO, VITS_LATENCY_WINDOW)
+from speech.speech_model import speech_model
+from speech.tts_cache import tts_cache
+
+LOCAL_FORMATS = ("wav", "pcm")
+
+
+def to_int16(waveform):
+    return (np.clip(waveform, -1.0, 1.0) * 32767).astype("<i2")
+
+
+def encode_wav(waveform, sampling_rate):
+    """16-bit mono WAV bytes"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sampling_rate)
+        wav.writeframes(to_int16(waveform).tobytes())
+    return buffer.getvalue()
+
+
+def encode_pcm(waveform, sampling_rate):
+    """Raw 16-bit little-endian PCM, resampled to TTS_STREAM_SAMPLE_RATE like OpenAI's pcm output"""
+    if sampling_rate != TTS_STREAM_SAMPLE_RATE and len(waveform):
+        duration = len(waveform) / sampling_rate
+        target = np.arange(round(duration * TTS_STREAM_SAMPLE_RATE)) / TTS_STREAM_SAMPLE_RATE
+        waveform = np.interp(target, np.arange(len(waveform)) / sampling_rate, waveform)
+    return to_int16(waveform).tobytes()
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[int((len(ordered) - 1) * percent / 100)] if ordered else None
+
+
+class VitsBatcher:
+    """Queue of pending utterances, synthesized in batches on one background thread."""
+
+    def __init__(self, model=speech_model, batch_size=VITS_BATCH_SIZE, wait_ms=VITS_BATCH_WAIT_MS,
+                 length_ratio=VITS_BATCH_LENGTH_RATIO, latency_window=VITS_LATENCY_WINDOW):
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.wait = wait_ms / 1000
+        self.length_ratio = length_ratio
+        self.requests = queue.Queue()  # (text, future, submitted at)
+        self.held = []  # Requests left out of the previous batch, oldest first, ahead of the queue for the next one
+        self.thread = None
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.utterances = 0
+        self.failures = 0
+        self.batch_sizes = {}  # Batch size -> number of batches
+        self.latencies = deque(maxlen=latency_window)  # Seconds from submit() to the waveform
+        self.max_queue_depth = 0
+        self.synthesis_seconds = 0.0
+        self.audio_seconds = 0.0
+
+    def queue_depth(self):
+        """Utterances waiting for a batch"""
+        return self.requests.qsize() + len(self.held)
+
+    def submit(self, text):
+        """Future of the float32 waveform for text"""
+        future = Future()
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True, name="vits-batcher")
+                self.thread.start()
+        self.requests.put((text, future, time.perf_counter()))
+        with self.lock:
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth())
+        return future
+
+    def next_batch(self):
+        """
+        The oldest waiting request and up to batch_size - 1 others of similar length. Waits for more to arrive
+        until the oldest has waited self.wait; requests outside its length bucket stay queued for the next batch.
+        """
+        pending = self.held or [self.requests.get()]
+        self.held = []
+        deadline = pending[0][2] + self.wait
+        while self.batch_size > 1 and len(pending) < self.batch_size * 2:
+            try:
+                pending.append(self.requests.get(timeout=max(0.0, deadline - time.perf_counter())))
+            except queue.Empty:
+                break
+        # Anchored on the oldest request, so a long utterance isn't starved by a stream of short ones
+        anchor = max(1, len(pending[0][0]))
+        shortest = longest = anchor
+        batch = [pending[0]]
+        for request in sorted(pending[1:], key=lambda request: abs(math.log(max(1, len(request[0])) / anchor))):
+            length = max(1, len(request[0]))
+            if len(batch) < self.batch_size and max(longest, length) <= min(shortest, length) * self.length_ratio:
+                batch.append(request)
+                shortest, longest = min(shortest, length), max(longest, length)
+            else:
+                self.held.append(request)
+        self.held.sort(key=lambda request: request[2])
+        return batch
+
+    def run(self):
+        while True:
+            self.synthesize(self.next_batch())
+
+    def synthesize(self, batch):
+        started = time.perf_counter()
+        try:
+            waveforms = self.model.synthesize_batch([text for text, _, _ in batch])
+            sampling_rate = self.model.sampling_rate
+        except Exception as e:
+            print(f"[VITS] Synthesis failed: {e}")
+            with self.lock:
+                self.failures += len(batch)
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        finished = time.perf_counter()
+        seconds = finished - started
+        audio_seconds = sum(len(waveform) for waveform in waveforms) / sampling_rate
+        with self.lock:
+            self.batches += 1
+            self.utterances += len(batch)
+            self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+            self.latencies.extend(finished - submitted for _, _, submitted in batch)
+            self.synthesis_seconds += seconds
+            self.audio_seconds += audio_seconds
+        print(f"[VITS] {len(batch)} utterance(s), {audio_seconds:.1f} s of audio in {seconds * 1000:.0f} ms "
+              f"(RTF {seconds / max(audio_seconds, 1e-6):.2f}), {self.queue_depth()} queued")
+        for (_, future, _), waveform in zip(batch, waveforms):
+            future.set_result(waveform)
+
+    def stats(self):
+        with self.lock:
+            p50, p99 = percentile(self.latencies, 50), percentile(self.latencies, 99)
+            return {
+                "batches": self.batches,
+                "utterances": self.utterances,
+                "failures": self.failures,
+                "queue_depth": self.queue_depth(),
+                "max_queue_depth": self.max_queue_depth,
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "mean_batch": round(self.utterances / self.batches, 2) if self.batches else None,
+                "p50_ms": round(p50 * 1000) if p50 is not None else None,
+                "p99_ms": round(p99 * 1000) if p99 is not None else None,
+                "real_time_factor": round(self.synthesis_seconds / self.audio_seconds, 3) if self.audio_seconds else None
+            }
+
+
+vits_batcher = VitsBatcher()
+
+
+def cache_voice():
+    """The (model, voice) local audio is cached under, apart from OpenAI TTS audio"""
+    return speech_model.model_name, f"vits-speaker-{speech_model.speaker_id}"
+
+
+def encode(waveform, audio_format):
+    sampling_rate = speech_model.sampling_rate
+    return encode_pcm(waveform, sampling_rate) if audio_format == "pcm" else encode_wav(waveform, sampling_rate)
+
+
+def local_text_to_speech(text, audio_format="wav"):
+    """Audio bytes for text in wav (or pcm) from the local model, or None if it can't synthesize"""
+    if not text or not text.strip():
+        return None
+    audio_format = audio_format if audio_format in LOCAL_FORMATS else "wav"
+    audio = tts_cache.get(text, *cache_voice(), audio_format)
+    if audio is None:
+        try:
+            audio = encode(vits_batcher.submit(text).result(), audio_format)
+        except Exception:
+            return None
+        tts_cache.put(text, *cache_voice(), audio_format, audio)
+    return audio
+
+
+async def alocal_text_to_speech(text, audio_format="wav"):
+    """Async version of local_text_to_speech(); the event loop waits on the batcher without blocking"""
+    if not text or not text.strip():
+        return None
+    audio_format = audio_format if audio_format in LOCAL_FORMATS else "wav"
+    audio = tts_cache.get(text, *cache_voice(), audio_format)
+    if audio is None:
+        try:
+            audio = encode(await asyncio.wrap_future(vits_batcher.submit(text)), audio_format)
+        except Exception:
+            return None
+        tts_cache.put(text, *cache_voice(), audio_format, audio)
+    return audio
+
+
+def prewarm_local_tts_cache(phrases, audio_formats=None):
+    """
+    prewarm_tts_cache() for the local model: every missing phrase is submitted at once, so they are
+    synthesized in batches, and each is synthesized once for all its missing formats. Returns the number
+    of phrase/format pairs stored.
+    """
+    audio_formats = [audio_format for audio_format in audio_formats or (["wav", "pcm"] if TTS_STREAMING else ["wav"])
+                     if audio_format in LOCAL_FORMATS]
+    missing = {}
+    for text in phrases:
+        formats = [audio_format for audio_format in audio_formats if not tts_cache.contains(text, *cache_voice(), audio_format)]
+        if formats:
+            missing[text] = formats
+    futures = [(text, vits_batcher.submit(text)) for text in missing]
+    synthesized = 0
+    for text, future in futures:
+        try:
+            waveform = future.result()
+        except Exception as e:
+            print(f"[TTS CACHE] Pre-warm stopped: local TTS unavailable ({e})")
+            return synthesized
+        for audio_format in missing[text]:
+            tts_cache.put(text, *cache_voice(), audio_format, encode(waveform, audio_format))
+            synthesized += 1
+    print(f"[TTS CACHE] Pre-warm done: {synthesized} phrases synthesized locally, "
+          f"{len(phrases) * len(audio_formats) - synthesized} already cached")
+    return synthesized
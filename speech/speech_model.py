@@ -1,34 +1,143 @@
 import os
-import torch
-from transformers import VitsTokenizer, VitsModel, set_seed
-from config import VITS_DIR, DEFAULT_VITS_MODEL, VITS_VOICES
+import threading
+from config import VITS_DIR, DEFAULT_VITS_MODEL, VITS_VOICES, VITS_TORCH_THREADS, VITS_QUANTIZE
+
+EXPORTED_WEIGHTS = "inference_model.pt"
+
+
+def strip_for_inference(model):
+    """Drop the posterior encoder (only used in training) and fold weight norm into plain conv weights"""
+    from torch.nn.utils import parametrize
+
+    model.posterior_encoder = None
+    for module in model.modules():
+        if parametrize.is_parametrized(module):
+            for name in list(module.parametrizations.keys()):
+                parametrize.remove_parametrizations(module, name, leave_parametrized=True)
+    return model
+
 
 class SpeechModel:
-    def __init__(self, model_name=DEFAULT_VITS_MODEL, speaker_id=None):
-        """Initialize the VITS model, downloading if necessary."""
+    """
+    Local VITS text-to-speech. torch, transformers and the model weights are loaded on the first
+    synthesis, not at import: unless TTS_BACKEND=vits the bot speaks through OpenAI TTS and never needs them.
+    The inference-only copy written by export() is loaded in preference to the Hugging Face checkpoint, memory-mapped:
+    its weights stay in the page cache, shared by every worker process instead of copied into each.
+    """
+
+    def __init__(self, model_name=DEFAULT_VITS_MODEL, speaker_id=None, model_path=None, quantize=VITS_QUANTIZE,
+                 mmap_weights=True):
         self.model_name = model_name
         self.speaker_id = speaker_id  # Add speaker selection support
-        self.model_path = os.path.join(VITS_DIR, model_name.replace("/", "_"))  # Store model in VITS_DIR
-        
-        # Download and load the model if not already available
-        self.tokenizer = VitsTokenizer.from_pretrained(model_name, cache_dir=VITS_DIR)
-        self.model = VitsModel.from_pretrained(model_name, cache_dir=VITS_DIR)
+        self.model_path = model_path or os.path.join(VITS_DIR, model_name.replace("/", "_"))  # Store model in VITS_DIR
+        self.quantize = quantize
+        self.mmap_weights = mmap_weights
+        self.tokenizer = None
+        self.model = None
+        self.load_error = None  # Set when loading failed, so later calls fail fast instead of retrying the download
+        self.load_lock = threading.Lock()
 
-    def text_to_speech(self, text, output_path="output.wav"):
-        """Convert text to speech and save as a .wav file."""
-        inputs = self.tokenizer(text=text, return_tensors="pt")
+    def load(self):
+        """Load the VITS model once, downloading it if necessary. Raises if it can't be loaded."""
+        if self.model is not None:
+            return
+        with self.load_lock:
+            if self.model is not None:
+                return
+            if self.load_error is not None:
+                raise self.load_error
+            try:
+                import torch
+                from transformers import VitsTokenizer, VitsModel
+
+                exported = os.path.exists(os.path.join(self.model_path, EXPORTED_WEIGHTS))
+                if exported:
+                    self.tokenizer, model = self.load_exported()
+                else:
+                    self.tokenizer = VitsTokenizer.from_pretrained(self.model_name, cache_dir=VITS_DIR)
+                    model = strip_for_inference(VitsModel.from_pretrained(self.model_name, cache_dir=VITS_DIR))
+                if self.quantize:
+                    # Weights of the Linear layers (attention, projections) in int8; the convolutions stay fp32
+                    torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+                self.model = model.eval()
+            except Exception as e:
+                self.load_error = RuntimeError(f"VITS model {self.model_name} unavailable: {e}")
+                raise self.load_error
+            # Worker processes share the CPU cores; more intra-op threads than their share only adds contention
+            torch.set_num_threads(VITS_TORCH_THREADS)
+            print(f"[VITS] Loaded {self.model_path if exported else self.model_name}"
+                  f"{' (int8 Linear)' if self.quantize else ''} ({VITS_TORCH_THREADS} torch threads)")
+            if not exported:
+                print("[VITS] Private copy of the weights in this process; "
+                      "run `python -m speech.speech_model` once so workers share one memory-mapped copy")
 
-        set_seed(555)  # Ensure deterministic output
-        with torch.no_grad():
-            outputs = self.model(**inputs, speaker_id=self.speaker_id) # Pass speaker_id
+    def load_exported(self):
+        """(tokenizer, model) from the export in self.model_path, without the Hugging Face hub or weight init"""
+        import torch
+        from transformers import VitsConfig, VitsTokenizer, VitsModel
 
-        waveform = outputs.waveform[0].numpy()
+        tokenizer = VitsTokenizer.from_pretrained(self.model_path)
+        # Built on the meta device: the saved weights are assigned directly instead of overwriting random ones
+        with torch.device("meta"):
+            model = strip_for_inference(VitsModel(VitsConfig.from_pretrained(self.model_path)))
+        state = torch.load(os.path.join(self.model_path, EXPORTED_WEIGHTS), weights_only=True, mmap=self.mmap_weights)
+        model.load_state_dict(state, assign=True)
+        if any(tensor.is_meta for tensor in [*model.parameters(), *model.buffers()]):
+            raise RuntimeError(f"{self.model_path} is missing weights; re-run the export")
+        return tokenizer, model
+
+    def export(self):
+        """
+        Save the inference-only fp32 model (no posterior encoder, weight norm folded) with its tokenizer and
+        config to self.model_path, from the Hugging Face checkpoint. Returns the path.
+        """
+        import torch
+        from transformers import VitsTokenizer, VitsModel
+
+        tokenizer = VitsTokenizer.from_pretrained(self.model_name, cache_dir=VITS_DIR)
+        model = strip_for_inference(VitsModel.from_pretrained(self.model_name, cache_dir=VITS_DIR).eval())
+        os.makedirs(self.model_path, exist_ok=True)
+        tokenizer.save_pretrained(self.model_path)
+        model.config.save_pretrained(self.model_path)
+        # The weights file marks a complete export, so it is written last
+        temp_path = os.path.join(self.model_path, f"{EXPORTED_WEIGHTS}.{os.getpid()}.tmp")
+        torch.save(model.state_dict(), temp_path)
+        os.replace(temp_path, os.path.join(self.model_path, EXPORTED_WEIGHTS))
+        return self.model_path
+
+    @property
+    def sampling_rate(self):
+        self.load()
+        return self.model.config.sampling_rate
+
+    def synthesize_batch(self, texts):
+        """
+        Float32 waveforms for texts from one padded forward pass, each trimmed to its own length.
+        Seeded per batch, so a batch of the same texts always sounds the same.
+        """
+        self.load()
+        import torch
+
+        inputs = self.tokenizer(text=list(texts), padding=True, return_tensors="pt")
+        # Only torch's generator is seeded, and restored afterwards: the sessions sharing this process keep
+        # their own random/numpy/torch sequences (template choices, bank draws)
+        with torch.random.fork_rng(devices=[]), torch.inference_mode():
+            torch.manual_seed(555)
+            outputs = self.model(**inputs, speaker_id=self.speaker_id)
+        return [outputs.waveform[i, :length].numpy() for i, length in enumerate(outputs.sequence_lengths.tolist())]
+
+    def text_to_speech(self, text, output_path="output.wav"):
+        """Convert text to speech and save as a .wav file."""
+        waveform = self.synthesize_batch([text])[0]
 
         # Save as .wav
         from scipy.io.wavfile import write
-        write(output_path, rate=self.model.config.sampling_rate, data=waveform)
+        write(output_path, rate=self.sampling_rate, data=waveform)
 
         print(f"Speech saved at {output_path}")
 
-# Instantiate the model once at import time
+# One instance per process; the model itself loads on first use
 speech_model = SpeechModel()
+
+if __name__ == "__main__":
+    print(f"[VITS] Exported {speech_model.model_name} to {speech_model.export()}")
@@ -0,0 +1,159 @@
+"""
+Content-addressed cache for synthesized speech.
+
+Entries are keyed by sha256(model, voice, format, text). Recent entries live in an in-memory LRU;
+every entry is also written to TTS_CACHE_DIR so worker processes and restarts share it. A file's mtime
+is its last use, so disk pruning evicts the coldest entries, not the oldest writes.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from config import TTS_CACHE_DIR, TTS_CACHE_MAX_MEMORY_ENTRIES, TTS_CACHE_MAX_DISK_ENTRIES
+
+
+class TTSCache:
+    """In-memory LRU backed by a directory of audio files, with hit/miss counters."""
+
+    TOUCH_INTERVAL = 600
+
+    def __init__(self, directory=TTS_CACHE_DIR, max_memory_entries=TTS_CACHE_MAX_MEMORY_ENTRIES,
+                 max_disk_entries=TTS_CACHE_MAX_DISK_ENTRIES):
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.memory = OrderedDict()  # key -> audio bytes, least recently used first
+        self.lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes_since_prune = 0
+        self.touched = {}  # key -> when its file's mtime was last bumped, for entries in memory
+
+    @staticmethod
+    def key(text, model, voice, audio_format):
+        return hashlib.sha256(f"{model}\0{voice}\0{audio_format}\0{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _remember(self, key, audio):
+        # Caller holds self.lock
+        self.memory[key] = audio
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            evicted, _ = self.memory.popitem(last=False)
+            self.touched.pop(evicted, None)
+
+    def _touch(self, key, force=False):
+        """Mark the entry's file as used. Memory hits bump it at most every TOUCH_INTERVAL seconds."""
+        now = time.time()
+        with self.lock:
+            if not force and now - self.touched.get(key, 0) < self.TOUCH_INTERVAL:
+                return
+            if key in self.memory:
+                self.touched[key] = now
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, text, model, voice, audio_format):
+        """Return cached audio bytes, or None on a miss."""
+        key = self.key(text, model, voice, audio_format)
+        with self.lock:
+            audio = self.memory.get(key)
+            if audio is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+        if audio is not None:
+            self._touch(key)
+            return audio
+
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+        except OSError:
+            audio = None
+
+        if audio:
+            self._touch(key, force=True)
+        with self.lock:
+            if audio:
+                self.disk_hits += 1
+                self._remember(key, audio)
+                return audio
+            self.misses += 1
+            return None
+
+    def put(self, text, model, voice, audio_format, audio):
+        """Store audio in memory and on disk. Disk errors only cost persistence."""
+        if not audio:
+            return
+        key = self.key(text, model, voice, audio_format)
+        with self.lock:
+            self._remember(key, audio)
+            self.writes_since_prune += 1
+            prune = self.writes_since_prune >= 100
+            if prune:
+                self.writes_since_prune = 0
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write-then-rename so concurrent workers never read a partial file
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(audio)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"[TTS CACHE] Failed to write {path}: {e}")
+        if prune:
+            self.prune_disk()
+
+    def contains(self, text, model, voice, audio_format):
+        """
+        True if the entry is cached, without counting a hit or miss. Counts as a use for pruning:
+        pre-warm checks its canned phrases this way, and they are among the hottest entries.
+        """
+        key = self.key(text, model, voice, audio_format)
+        with self.lock:
+            in_memory = key in self.memory
+        if in_memory or os.path.exists(self._path(key)):
+            self._touch(key, force=not in_memory)
+            return True
+        return False
+
+    def prune_disk(self):
+        """Delete the least recently used files beyond max_disk_entries."""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    files.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.max_disk_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory)
+            }
+
+
+tts_cache = TTSCache()
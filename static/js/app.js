@@ -276,6 +276,74 @@ function playAudioFromBase64(audioBase64, mimeType = 'audio/wav') {
     });
 }
 
+// -------------------------
+// Codec negotiation
+// -------------------------
+// TTS formats the server may send, matched to TTS_FORMAT_MIME in config.py
+const TTS_FORMAT_MIME = {
+    opus: 'audio/ogg; codecs=opus',
+    mp3: 'audio/mpeg',
+    aac: 'audio/aac',
+    wav: 'audio/wav'
+};
+
+function getSupportedAudioFormats() {
+    const probe = document.createElement('audio');
+    return Object.keys(TTS_FORMAT_MIME).filter(format => probe.canPlayType(TTS_FORMAT_MIME[format]) !== '');
+}
+
+// -------------------------
+// Play audio from binary frame
+// -------------------------
+function playAudioFromBytes(audioBytes, mimeType = 'audio/wav') {
+    return new Promise((resolve, reject) => {
+        console.log('[CLIENT] playAudioFromBytes called, bytes:', audioBytes.byteLength);
+        const finish = () => {
+            isBotSpeaking = false;
+            socket.emit('bot_audio_ended', { session_id: sessionId });
+            resolve();
+        };
+        const playWithElement = () => {
+            // Blob URL instead of a data URL: no base64 round trip
+            const url = URL.createObjectURL(new Blob([audioBytes], { type: mimeType }));
+            const audio = new Audio(url);
+            audio.onended = () => {
+                URL.revokeObjectURL(url);
+                finish();
+            };
+            audio.onerror = (e) => {
+                console.error('[CLIENT] HTML5 audio error', e);
+                URL.revokeObjectURL(url);
+                reject(e);
+            };
+            audio.play().catch(err => {
+                console.error('[CLIENT] HTML5 play() failed', err);
+                URL.revokeObjectURL(url);
+                reject(err);
+            });
+        };
+
+        if (!audioContext || audioContext.state !== 'running') {
+            playWithElement();
+            return;
+        }
+        // decodeAudioData detaches its input, keep the original for the fallback
+        audioContext.decodeAudioData(audioBytes.slice(0),
+            (buffer) => {
+                const src = audioContext.createBufferSource();
+                src.buffer = buffer;
+                src.connect(audioContext.destination);
+                src.onended = finish;
+                src.start(0);
+            },
+            (err) => {
+                console.error('[CLIENT] decodeAudioData error, falling back', err);
+                playWithElement();
+            }
+        );
+    });
+}
+
 // -------------------------
 // Audio queue management
 // -------------------------
@@ -286,6 +354,13 @@ async function queueAndPlayAudio(audioBase64, mimeType) {
     }
 }
 
+async function queueAndPlayAudioBytes(audioBytes, mimeType) {
+    audioQueue.push({ audioBytes, mimeType });
+    if (!isPlayingAudio) {
+        await playNextAudio();
+    }
+}
+
 async function playNextAudio() {
     if (audioQueue.length === 0) {
         isPlayingAudio = false;
@@ -293,15 +368,173 @@ async function playNextAudio() {
         return;
     }
     isPlayingAudio = true;
-    const { audioBase64, mimeType } = audioQueue.shift();
+    const { audioBase64, audioBytes, mimeType } = audioQueue.shift();
     try {
-        await playAudioFromBase64(audioBase64, mimeType);
+        if (audioBytes) {
+            await playAudioFromBytes(audioBytes, mimeType);
+        } else {
+            await playAudioFromBase64(audioBase64, mimeType);
+        }
     } catch (err) {
         console.error('[CLIENT] queue audio error', err);
     }
     await playNextAudio();
 }
 
+socket.on('play_audio_binary', (data) => {
+    if (data.session_id && data.session_id !== sessionId) {
+        return;
+    }
+    if (data.audio && data.audio.byteLength > 0) {
+        isBotSpeaking = true;
+        if (recognition && isListening) {
+            shouldStopRecording = true;
+            recognition.stop();
+        }
+        queueAndPlayAudioBytes(data.audio, data.mime);
+    } else {
+        console.error('[CLIENT] Binary audio frame is empty');
+    }
+});
+
+// -------------------------
+// Streamed audio (PCM chunks)
+// -------------------------
+const audioStreams = {};  // stream_id -> playback state
+
+function getAudioStream(streamId, sampleRate) {
+    if (!audioStreams[streamId]) {
+        audioStreams[streamId] = {
+            id: streamId,
+            sampleRate: sampleRate || 24000,
+            nextSeq: 0,
+            pending: {},         // out-of-order chunks by seq
+            received: [],        // in-order chunks, kept for the HTML5 fallback
+            totalChunks: null,   // set by audio_stream_end
+            playAt: 0,
+            activeSources: 0,
+            useWebAudio: !!audioContext && audioContext.state === 'running'
+        };
+    }
+    return audioStreams[streamId];
+}
+
+function schedulePcmChunk(stream, chunk) {
+    // 16-bit signed little-endian mono -> Float32 AudioBuffer
+    const samples = new Int16Array(chunk.slice(0, chunk.byteLength - (chunk.byteLength % 2)));
+    const buffer = audioContext.createBuffer(1, samples.length, stream.sampleRate);
+    const channel = buffer.getChannelData(0);
+    for (let i = 0; i < samples.length; i++) {
+        channel[i] = samples[i] / 32768;
+    }
+    const src = audioContext.createBufferSource();
+    src.buffer = buffer;
+    src.connect(audioContext.destination);
+    // Small lead on the first chunk absorbs network jitter; later chunks are scheduled back to back
+    stream.playAt = Math.max(stream.playAt, audioContext.currentTime + 0.05);
+    src.start(stream.playAt);
+    stream.playAt += buffer.duration;
+    stream.activeSources += 1;
+    src.onended = () => {
+        stream.activeSources -= 1;
+        finishAudioStreamIfDone(stream);
+    };
+}
+
+function pcmToWavBlob(chunks, sampleRate) {
+    const dataLength = chunks.reduce((sum, c) => sum + c.byteLength, 0);
+    const view = new DataView(new ArrayBuffer(44));
+    const writeString = (offset, s) => { for (let i = 0; i < s.length; i++) view.setUint8(offset + i, s.charCodeAt(i)); };
+    writeString(0, 'RIFF');
+    view.setUint32(4, 36 + dataLength, true);
+    writeString(8, 'WAVE');
+    writeString(12, 'fmt ');
+    view.setUint32(16, 16, true);
+    view.setUint16(20, 1, true);               // PCM
+    view.setUint16(22, 1, true);               // mono
+    view.setUint32(24, sampleRate, true);
+    view.setUint32(28, sampleRate * 2, true);  // byte rate
+    view.setUint16(32, 2, true);               // block align
+    view.setUint16(34, 16, true);              // bits per sample
+    writeString(36, 'data');
+    view.setUint32(40, dataLength, true);
+    return new Blob([view.buffer, ...chunks], { type: 'audio/wav' });
+}
+
+function finishAudioStream(stream) {
+    delete audioStreams[stream.id];
+    isBotSpeaking = false;
+    socket.emit('bot_audio_ended', { session_id: sessionId });
+}
+
+function finishAudioStreamIfDone(stream) {
+    if (stream.totalChunks === null || stream.nextSeq < stream.totalChunks) {
+        return;
+    }
+    if (stream.useWebAudio) {
+        if (stream.activeSources === 0) {
+            console.log('[CLIENT] Audio stream finished playing:', stream.id);
+            finishAudioStream(stream);
+        }
+        return;
+    }
+    // No running AudioContext (e.g. Safari before a user gesture): play the whole utterance as WAV
+    if (!stream.fallbackStarted) {
+        stream.fallbackStarted = true;
+        const url = URL.createObjectURL(pcmToWavBlob(stream.received, stream.sampleRate));
+        const audio = new Audio(url);
+        audio.onended = audio.onerror = () => {
+            URL.revokeObjectURL(url);
+            finishAudioStream(stream);
+        };
+        audio.play().catch(err => {
+            console.error('[CLIENT] HTML5 play() failed for audio stream', err);
+            URL.revokeObjectURL(url);
+            finishAudioStream(stream);
+        });
+    }
+}
+
+socket.on('audio_chunk', (data) => {
+    if (data.session_id && data.session_id !== sessionId) {
+        return;
+    }
+    const stream = getAudioStream(data.stream_id, data.sample_rate);
+    if (data.seq === 0) {
+        isBotSpeaking = true;
+        if (recognition && isListening) {
+            shouldStopRecording = true;
+            recognition.stop();
+        }
+    }
+    stream.pending[data.seq] = data.audio;
+    // Play strictly in sequence order
+    while (stream.pending[stream.nextSeq] !== undefined) {
+        const chunk = stream.pending[stream.nextSeq];
+        delete stream.pending[stream.nextSeq];
+        stream.received.push(chunk);
+        if (stream.useWebAudio) {
+            schedulePcmChunk(stream, chunk);
+        }
+        stream.nextSeq += 1;
+    }
+    finishAudioStreamIfDone(stream);
+});
+
+socket.on('audio_stream_end', (data) => {
+    if (data.session_id && data.session_id !== sessionId) {
+        return;
+    }
+    const stream = audioStreams[data.stream_id];
+    if (!stream) {
+        // Nothing arrived for this stream - don't leave the bot waiting
+        socket.emit('bot_audio_ended', { session_id: sessionId });
+        return;
+    }
+    stream.totalChunks = data.chunks;
+    finishAudioStreamIfDone(stream);
+});
+
 // -------------------------
 // Speech recognition
 // -------------------------
@@ -641,7 +874,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify({ character: character })
+                body: JSON.stringify({ character: character, audio_formats: getSupportedAudioFormats() })
             })
             .then(response => response.json())
             .then(data => {
@@ -858,7 +1091,7 @@ window.addEventListener('beforeunload', () => {
             fetch('/start-session', {
                 method:'POST',
                 headers:{ 'Content-Type':'application/json' },
-                body: JSON.stringify({ character:char })
+                body: JSON.stringify({ character:char, audio_formats: getSupportedAudioFormats() })
             })
             .then(r=>r.json())
             .then(data=>{
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Emotion Lexicon Test Script
+Checks the local emotion classifier on negation, intensity and ambiguous utterances
+"""
+
+from bot.emotion_detector import lexicon_emotion, lexicon_emotion_scores, detect_emotion, VALID_EMOTIONS
+
+def test_emotion_lexicon():
+    print("🎭 Testing emotion lexicon...")
+    print("=" * 40)
+
+    cases = [
+        ("I am feeling really good and the activities have been fantastic", "happy"),
+        ("I was kinda nervous but everyone is really nice", "happy"),
+        ("I am not worried about it anymore", "calm"),
+        ("I am not happy with how that went", "sad"),
+        ("No, I am happy with it", "happy"),  # The negation belongs to the previous clause
+        ("I can't wait for the robotics workshop", "excited"),
+        ("I got confused when everyone was talking over each other", "confused"),
+        ("I am grateful for the time to reflect", "grateful"),
+        ("Yes that is correct", "neutral"),
+    ]
+    for text, expected in cases:
+        emotion, _ = lexicon_emotion(text)
+        print(f"   {emotion:10s} {text}")
+        assert emotion == expected, (text, emotion, expected)
+
+    # Intensifiers scale the cue they precede, "kind of" included
+    assert lexicon_emotion_scores("It was kind of sad") == {"sad": 0.7}
+    assert lexicon_emotion_scores("It was really sad") == {"sad": 1.5}
+
+    # Two equally strong cues, or a long utterance with none, are left to the LLM in hybrid mode
+    assert lexicon_emotion("I am happy but also sad")[1]
+    assert lexicon_emotion("We went to the workshop after lunch and talked about projects")[1]
+    assert not lexicon_emotion("Yes that is correct")[1]
+
+    # The lexicon backend never leaves the process
+    assert detect_emotion("I am so stressed about my exam", backend="lexicon") == "anxious"
+    assert all(lexicon_emotion(text)[0] in VALID_EMOTIONS for text, _ in cases)
+    print("✅ Emotion lexicon test passed!")
+
+if __name__ == "__main__":
+    test_emotion_lexicon()
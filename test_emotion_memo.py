@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Emotion Memo Test Script
+Checks that each user utterance is classified once per session, whoever asks for it
+"""
+
+import bot.conversation_bot as conversation_bot
+from bot.conversation_bot import ConversationBot
+
+class FakeSio:
+    connected = True
+
+    def emit(self, *args, **kwargs):
+        pass
+
+def test_emotion_memo():
+    print("🎭 Testing emotion memo...")
+    print("=" * 40)
+
+    calls = []
+    original = conversation_bot.detect_emotion
+    conversation_bot.detect_emotion = lambda text: calls.append(text) or "anxious"
+    try:
+        bot = ConversationBot(character_type="neutral", session_id="memo-test", sio=FakeSio())
+
+        # on_user_input records the history entry, listener_mode asks again for the same reply
+        bot.waiting_for_user_input = True
+        bot.on_user_input({"text": "I am worried about my exam", "session_id": "memo-test"})
+        emotion, _ = bot.user_emotion("I am worried about my exam").result(timeout=5)
+        assert emotion == "anxious"
+        assert bot.conversation_history[-1]["emotion"] == "anxious"
+
+        # Case and whitespace differences hit the same entry
+        bot.user_emotion("  i am WORRIED about   my exam ").result(timeout=5)
+        # A different utterance is classified
+        bot.user_emotion("yes").result(timeout=5)
+
+        print(f"   LLM calls: {len(calls)}, avoided: {bot.emotion_calls_avoided}")
+        assert len(calls) == 2
+        assert bot.emotion_calls_avoided == 2
+        assert bot.latency_report()["emotion_calls_avoided"] == 2
+    finally:
+        conversation_bot.detect_emotion = original
+    print("✅ Emotion memo test passed!")
+
+if __name__ == "__main__":
+    test_emotion_memo()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+I-Statement Bank Test Script
+Checks deduplication, validation, per-session exclusion and sharing the bank between processes
+"""
+
+import tempfile
+import time
+import speech.groq_stt_tts as groq_stt_tts
+from bot.i_statement_bank import IStatementBank, is_valid_i_statement
+
+DEFAULT = "I feel that open communication is important."
+
+def test_i_statement_bank():
+    print("🏦 Testing I-statement bank...")
+    print("=" * 40)
+
+    directory = tempfile.mkdtemp()
+    bank = IStatementBank(directory=directory, target_size=3, refill_batch=4)
+
+    assert bank.deck("neutral").draw() is None
+    assert bank.add("neutral", ["I feel calm when my mornings start slowly.", "i feel calm when my mornings start slowly"]) == 1
+
+    # Refill keeps only valid, new statements and synthesizes their audio before banking them
+    generated = iter([
+        "I feel calm when my mornings start slowly.",  # Duplicate
+        "Why do we argue?",  # Not an I-statement
+        DEFAULT,  # The fallback, never banked
+        "I think small thank-yous make a long day lighter.",
+    ])
+    synthesized = []
+    original_prewarm = groq_stt_tts.prewarm_tts_cache
+    groq_stt_tts.prewarm_tts_cache = lambda phrases, audio_formats=None: synthesized.extend(phrases) or len(phrases)
+    try:
+        assert bank.refill("neutral", lambda: next(generated), DEFAULT) == 1
+    finally:
+        groq_stt_tts.prewarm_tts_cache = original_prewarm
+    assert synthesized == ['"I think small thank-yous make a long day lighter."']
+    assert bank.size("neutral") == 2
+
+    # A session does not hear the same statement twice, and its deck picks up statements banked later
+    deck = bank.deck("neutral")
+    first, second = deck.draw(), deck.draw()
+    assert {first, second} == set(bank.statements("neutral"))
+    assert deck.draw() is None
+    bank.add("neutral", ["I believe quiet evenings help me reset."])
+    assert deck.draw() == "I believe quiet evenings help me reset."
+
+    # Another process sees the bank, and picks up later additions once its reload interval has passed
+    other = IStatementBank(directory=directory, target_size=3, reload_interval=0.05)
+    assert other.size("neutral") == 3
+    assert other.size("optimistic") == 0
+    bank.add("neutral", ["I feel grateful for friends who check in."])
+    assert other.size("neutral") == 3
+    time.sleep(0.06)
+    assert other.size("neutral") == 4
+    assert not other.refill_async("neutral", lambda: DEFAULT)  # Already at target_size
+
+    assert is_valid_i_statement("I believe rest matters.")
+    assert not is_valid_i_statement("You should rest more.")
+    print("✅ I-statement bank test passed!")
+
+if __name__ == "__main__":
+    test_i_statement_bank()
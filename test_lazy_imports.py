@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Lazy Import Test Script
+Checks that the web server, the bot process and the speech package start without importing torch or transformers,
+and the web server without the bot stack
+"""
+
+import os
+import subprocess
+import sys
+
+def test_lazy_imports():
+    print("📦 Testing lazy model imports...")
+    print("=" * 40)
+
+    for module in ["app", "main", "speech.speech_model"]:
+        # A fresh interpreter, so modules imported by other tests don't count
+        probe = f"import sys, {module}; print('torch' in sys.modules, 'transformers' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        print(f"   {module}: torch, transformers loaded = {result.stdout.split()[-2:]}")
+        assert result.stdout.split()[-2:] == ["False", "False"]
+
+    # The web server needs neither the bot stack nor an LLM API key
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    probe = "import sys, app; print('bot.conversation_bot' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split()[-1] == "False"
+
+    # Workers start the paraphrase model load at startup; with the default concept scorer nothing is loaded
+    probe = ("import os, sys; os.environ.pop('PARAPHRASE_SCORER', None); from bot.paraphrase_scorer import paraphrase_scorer; "
+             "paraphrase_scorer.load_in_background(); print(paraphrase_scorer.loader is None, 'torch' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split()[-2:] == ["True", "False"]
+
+    from speech.speech_model import speech_model
+    assert speech_model.model is None  # Loaded by the first text_to_speech() call
+    print("✅ Lazy import test passed!")
+
+if __name__ == "__main__":
+    test_lazy_imports()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+LLM Multi-Task Test Script
+Checks that emotion and paraphrase for one reply share a single LLM call, and the fallback to separate calls
+"""
+
+import asyncio
+import tempfile
+import bot.emotion_detector as emotion_detector
+from llm.response_cache import response_cache
+from bot.conversation_bot import ConversationBot
+from bot.emotion_detector import emotion_task
+from bot.response_generator import paraphrase_task
+from llm.multi_task import run_tasks, arun_tasks, multi_task_stats, LLMTask
+
+STATEMENT = "I feel so stressed about work because my manager keeps adding deadlines"
+
+class FakeLLM:
+    """Answers the combined prompt with combined_reply and each single-task prompt on its own"""
+
+    def __init__(self, combined_reply, cached=False):
+        self.combined_reply = combined_reply
+        self.cached = cached
+        self.prompts = []
+        self.schemas = []
+
+    def cache_key(self, messages, temperature, max_tokens, cache_template):
+        if not self.cached or cache_template is None:
+            return None
+        return response_cache.key("fake", "fake", messages, temperature, max_tokens)
+
+    def generate_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None, json_schema=None):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        self.schemas.append(json_schema)
+        if prompt.startswith("Complete these tasks"):
+            return self.combined_reply
+        if "emotional tone" in prompt:
+            return "anxious"
+        return "I hear you saying that deadlines keep piling up at work"
+
+    async def agenerate_response(self, messages, temperature=0.8, max_tokens=100, cache_template=None, json_schema=None):
+        return self.generate_response(messages, temperature, max_tokens, cache_template, json_schema)
+
+def test_multi_task():
+    print("🧩 Testing multi-task LLM calls...")
+    print("=" * 40)
+
+    # One call, fields fanned out through each task's own finishing
+    llm = FakeLLM('```json\n{"emotion": "Anxious", "paraphrase": "it sounds like you feel swamped by new deadlines"}\n```')
+    before = multi_task_stats.stats()["round_trips_saved"]
+    results = run_tasks(llm, STATEMENT, [emotion_task(STATEMENT), paraphrase_task(STATEMENT)])
+    assert len(llm.prompts) == 1
+    assert results == {"emotion": "anxious", "paraphrase": "It sounds like you feel swamped by new deadlines."}
+    assert multi_task_stats.stats()["round_trips_saved"] == before + 1
+    assert multi_task_stats.stats()["prompt_tokens_saved"] > 0
+    # The combined call asks for a JSON object with one required string per task
+    assert llm.schemas[0]["required"] == ["emotion", "paraphrase"]
+
+    # A reply that isn't the JSON object falls back to one call per task
+    llm = FakeLLM("The emotion is anxious.")
+    results = asyncio.run(arun_tasks(llm, STATEMENT, [emotion_task(STATEMENT), paraphrase_task(STATEMENT)]))
+    assert len(llm.prompts) == 3
+    assert results == {"emotion": "anxious", "paraphrase": "I hear you saying that deadlines keep piling up at work."}
+    print(f"   Stats: {multi_task_stats.stats()}")
+    print("✅ Multi-task test passed!")
+
+def test_multi_task_cache():
+    print("🗃️  Testing multi-task response caching...")
+    print("=" * 40)
+
+    statement = "My roommate never cleans the kitchen and I end up doing it every night"
+    def tasks():
+        return [paraphrase_task(statement),
+                LLMTask("issue_summary", f"Summarize this topic: {statement}", "the topic in a few words",
+                        lambda response: response, cache_template="issue_summary")]
+
+    directory = response_cache.directory
+    response_cache.directory = tempfile.mkdtemp()  # Nothing from earlier runs, nothing left behind
+    try:
+        reply = '{"paraphrase": "It sounds like the kitchen chores all fall on you", "issue_summary": "sharing chores"}'
+        llm = FakeLLM(reply, cached=True)
+        first = run_tasks(llm, statement, tasks())
+        # The combined reply is reused for the same combined prompt...
+        assert run_tasks(llm, statement, tasks()) == first
+        assert len(llm.prompts) == 1
+        # ...but never answers a task's own prompt, which was written for a different reply
+        paraphrase = tasks()[0]
+        assert response_cache.get(llm.cache_key(paraphrase.messages, 0.8, 100, "paraphrase"), "paraphrase") is None
+
+        # A combined reply that does not parse is not cached
+        statement = "I keep putting off calling my sister back"
+        llm = FakeLLM("Sure! Here you go.", cached=True)
+        run_tasks(llm, statement, tasks())
+        run_tasks(llm, statement, tasks())
+        assert sum(prompt.startswith("Complete these tasks") for prompt in llm.prompts) == 2
+    finally:
+        response_cache.directory = directory
+    print("✅ Multi-task cache test passed!")
+
+def test_batched_reply():
+    print("💬 Testing batched listener reply...")
+    print("=" * 40)
+
+    backend = emotion_detector.EMOTION_BACKEND
+    emotion_detector.EMOTION_BACKEND = "llm"
+    try:
+        bot = ConversationBot(character_type="neutral", session_id="multi-task-test")
+        bot.llm_api = FakeLLM('{"emotion": "anxious", "paraphrase": "I hear you saying that work feels relentless"}')
+        bot.reply_tasks = ("paraphrase",)  # What listener_mode's listen() sets without LLM_STREAMING
+
+        emotion, _ = bot.user_emotion(STATEMENT).result(timeout=5)
+        paraphrase_future = bot.batched_reply_task("paraphrase", STATEMENT)
+        assert emotion == "anxious"
+        assert paraphrase_future.result(timeout=5)[0] == "I hear you saying that work feels relentless."
+        assert len(bot.llm_api.prompts) == 1
+        # Consumed once; a second lookup means the paraphrase is generated on its own
+        assert bot.batched_reply_task("paraphrase", STATEMENT) is None
+    finally:
+        emotion_detector.EMOTION_BACKEND = backend
+    print("✅ Batched listener reply test passed!")
+
+if __name__ == "__main__":
+    test_multi_task()
+    test_multi_task_cache()
+    test_batched_reply()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache Test Script
+Checks key normalization, TTL expiry, sharing entries on disk and per-template hit rates
+"""
+
+import tempfile
+import time
+from llm.response_cache import ResponseCache
+
+def test_llm_response_cache():
+    print("🧠 Testing LLM response cache...")
+    print("=" * 40)
+
+    directory = tempfile.mkdtemp()
+    cache = ResponseCache(directory=directory, ttl=60, max_entries=2, shared=True)
+
+    messages = [{"role": "user", "content": "Paraphrase: I feel  stressed about work"}]
+    key = cache.key("openai", "gpt-4o", messages, 0.8, 100)
+    # Case and spacing don't make a new prompt; the template parameters do
+    assert key == cache.key("openai", "gpt-4o", [{"role": "user", "content": "paraphrase: i feel stressed about work "}], 0.8, 100)
+    assert key != cache.key("openai", "gpt-4o", messages, 0.2, 100)
+    assert key != cache.key("deepseek", "deepseek-chat", messages, 0.8, 100)
+
+    assert cache.get(key, "paraphrase") is None
+    cache.put(key, "You feel stressed about work.")
+    assert cache.get(key, "paraphrase") == "You feel stressed about work."
+
+    # Another worker process reads the entry from disk
+    other = ResponseCache(directory=directory, ttl=60, shared=True)
+    assert other.get(key, "paraphrase") == "You feel stressed about work."
+    assert other.stats()["memory_entries"] == 1
+
+    # Not shared: the other process misses
+    private = ResponseCache(directory=directory, ttl=60, shared=False)
+    assert private.get(key, "paraphrase") is None
+
+    # Expired entries are regenerated
+    expiring = ResponseCache(directory=tempfile.mkdtemp(), ttl=0.05, shared=True)
+    expiring.put(key, "old")
+    time.sleep(0.1)
+    assert expiring.get(key, "paraphrase") is None
+
+    stats = cache.stats()
+    print(f"   Stats: {stats}")
+    assert stats["templates"]["paraphrase"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert stats["hit_rate"] == 0.5
+    print("✅ LLM response cache test passed!")
+
+if __name__ == "__main__":
+    test_llm_response_cache()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+LLM Router Test Script
+Checks hedging to a second provider, failover on errors, the circuit breaker with its half-open trial call
+and latency-based ranking
+"""
+
+import asyncio
+import threading
+import time
+from llm.llm_router import LLMRouter, ProviderHealth
+
+class FakeProvider:
+    """Answers after delay seconds, or raises when failing"""
+
+    def __init__(self, name, delay=0.0, failing=False):
+        self.name = name
+        self.delay = delay
+        self.failing = failing
+        self.calls = 0
+        self.cancelled = 0
+
+    def complete(self, messages, temperature, max_tokens, json_schema=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.failing:
+            raise ConnectionError(f"{self.name} is down")
+        return f"answer from {self.name}"
+
+    async def acomplete(self, messages, temperature, max_tokens, json_schema=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.failing:
+            raise ConnectionError(f"{self.name} is down")
+        return f"answer from {self.name}"
+
+def make_router(primary, secondary):
+    router = LLMRouter(["openai", "deepseek"], apis={"openai": primary, "deepseek": secondary})
+    # Five calls at 50 ms: the primary is hedged once it passes ~50 ms
+    for _ in range(5):
+        router.health["openai"].record_success(0.05)
+    return router
+
+MESSAGES = [{"role": "user", "content": "Paraphrase: I feel stressed"}]
+
+def test_llm_router():
+    print("🔀 Testing LLM router...")
+    print("=" * 40)
+
+    # A slow primary is hedged, the faster answer wins
+    router = make_router(FakeProvider("openai", delay=0.5), FakeProvider("deepseek", delay=0.01))
+    started = time.time()
+    assert router.generate_response(MESSAGES) == "answer from deepseek"
+    assert time.time() - started < 0.4
+    assert router.stats()["hedges"] == 1 and router.stats()["hedge_wins"] == 1
+
+    # The loser of an async hedge is cancelled
+    primary = FakeProvider("openai", delay=0.5)
+    router = make_router(primary, FakeProvider("deepseek", delay=0.01))
+    assert asyncio.run(router.agenerate_response(MESSAGES)) == "answer from deepseek"
+    assert primary.cancelled == 1
+
+    # Errors fail over at once; after three in a row the breaker skips the provider
+    primary = FakeProvider("openai", failing=True)
+    # deepseek is slower than the primary's recorded latency, so the primary stays first until its breaker trips
+    router = make_router(primary, FakeProvider("deepseek", delay=0.1))
+    for _ in range(3):
+        assert router.generate_response(MESSAGES) == "answer from deepseek"
+    assert router.stats()["failovers"] == 3
+    assert router.ranked_providers() == ["deepseek"]
+    router.generate_response(MESSAGES)
+    assert primary.calls == 3
+
+    # Nothing left: None instead of an error message, so callers use their own fallback
+    router.apis["deepseek"].failing = True
+    for _ in range(3):
+        assert router.generate_response(MESSAGES) is None
+    assert router.ranked_providers() == []
+    print(f"   Stats: {router.stats()}")
+
+    # The fastest healthy provider goes first
+    router = make_router(FakeProvider("openai"), FakeProvider("deepseek"))
+    for _ in range(10):
+        router.health["deepseek"].record_success(0.02)
+    assert router.ranked_providers() == ["deepseek", "openai"]
+    print("✅ LLM router test passed!")
+
+def test_half_open_breaker():
+    print("🔌 Testing half-open circuit breaker...")
+    print("=" * 40)
+
+    health = ProviderHealth(failures_to_trip=3, cooldown=0.05)
+    for _ in range(3):
+        health.record_failure()
+    assert health.admit() is None and not health.available()
+    time.sleep(0.06)
+    # After the cooldown exactly one trial goes through...
+    assert health.available()
+    assert health.admit() == ProviderHealth.TRIAL
+    assert health.admit() is None and not health.available()
+    # ...and its failure opens the breaker again at once
+    health.record_failure()
+    assert health.trips == 2 and health.admit() is None
+    time.sleep(0.06)
+    # A trial that is cancelled frees the slot; a successful one closes the breaker
+    health.abandon(health.admit())
+    assert health.admit() == ProviderHealth.TRIAL
+    health.record_success(0.01)
+    assert health.admit() == ProviderHealth.CLOSED and health.admit() == ProviderHealth.CLOSED
+
+    # Through the router: concurrent requests after the cooldown send one trial to the recovering provider
+    primary = FakeProvider("openai", delay=0.02, failing=True)
+    router = make_router(primary, FakeProvider("deepseek", delay=0.1))  # Slower, so the primary stays first
+    router.health["openai"].cooldown = 0.05
+    for _ in range(3):
+        router.generate_response(MESSAGES)
+    time.sleep(0.06)
+    router.health["openai"].cooldown = 30  # Still open when the requests finish
+    primary.calls = 0
+    threads = [threading.Thread(target=router.generate_response, args=(MESSAGES,)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert primary.calls == 1
+    assert router.ranked_providers() == ["deepseek"]
+    print(f"   Stats: {router.health['openai'].stats()}")
+    print("✅ Half-open circuit breaker test passed!")
+
+if __name__ == "__main__":
+    test_llm_router()
+    test_half_open_breaker()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+LLM Streaming Test Script
+Checks clause splitting of a token stream and that streamed clauses are synthesized and spoken in order
+"""
+
+import threading
+import time
+from bot.clause_splitter import ClauseSplitter, split_clauses
+from bot.conversation_bot import ConversationBot
+
+class FakeSio:
+    """Finishes playback of every clip right away"""
+    connected = True
+
+    def __init__(self):
+        self.bot = None
+        self.audio = []
+        self.messages = []
+
+    def emit(self, event, data=None):
+        if event == "play_audio_binary":
+            self.audio.append(data["audio"])
+            threading.Timer(0.01, self.bot.on_audio_finished).start()
+        elif event == "new_message":
+            self.messages.append(data["text"])
+
+def test_clause_splitter():
+    print("✂️  Testing clause splitter...")
+    print("=" * 40)
+
+    # Token-sized deltas; a boundary is only final once the next delta shows whitespace after it
+    tokens = ["I hear", " you saying that", " you", " feel", " stressed,", " and", " that", " work", " keeps",
+              " piling up", " on you.", " Dr.", " Lee", " agrees", "."]
+    assert list(split_clauses(tokens, min_words=4)) == [
+        "I hear you saying that you feel stressed,",
+        "and that work keeps piling up on you.",
+        "Dr. Lee agrees."
+    ]
+
+    # Short pieces before a comma wait for more words
+    splitter = ClauseSplitter(min_words=4)
+    assert splitter.feed("Yes, I ") == []
+    assert splitter.feed("see that now. And") == ["Yes, I see that now."]
+    assert splitter.flush() == ["And"]
+    print("✅ Clause splitter test passed!")
+
+def test_streamed_i_statement():
+    print("🗣️  Testing streamed I-statement...")
+    print("=" * 40)
+
+    sio = FakeSio()
+    bot = ConversationBot(character_type="neutral", session_id="stream-test", sio=sio)
+    sio.bot = bot
+    synthesized = []
+
+    def fake_stream(messages, **kwargs):
+        for token in ['"I feel', " calm", " when", " my", " mornings", " start", " slowly,", " because", " I",
+                      " can", " think", " clearly", '."']:
+            time.sleep(0.01)
+            yield token
+
+    def fake_synthesize(text):
+        synthesized.append(text)
+        return text.encode()
+
+    bot.llm_api = type("FakeLLM", (), {"stream_response": staticmethod(fake_stream)})()
+    bot.synthesize_speech = fake_synthesize
+    statement = bot.speak_streamed_i_statement()
+
+    print(f"   Spoken: {sio.audio}")
+    assert statement == "I feel calm when my mornings start slowly, because I can think clearly."
+    assert synthesized == ["I feel calm when my mornings start slowly,", "because I can think clearly."]
+    assert sio.audio == [clause.encode() for clause in synthesized]
+    # One chat message for the whole statement
+    assert sio.messages == [f'"{statement}"']
+    print("✅ Streamed I-statement test passed!")
+
+if __name__ == "__main__":
+    test_clause_splitter()
+    test_streamed_i_statement()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+TTS Cache Test Script
+Checks LRU eviction, disk persistence across cache instances and hit/miss counters
+"""
+
+import os
+import tempfile
+import time
+from speech.tts_cache import TTSCache
+
+def test_tts_cache():
+    print("🗄️  Testing TTS cache...")
+    print("=" * 40)
+
+    directory = tempfile.mkdtemp()
+    cache = TTSCache(directory=directory, max_memory_entries=2, max_disk_entries=2)
+
+    assert cache.get("Thank you!", "tts-1", "alloy", "mp3") is None
+    cache.put("Thank you!", "tts-1", "alloy", "mp3", b"thanks-mp3")
+    cache.put("Thank you!", "tts-1", "alloy", "wav", b"thanks-wav")
+    cache.put("Let's continue.", "tts-1", "alloy", "mp3", b"continue-mp3")
+
+    # Same text, different format is a different entry
+    assert cache.get("Thank you!", "tts-1", "alloy", "wav") == b"thanks-wav"
+    # Evicted from memory (LRU of 2) but still on disk
+    assert len(cache.memory) == 2
+    assert cache.get("Thank you!", "tts-1", "alloy", "mp3") == b"thanks-mp3"
+    print(f"   Stats: {cache.stats()}")
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    # A fresh process sees the entries written by another one
+    other = TTSCache(directory=directory)
+    assert other.contains("Let's continue.", "tts-1", "alloy", "mp3")
+    assert other.get("Let's continue.", "tts-1", "alloy", "mp3") == b"continue-mp3"
+
+    # Disk is bounded to max_disk_entries
+    cache.prune_disk()
+    remaining = [fmt for fmt in ("mp3", "wav") if TTSCache(directory=directory).contains("Thank you!", "tts-1", "alloy", fmt)]
+    remaining += ["continue"] if TTSCache(directory=directory).contains("Let's continue.", "tts-1", "alloy", "mp3") else []
+    assert len(remaining) == 2
+
+    # Pruning goes by last use: a phrase pre-warmed long ago but still being read outlives newer, unread ones
+    directory = tempfile.mkdtemp()
+    cache = TTSCache(directory=directory, max_memory_entries=1, max_disk_entries=2)
+    phrases = ["Did I get that right?", "Let's switch roles now!", "Could you share more?"]
+    for age, phrase in zip([300, 200, 100], phrases):
+        cache.put(phrase, "tts-1", "alloy", "mp3", phrase.encode())
+        path = cache._path(cache.key(phrase, "tts-1", "alloy", "mp3"))
+        os.utime(path, (time.time() - age, time.time() - age))
+    fresh = TTSCache(directory=directory, max_memory_entries=1, max_disk_entries=2)
+    assert fresh.get(phrases[0], "tts-1", "alloy", "mp3") == phrases[0].encode()  # Disk hit
+    fresh.prune_disk()
+    assert [TTSCache(directory=directory).contains(phrase, "tts-1", "alloy", "mp3") for phrase in phrases] == [True, False, True]
+    print("✅ TTS cache test passed!")
+
+if __name__ == "__main__":
+    test_tts_cache()
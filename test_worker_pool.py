@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Bot Worker Pool Test Script
+Checks that sessions are spread over the workers and that a worker's slot is freed when its session ends,
+with stand-in worker processes that speak the same stdin/stdout protocol
+"""
+
+import sys
+import time
+from bot.worker_pool import BotWorkerPool, SESSION_ENDED
+
+# Runs each session until it is stopped, then reports the end the way run_worker() does
+FAKE_WORKER = f"""
+import json, sys
+for line in sys.stdin:
+    command = json.loads(line)
+    if command["command"] == "stop":
+        sys.stdout.write("{SESSION_ENDED} " + command["session_id"] + "\\n")
+        sys.stdout.flush()
+    elif command["command"] == "shutdown":
+        break
+"""
+
+class FakeWorkerPool(BotWorkerPool):
+    def worker_command(self, index):
+        return [sys.executable, "-c", FAKE_WORKER]
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_worker_pool():
+    print("👷 Testing bot worker pool...")
+    print("=" * 40)
+
+    pool = FakeWorkerPool(num_workers=2, sessions_per_worker=1)
+    try:
+        assert pool.start_session("neutral", "session-1")
+        assert pool.start_session("neutral", "session-2")
+        assert pool.stats()["active_sessions"] == [1, 1]
+        assert not pool.start_session("neutral", "session-3")  # Every worker is full
+
+        # The end is reported on the worker's stdout, with no SocketIO connection involved
+        pool.stop_session("session-1")
+        assert wait_for(lambda: pool.stats()["active_sessions"] == [0, 1])
+        assert pool.start_session("neutral", "session-3")
+
+        # A worker whose pipe breaks between the liveness poll and the write is replaced, and the session retried
+        pool.stop_session("session-2")
+        assert wait_for(lambda: pool.stats()["active_sessions"] == [1, 0])
+        broken = pool.workers[1]["process"]
+        broken.stdin.close()
+        assert pool.start_session("neutral", "session-4")
+        assert pool.workers[1]["process"] is not broken and pool.stats()["active_sessions"] == [1, 1]
+        print(f"   Stats: {pool.stats()}")
+    finally:
+        pool.shutdown()
+    print("✅ Bot worker pool test passed!")
+
+if __name__ == "__main__":
+    test_worker_pool()
@@ -1,4 +1,7 @@
 from flask import Flask, request, jsonify
+from flask_sock import Sock
+from simple_websocket import ConnectionClosed
+import io
 import os
 import json
 import wave
@@ -6,29 +9,33 @@ from vosk import Model, KaldiRecognizer
 
 # Read the model path from the environment variable
 VOSK_MODEL_PATH = os.environ["VOSK_MODEL_PATH"]
+SAMPLE_RATE = 16000
+END_OF_STREAM = "EOF"  # Text message a /stream client sends after its last audio frame
 
 # Load model ONCE at server startup
 model = Model(VOSK_MODEL_PATH)
 
 app = Flask(__name__)
+sock = Sock(app)
+
+
+def result_text(result):
+    """The text of a KaldiRecognizer Result()/FinalResult() JSON string"""
+    return json.loads(result).get("text", "")
+
 
 @app.route("/transcribe", methods=["POST"])
 def transcribe():
-    temp_filename = "temp_audio.wav"
-
     try:
         if "file" not in request.files:
             return jsonify({"error": "No file uploaded"}), 400
 
-        audio_file = request.files["file"]
-        audio_file.save(temp_filename)
-
-        wf = wave.open(temp_filename, "rb")
+        # Decoded from memory: concurrent requests used to overwrite each other's temp_audio.wav
+        wf = wave.open(io.BytesIO(request.files["file"].read()), "rb")
 
         # Validate format
-        if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != 16000:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != SAMPLE_RATE:
             wf.close()
-            os.remove(temp_filename)
             return jsonify({
                 "error": "Audio format not supported. Must be mono PCM 16-bit 16000Hz."
             }), 400
@@ -44,27 +51,59 @@ def transcribe():
                 results.append(rec.Result())
 
         results.append(rec.FinalResult())
+        wf.close()
 
-        wf.close()  # VERY IMPORTANT: close before deleting
-
-        os.remove(temp_filename)
+        texts = [result_text(r) for r in results]
+        return jsonify({"transcription": " ".join(text for text in texts if text)})
 
-        texts = []
-        for r in results:
-            res = json.loads(r)
-            if "text" in res:
-                texts.append(res["text"])
+    except Exception as e:
+        print(f"Error in Vosk server transcribe: {e}")
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
-        return jsonify({"transcription": " ".join(texts)})
 
+@sock.route("/stream")
+def stream(ws):
+    """
+    Streaming transcription. The client sends binary frames of mono 16-bit 16 kHz PCM as it captures them,
+    then the text message "EOF". Audio is decoded as it arrives, and the server replies with JSON messages:
+      {"partial": "..."}                      the words so far of the current utterance, when they change
+      {"text": "..."}                         an utterance Vosk finalized at a pause
+      {"transcription": "...", "final": true} everything, after EOF; the connection is then closed
+    """
+    rec = KaldiRecognizer(model, SAMPLE_RATE)
+    texts = []
+    partial = ""
+    try:
+        while True:
+            data = ws.receive()
+            if data is None or data == END_OF_STREAM:
+                break
+            if isinstance(data, str):
+                continue  # Only audio and EOF are expected
+            if rec.AcceptWaveform(data):
+                text = result_text(rec.Result())
+                partial = ""
+                if text:
+                    texts.append(text)
+                    ws.send(json.dumps({"text": text}))
+            else:
+                current = json.loads(rec.PartialResult()).get("partial", "")
+                if current != partial:
+                    partial = current
+                    ws.send(json.dumps({"partial": partial}))
+        text = result_text(rec.FinalResult())
+        if text:
+            texts.append(text)
+        ws.send(json.dumps({"transcription": " ".join(texts), "final": True}))
+    except ConnectionClosed:
+        pass  # Client went away mid-stream
     except Exception as e:
-        print(f"Error in Vosk server transcribe: {e}")
+        print(f"Error in Vosk server stream: {e}")
         try:
-            if os.path.exists(temp_filename):
-                os.remove(temp_filename)
-        except:
+            ws.send(json.dumps({"error": f"Internal server error: {str(e)}"}))
+        except ConnectionClosed:
             pass
-        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5001))
@@ -5,7 +5,7 @@ This file is used by gunicorn to serve the Flask-SocketIO application.
 """
 
 import os
-from app import app, socketio
+from app import app, socketio, bot_pool, start_tts_prewarm_thread
 
 # Set production environment
 os.environ.setdefault("FLASK_ENV", "production")
@@ -15,5 +15,8 @@ if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     socketio.run(app, host="0.0.0.0", port=port, debug=False)
 else:
-    # For WSGI server
+    # For WSGI server - pre-fork bot workers before serving requests
+    if bot_pool is not None:
+        bot_pool.start()
+    start_tts_prewarm_thread()
     application = socketio 
\ No newline at end of file